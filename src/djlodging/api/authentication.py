@@ -0,0 +1,106 @@
+from functools import partial
+from uuid import UUID
+
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from djlodging.domain.users.models import User
+from djlodging.domain.users.repository import UserAuthVersionRepository, UserRepository
+
+AUTH_VERSION_CLAIM = "auth_version"
+ROLE_CLAIMS = ("is_staff", "is_superuser", "is_user", "is_partner")
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issues tokens that claim the user's roles and the auth version they are valid for."""
+
+    @classmethod
+    def get_token(cls, user: User):
+        token = super().get_token(user)
+        token[AUTH_VERSION_CLAIM] = user.auth_version
+        for role_claim in ROLE_CLAIMS:
+            token[role_claim] = getattr(user, role_claim)
+        return token
+
+
+def _claim_property(name: str) -> property:
+    def get_claim(self):
+        if self._wrapped is empty:
+            return self._claims[name]
+        # Once loaded the user is the source of truth, e.g. after a service changed its roles
+        return getattr(self._wrapped, name)
+
+    return property(get_claim)
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    The request user as its access token claims it.
+
+    The id and the role flags are read from the claims, so permission checks need no query.
+    Anything else (other fields, saving it, using it in queries or as a foreign key value)
+    loads the user from the database on first use.
+    """
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    id = _claim_property("id")
+    pk = _claim_property("id")
+    is_staff = _claim_property("is_staff")
+    is_superuser = _claim_property("is_superuser")
+    is_user = _claim_property("is_user")
+    is_partner = _claim_property("is_partner")
+
+    def __init__(self, validated_token):
+        user_id = UUID(str(validated_token[api_settings.USER_ID_CLAIM]))
+        super().__init__(partial(UserRepository.get_by_id, user_id))
+        # Set directly as LazyObject forwards attribute assignments to the wrapped user
+        self.__dict__["_claims"] = {
+            "id": user_id,
+            **{role_claim: validated_token[role_claim] for role_claim in ROLE_CLAIMS},
+        }
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, ClaimsUser):
+            return self.pk == other.pk
+        if isinstance(other, User):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates a request as a `ClaimsUser`, without a users-table query, while the token's
+    auth version matches the user's cached one.
+
+    Otherwise, i.e. the version is not cached yet, the user's roles or password changed,
+    the user was deactivated or deleted, or the token predates these claims, the user is loaded
+    and checked as by `JWTAuthentication`, and its version is cached for the next requests.
+    Without a shared cache (see USER_AUTH_VERSION_CACHE_ENABLED) every request loads its user.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        claimed_version = validated_token.get(AUTH_VERSION_CLAIM)
+        has_role_claims = all(role_claim in validated_token for role_claim in ROLE_CLAIMS)
+        if user_id is None or claimed_version is None or not has_role_claims:
+            return super().get_user(validated_token)
+        if claimed_version == UserAuthVersionRepository.get(user_id):
+            return ClaimsUser(validated_token)
+        user = super().get_user(validated_token)
+        UserAuthVersionRepository.update(user)
+        return user
@@ -0,0 +1,5 @@
+from djlodging.api.bookings.serializers import BookingListOutputSerializer
+from djlodging.domain.bookings.models import Booking
+from djlodging.domain.core.projections import Projection
+
+BOOKING_LIST_PROJECTION = Projection(Booking, BookingListOutputSerializer)
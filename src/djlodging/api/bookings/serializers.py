@@ -1,8 +1,10 @@
 """Serializers for bookings management"""
 
+from django.conf import settings
 from rest_framework import serializers
 
 from djlodging.api.lodging.serializers import LodgingOutputSerializer
+from djlodging.api.pagination import PaginatedOutputSerializer
 
 
 class BookingCreateInputSerializer(serializers.Serializer):
@@ -15,6 +17,16 @@ class BookingCreateInputSerializer(serializers.Serializer):
     date_to = serializers.DateField()
 
 
+class BookingBulkCreateInputSerializer(serializers.Serializer):
+    """
+    Serializer for input parameters to book many lodgings at once.
+    """
+
+    items = BookingCreateInputSerializer(
+        many=True, allow_empty=False, max_length=settings.BOOKING_BULK_CREATE_MAX_ITEMS
+    )
+
+
 class BookingOutputSerializer(serializers.Serializer):
     """
     Serializer to retrieve a booking.
@@ -28,6 +40,24 @@ class BookingOutputSerializer(serializers.Serializer):
     status = serializers.CharField()
 
 
+class BookingBulkCreateItemOutputSerializer(serializers.Serializer):
+    """
+    Serializer for the result of one item of a bulk booking.
+    """
+
+    index = serializers.IntegerField()
+    booking = BookingOutputSerializer(allow_null=True)
+    error = serializers.CharField(allow_null=True)
+
+
+class BookingBulkCreateOutputSerializer(serializers.Serializer):
+    """
+    Serializer for the per item results of a bulk booking.
+    """
+
+    results = BookingBulkCreateItemOutputSerializer(many=True)
+
+
 class BookingListOutputSerializer(serializers.Serializer):
     """
     Serializer to list bookings.
@@ -41,12 +71,11 @@ class BookingListOutputSerializer(serializers.Serializer):
     created = serializers.DateTimeField()
 
 
-class BookingListPaginatedOutputSerializer(serializers.Serializer):
+class BookingListPaginatedOutputSerializer(PaginatedOutputSerializer):
     """
     Serializer with pagination to list bookings.
     """
 
-    count = serializers.IntegerField()
     results = BookingListOutputSerializer(many=True)
 
 
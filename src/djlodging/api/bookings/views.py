@@ -13,12 +13,16 @@ from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED
 from rest_framework.viewsets import ViewSet
 
+from djlodging.api.bookings.projections import BOOKING_LIST_PROJECTION
 from djlodging.api.bookings.serializers import (
+    BookingBulkCreateInputSerializer,
+    BookingBulkCreateOutputSerializer,
     BookingCreateInputSerializer,
     BookingListPaginatedOutputSerializer,
     BookingOutputSerializer,
     BookingPayInputSerializer,
 )
+from djlodging.api.lodging.projections import LODGING_DETAIL_PROJECTION
 from djlodging.application_services.bookings import BookingService
 from djlodging.domain.bookings.repository import BookingRepository
 
@@ -148,10 +152,13 @@ class BookingViewSet(ViewSet):
         List all bookings filtered by query_params.
         """
         bookings = BookingService.get_filtered_paginated_list(
-            actor=request.user, query_params=request.query_params
+            actor=request.user,
+            query_params=request.query_params,
+            projection=BOOKING_LIST_PROJECTION,
+        )
+        return Response(
+            data=BookingListPaginatedOutputSerializer.render(bookings), status=HTTP_200_OK
         )
-        output_serializer = BookingListPaginatedOutputSerializer(bookings)
-        return Response(data=output_serializer.data, status=HTTP_200_OK)
 
     @extend_schema(
         parameters=[
@@ -196,6 +203,29 @@ class MyBookingViewSet(ViewSet):
         output_serializer = BookingOutputSerializer(booking)
         return Response(data=output_serializer.data, status=HTTP_201_CREATED)
 
+    @extend_schema(
+        request=BookingBulkCreateInputSerializer,
+        responses={
+            200: BookingBulkCreateOutputSerializer,
+            400: OpenApiResponse(description="Bad request"),
+        },
+        summary="Book many lodgings at once",
+    )
+    @action(detail=False, methods=["post"], url_path="bulk", url_name="bulk-create")
+    def bulk_create(self, request):
+        """
+        Book many lodgings for oneself, with a result per item.
+        """
+        input_serializer = BookingBulkCreateInputSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+        results = BookingService.bulk_create(
+            user=request.user,
+            items=input_serializer.validated_data["items"],
+            lodging_projection=LODGING_DETAIL_PROJECTION,
+        )
+        output_serializer = BookingBulkCreateOutputSerializer({"results": results})
+        return Response(data=output_serializer.data, status=HTTP_200_OK)
+
     @extend_schema(
         request=None,
         responses={200: BookingListPaginatedOutputSerializer},
@@ -206,10 +236,13 @@ class MyBookingViewSet(ViewSet):
         List my bookings.
         """
         bookings = BookingRepository.get_paginated_list_by_user(
-            user=request.user, query_params=request.query_params
+            user=request.user,
+            query_params=request.query_params,
+            projection=BOOKING_LIST_PROJECTION,
+        )
+        return Response(
+            data=BookingListPaginatedOutputSerializer.render(bookings), status=HTTP_200_OK
         )
-        output_serializer = BookingListPaginatedOutputSerializer(bookings)
-        return Response(data=output_serializer.data, status=HTTP_200_OK)
 
     @extend_schema(
         parameters=[
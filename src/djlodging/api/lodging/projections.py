@@ -0,0 +1,17 @@
+from djlodging.api.lodging.serializers import (
+    CityOutputSerializer,
+    CountryOutputSerializer,
+    LodgingListOutputSerializer,
+    LodgingOutputSerializer,
+    MyReviewOutputSerializer,
+    ReviewOutputSerializer,
+)
+from djlodging.domain.core.projections import Projection
+from djlodging.domain.lodgings.models import City, Country, Lodging, Review
+
+COUNTRY_LIST_PROJECTION = Projection(Country, CountryOutputSerializer)
+CITY_LIST_PROJECTION = Projection(City, CityOutputSerializer)
+LODGING_LIST_PROJECTION = Projection(Lodging, LodgingListOutputSerializer)
+LODGING_DETAIL_PROJECTION = Projection(Lodging, LodgingOutputSerializer)
+REVIEW_LIST_PROJECTION = Projection(Review, ReviewOutputSerializer)
+MY_REVIEW_LIST_PROJECTION = Projection(Review, MyReviewOutputSerializer)
@@ -2,6 +2,7 @@
 
 from rest_framework import serializers
 
+from djlodging.api.pagination import PaginatedOutputSerializer
 from djlodging.api.users.serializers import LodgingUserOutputSerializer
 
 
@@ -18,10 +19,9 @@ class CountryOutputSerializer(serializers.Serializer):
     name = serializers.CharField()
 
 
-class CountryPaginatedOutputSerializer(serializers.Serializer):
+class CountryPaginatedOutputSerializer(PaginatedOutputSerializer):
     """Serializer to display a paginated list of countries."""
 
-    count = serializers.IntegerField()
     results = CountryOutputSerializer(many=True)
 
 
@@ -34,11 +34,15 @@ class CountryUpdateInputSerializer(serializers.Serializer):
 class CityCreateInputSerializer(serializers.Serializer):
     name = serializers.CharField()
     region = serializers.CharField(required=False)
+    latitude = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    longitude = serializers.FloatField(min_value=-180, max_value=180, required=False)
 
 
 class CityUpdateInputSerializer(serializers.Serializer):
     name = serializers.CharField(required=False)
     region = serializers.CharField(required=False)
+    latitude = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    longitude = serializers.FloatField(min_value=-180, max_value=180, required=False)
 
 
 class CityOutputSerializer(serializers.Serializer):
@@ -46,10 +50,11 @@ class CityOutputSerializer(serializers.Serializer):
     country = CountryOutputSerializer()
     name = serializers.CharField()
     region = serializers.CharField(required=False)
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
 
 
-class CityListPaginatedOutputSerializer(serializers.Serializer):
-    count = serializers.IntegerField()
+class CityListPaginatedOutputSerializer(PaginatedOutputSerializer):
     results = CityOutputSerializer(many=True)
 
 
@@ -64,6 +69,8 @@ class LodgingCreateInputSerializer(serializers.Serializer):
     phone_number = serializers.CharField(required=False)
     district = serializers.CharField(required=False)
     price = serializers.DecimalField(max_digits=7, decimal_places=2, min_value=0)
+    latitude = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    longitude = serializers.FloatField(min_value=-180, max_value=180, required=False)
 
 
 class LodgingUpdateInputSerializer(serializers.Serializer):
@@ -76,6 +83,8 @@ class LodgingUpdateInputSerializer(serializers.Serializer):
     phone_number = serializers.CharField(required=False)
     district = serializers.CharField(required=False)
     price = serializers.DecimalField(max_digits=7, decimal_places=2, min_value=0, required=False)
+    latitude = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    longitude = serializers.FloatField(min_value=-180, max_value=180, required=False)
 
 
 class LodgingCountryOutputSerializer(serializers.Serializer):
@@ -114,6 +123,8 @@ class LodgingCreateOutputSerializer(serializers.Serializer):
     number_of_people = serializers.IntegerField()
     number_of_rooms = serializers.IntegerField()
     price = serializers.DecimalField(max_digits=7, decimal_places=2)
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
     created = serializers.DateTimeField()
 
 
@@ -139,10 +150,11 @@ class LodgingShortOutputSerializer(serializers.Serializer):
 
 class LodgingListOutputSerializer(LodgingOutputSerializer):
     available = serializers.BooleanField(required=False)
+    # Kilometers from the center of a radius search
+    distance = serializers.FloatField(required=False)
 
 
-class LodgingListPaginatedOutputSerializer(serializers.Serializer):
-    count = serializers.IntegerField()
+class LodgingListPaginatedOutputSerializer(PaginatedOutputSerializer):
     results = LodgingListOutputSerializer(many=True)
 
 
@@ -167,8 +179,7 @@ class ReviewOutputSerializer(serializers.Serializer):
     created = serializers.DateTimeField()
 
 
-class ReviewPaginatedListOutputSerializer(serializers.Serializer):
-    count = serializers.IntegerField()
+class ReviewPaginatedListOutputSerializer(PaginatedOutputSerializer):
     results = ReviewOutputSerializer(many=True)
 
 
@@ -185,6 +196,5 @@ class MyReviewOutputSerializer(serializers.Serializer):
     created = serializers.DateTimeField()
 
 
-class MyReviewsPaginatedListOutputSerializer(serializers.Serializer):
-    count = serializers.IntegerField()
+class MyReviewsPaginatedListOutputSerializer(PaginatedOutputSerializer):
     results = MyReviewOutputSerializer(many=True)
@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
 from rest_framework.viewsets import ViewSet
 
+from djlodging.api.lodging.projections import CITY_LIST_PROJECTION
 from djlodging.api.lodging.serializers import (
     CityCreateInputSerializer,
     CityListPaginatedOutputSerializer,
@@ -105,7 +106,10 @@ class CityViewSet(ViewSet):
     def list(self, request, country_pk):
         """List all cities in a country."""
         cities = CityService.get_paginated_list(
-            actor=request.user, country_id=country_pk, query_params=request.query_params
+            actor=request.user,
+            country_id=country_pk,
+            query_params=request.query_params,
+            projection=CITY_LIST_PROJECTION,
         )
         output_serializer = CityListPaginatedOutputSerializer(cities)
         return Response(data=output_serializer.data, status=HTTP_200_OK)
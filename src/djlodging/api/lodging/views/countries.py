@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
 from rest_framework.viewsets import ViewSet
 
+from djlodging.api.lodging.projections import COUNTRY_LIST_PROJECTION
 from djlodging.api.lodging.serializers import (
     CountryCreateInputSerializer,
     CountryOutputSerializer,
@@ -68,7 +69,9 @@ class CountryViewSet(ViewSet):
     def list(self, request):
         """List all countries."""
         countries = CountryService.get_paginated_list(
-            actor=request.user, query_params=request.query_params
+            actor=request.user,
+            query_params=request.query_params,
+            projection=COUNTRY_LIST_PROJECTION,
         )
         output_serializer = CountryPaginatedOutputSerializer(countries)
         return Response(data=output_serializer.data, status=HTTP_200_OK)
@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
 from rest_framework.viewsets import ViewSet
 
+from djlodging.api.lodging.projections import LODGING_DETAIL_PROJECTION, LODGING_LIST_PROJECTION
 from djlodging.api.lodging.serializers import (
     LodgingCreateInputSerializer,
     LodgingCreateOutputSerializer,
@@ -47,7 +48,10 @@ class LodgingViewSet(ViewSet):
         return Response(data=output_serializer.data, status=HTTP_201_CREATED)
 
     @extend_schema(
-        description="Filter by country or city. At least one of the two is required",
+        description=(
+            "Filter by country or city, or search within a radius around a point or a city. "
+            "A country or a radius is required"
+        ),
         parameters=[
             OpenApiParameter(
                 name="country",
@@ -61,6 +65,52 @@ class LodgingViewSet(ViewSet):
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="price_min",
+                description="Filter by the lowest price",
+                type=OpenApiTypes.DECIMAL,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="price_max",
+                description="Filter by the highest price",
+                type=OpenApiTypes.DECIMAL,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="min_rating",
+                description="Filter by the lowest average rating, leaves out unrated lodgings",
+                type=OpenApiTypes.DECIMAL,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="radius",
+                description=(
+                    "Search within this many kilometers around latitude and longitude, "
+                    "or around the city. Sorted nearest first by default"
+                ),
+                type=OpenApiTypes.DECIMAL,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="latitude",
+                description="Latitude of the center of a radius search",
+                type=OpenApiTypes.DECIMAL,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="longitude",
+                description="Longitude of the center of a radius search",
+                type=OpenApiTypes.DECIMAL,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="order_by",
+                description="Sort order, distance in radius searches only",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                enum=list(LodgingRepository.SEARCH_ORDERINGS),
+            ),
         ],
         request=None,
         responses={
@@ -71,9 +121,12 @@ class LodgingViewSet(ViewSet):
     )
     def list(self, request):
         """List lodgings according to the query_params."""
-        lodgings = LodgingRepository.get_paginated_filtered_list(query_params=request.query_params)
-        output_serializer = LodgingListPaginatedOutputSerializer(lodgings)
-        return Response(data=output_serializer.data, status=HTTP_200_OK)
+        lodgings = LodgingRepository.get_paginated_filtered_list(
+            query_params=request.query_params, projection=LODGING_LIST_PROJECTION
+        )
+        return Response(
+            data=LodgingListPaginatedOutputSerializer.render(lodgings), status=HTTP_200_OK
+        )
 
     @extend_schema(
         parameters=[
@@ -101,7 +154,9 @@ class LodgingViewSet(ViewSet):
         Returns:
             HttpResponse: serialized lodging's details
         """
-        lodging = LodgingRepository.retrieve_lodging_with_average_rating(pk)
+        lodging = LodgingRepository.retrieve_lodging_with_average_rating(
+            pk, LODGING_DETAIL_PROJECTION
+        )
         output_serializer = LodgingOutputSerializer(lodging)
         return Response(data=output_serializer.data, status=HTTP_200_OK)
 
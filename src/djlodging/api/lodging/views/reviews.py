@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
 from rest_framework.viewsets import ViewSet
 
+from djlodging.api.lodging.projections import MY_REVIEW_LIST_PROJECTION, REVIEW_LIST_PROJECTION
 from djlodging.api.lodging.serializers import (
     MyReviewOutputSerializer,
     MyReviewsPaginatedListOutputSerializer,
@@ -35,10 +36,11 @@ class ReviewViewSet(ViewSet):
     def list(self, request, lodging_pk):
         """List all reviews for a lodging."""
         reviews = ReviewRepository.get_paginated_list_by_lodging(
-            lodging_id=lodging_pk, query_params=request.query_params
+            lodging_id=lodging_pk,
+            query_params=request.query_params,
+            projection=REVIEW_LIST_PROJECTION,
         )
-        output_serializer = ReviewPaginatedListOutputSerializer(reviews)
-        return Response(output_serializer.data, status=HTTP_200_OK)
+        return Response(ReviewPaginatedListOutputSerializer.render(reviews), status=HTTP_200_OK)
 
     @extend_schema(
         parameters=[
@@ -89,7 +91,9 @@ class MyReviewViewSet(ViewSet):
     def list(self, request):
         """List all reviews by a logged in user."""
         my_reviews = ReviewRepository.get_paginated_list_by_user(
-            user=request.user, query_params=request.query_params
+            user=request.user,
+            query_params=request.query_params,
+            projection=MY_REVIEW_LIST_PROJECTION,
         )
         output_serializer = MyReviewsPaginatedListOutputSerializer(my_reviews)
         return Response(output_serializer.data, status=HTTP_200_OK)
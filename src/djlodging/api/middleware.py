@@ -0,0 +1,42 @@
+import logging
+
+from django.conf import settings
+
+from djlodging.infrastructure.query_metrics import check_query_budget, collect_query_metrics
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+
+class QueryMetricsMiddleware:
+    """
+    Records the number of database queries and their time for every request.
+
+    The numbers are checked against the endpoint's budget from `QUERY_BUDGETS` (by method and URL
+    name, e.g. "GET lodgings-list") and, in the debug mode, returned in the `X-DB-Query-Count`
+    and `X-DB-Time-Ms` headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect_query_metrics() as metrics:
+            response = self.get_response(request)
+
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        logger.debug(
+            "%s %s made %d queries in %.1f ms",
+            request.method,
+            request.path,
+            metrics.count,
+            metrics.duration_ms,
+        )
+        check_query_budget(f"{request.method} {url_name}" if url_name else None, metrics)
+
+        if settings.DEBUG:
+            response[QUERY_COUNT_HEADER] = str(metrics.count)
+            response[QUERY_TIME_HEADER] = f"{metrics.duration_ms:.1f}"
+        return response
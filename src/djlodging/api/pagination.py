@@ -1,8 +1,64 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from functools import lru_cache
+from hashlib import sha256
+from typing import Any, Optional, Tuple, Type
+
 from django.conf import settings
-from django.db.models import QuerySet
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q, QuerySet, TextChoices
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+
+from djlodging.api.row_serializers import RowSerializer
+from djlodging.domain.core.base_exceptions import DjLodgingValidationError
+
+CURSOR_QUERY_PARAM = "cursor"
+CURSOR_ORDERING = ("-created", "id")
+COUNT_CACHE_KEY_PREFIX = "pagination-counts"
+
 
+class CountStrategy(TextChoices):
+    """How `paginate_queryset` computes the total `count` of a list."""
 
-def paginate_queryset(queryset: QuerySet, query_params: dict) -> dict:
+    EXACT = "exact", "Exact COUNT(*) on every request"
+    CACHED = "cached", "Exact count cached per query for a short time"
+    ESTIMATE = "estimate", "Query planner estimate for large lists"
+
+
+class PaginatedOutputSerializer(serializers.Serializer):
+    """
+    Base serializer for paginated lists.
+
+    `count` is present in the page number mode, `next` and `previous` in the cursor mode.
+    """
+
+    count = serializers.IntegerField(required=False)
+    count_is_estimate = serializers.BooleanField(required=False)
+    next = serializers.CharField(required=False)
+    previous = serializers.CharField(required=False)
+
+    PAGE_KEYS = ("count", "count_is_estimate", "next", "previous")
+
+    @classmethod
+    def render(cls, page: dict) -> dict:
+        """The same data as `cls(page).data` for a page of `.values()` rows, see RowSerializer."""
+        data = {key: page[key] for key in cls.PAGE_KEYS if key in page}
+        data["results"] = _get_row_serializer(cls).to_representation(page["results"])
+        return data
+
+
+@lru_cache(maxsize=None)
+def _get_row_serializer(paginated_serializer_class: Type[PaginatedOutputSerializer]):
+    results_serializer_class = type(paginated_serializer_class().fields["results"].child)
+    return RowSerializer(results_serializer_class)
+
+
+def paginate_queryset(
+    queryset: QuerySet, query_params: dict, count_strategy: str = CountStrategy.EXACT
+) -> dict:
     """
     Provides custom pagination schema for all lis APIs.
 
@@ -12,12 +68,148 @@ def paginate_queryset(queryset: QuerySet, query_params: dict) -> dict:
     page_size: A numeric value indicating the page size.
 
     Returns:
-    dict with count:int and results:list.
+    dict with count:int, count_is_estimate:bool and results:list.
+
+    `count_strategy` is chosen per endpoint, see `CountStrategy`.
+
+    If the `cursor` query parameter is present (empty for the first page)
+    the cursor mode is used instead, see `paginate_queryset_by_cursor`.
+    """
+    if CURSOR_QUERY_PARAM in query_params:
+        return paginate_queryset_by_cursor(queryset, query_params)
+
+    count, count_is_estimate = count_queryset(queryset, count_strategy)
+    results = queryset[get_page_slice(query_params)]
+    return {"count": count, "count_is_estimate": count_is_estimate, "results": results}
+
+
+def count_queryset(queryset: QuerySet, count_strategy: str) -> Tuple[int, bool]:
+    """Returns the number of items in the queryset and whether this number may be inexact."""
+    if count_strategy == CountStrategy.CACHED:
+        return _get_cached_count(queryset)
+    if count_strategy == CountStrategy.ESTIMATE:
+        return _get_estimated_count(queryset)
+    return queryset.count(), False
+
+
+def _get_cached_count(queryset: QuerySet) -> Tuple[int, bool]:
+    sql, params = queryset.query.sql_with_params()
+    query_hash = sha256(f"{sql}|{params}".encode()).hexdigest()
+    cache_key = f"{COUNT_CACHE_KEY_PREFIX}:{query_hash}"
+
+    # The count is cached with whether it was exact when it was counted
+    cached_count = cache.get(cache_key)
+    if cached_count is not None:
+        count, count_is_estimate = cached_count
+        return count, count_is_estimate
+    count, count_is_estimate = queryset.count(), False
+    cache.set(
+        cache_key,
+        (count, count_is_estimate),
+        timeout=settings.PAGINATION_COUNT_CACHE_TTL_IN_SECONDS,
+    )
+    return count, count_is_estimate
+
+
+def _get_estimated_count(queryset: QuerySet) -> Tuple[int, bool]:
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count(), False
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimated_count = int(plan[0]["Plan"]["Plan Rows"])
+
+    # Planner estimates are rough for small lists, while counting them exactly is cheap.
+    if estimated_count < settings.PAGINATION_ESTIMATED_COUNT_THRESHOLD:
+        return queryset.count(), False
+    return estimated_count, True
+
+
+def paginate_queryset_by_cursor(queryset: QuerySet, query_params: dict) -> dict:
+    """
+    Keyset pagination over the default `(-created, id)` ordering.
+
+    Accepts two query parameters:
+
+    cursor: An opaque cursor from a previous page, empty for the first page.
+    page_size: A numeric value indicating the page size.
+
+    Returns:
+    dict with next:str|None, previous:str|None and results:list.
+    Neither the total count nor an OFFSET is computed, so every page costs a single query.
     """
-    count = queryset.count()
-    page_size = int(query_params.get("page_size", settings.REST_FRAMEWORK["DEFAULT_PAGE_SIZE"]))
+    if query_params.get("order_by"):
+        raise DjLodgingValidationError("Cursor pagination supports only the default ordering.")
+
+    page_size = _get_page_size(query_params)
+    position = _decode_cursor(query_params.get(CURSOR_QUERY_PARAM))
+
+    if position is None:
+        is_backwards = False
+        page = queryset.order_by(*CURSOR_ORDERING)
+    else:
+        created, item_id, is_backwards = position
+        if is_backwards:
+            page = queryset.filter(
+                Q(created__gt=created) | Q(created=created, id__lt=item_id)
+            ).order_by("created", "-id")
+        else:
+            page = queryset.filter(
+                Q(created__lt=created) | Q(created=created, id__gt=item_id)
+            ).order_by(*CURSOR_ORDERING)
+
+    # Fetch one extra item to find out whether there is a page beyond this one.
+    results = list(page[: page_size + 1])
+    has_more = len(results) > page_size
+    results = results[:page_size]
+    if is_backwards:
+        results.reverse()
+
+    next_cursor = previous_cursor = None
+    if results:
+        if has_more or is_backwards:
+            next_cursor = _encode_cursor(results[-1], is_backwards=False)
+        if (has_more and is_backwards) or (position is not None and not is_backwards):
+            previous_cursor = _encode_cursor(results[0], is_backwards=True)
+    return {"next": next_cursor, "previous": previous_cursor, "results": results}
+
+
+def get_page_slice(query_params: dict) -> slice:
+    """The items of the requested page in the page number mode."""
+    page_size = _get_page_size(query_params)
     page = int(query_params.get("page", 1))
     bottom = (page - 1) * page_size
-    top = bottom + page_size
-    results = queryset[bottom:top]
-    return {"count": count, "results": results}
+    return slice(bottom, bottom + page_size)
+
+
+def _get_page_size(query_params: dict) -> int:
+    return int(query_params.get("page_size", settings.REST_FRAMEWORK["DEFAULT_PAGE_SIZE"]))
+
+
+def _encode_cursor(item: Any, is_backwards: bool) -> str:
+    # A model instance or a `.values()` row
+    created, item_id = (
+        (item["created"], item["id"]) if isinstance(item, dict) else (item.created, item.id)
+    )
+    position = {"created": created.isoformat(), "id": str(item_id), "backwards": is_backwards}
+    return urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        position = json.loads(urlsafe_b64decode(cursor.encode()))
+        created = parse_datetime(position["created"])
+        item_id = position["id"]
+        is_backwards = bool(position["backwards"])
+    except (BinasciiError, ValueError, KeyError, TypeError) as exc:
+        raise DjLodgingValidationError("Invalid cursor.") from exc
+    if created is None:
+        raise DjLodgingValidationError("Invalid cursor.")
+    return created, item_id, is_backwards
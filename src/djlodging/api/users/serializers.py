@@ -1,11 +1,12 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from djlodging.api.authentication import ClaimsTokenObtainPairSerializer
 
 User = get_user_model()
 
 
-class UserLoginOutputSerializer(TokenObtainPairSerializer):
+class UserLoginOutputSerializer(ClaimsTokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
         data["username"] = self.user.full_name
@@ -1,8 +1,12 @@
+from collections import defaultdict
 from datetime import date
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Set
 from uuid import UUID
 
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError, transaction
 from django.utils.timezone import now, timedelta
 
 from djlodging.application_services.exceptions import (
@@ -11,18 +15,24 @@ from djlodging.application_services.exceptions import (
 )
 from djlodging.application_services.helpers import check_staff_permissions
 from djlodging.application_services.payments import PaymentService
-from djlodging.domain.bookings.models import Booking
-from djlodging.domain.bookings.repository import BookingRepository
+from djlodging.domain.bookings.models import NO_OVERLAPPING_STAYS_CONSTRAINT, Booking
+from djlodging.domain.bookings.repository import (
+    BookedDayRepository,
+    BookingRepository,
+    PaymentIntentCacheRepository,
+)
 from djlodging.domain.core.base_exceptions import DjLodgingValidationError
+from djlodging.domain.core.projections import Projection
 from djlodging.domain.lodgings.models.lodging import Lodging
-from djlodging.domain.lodgings.repositories import LodgingRepository
+from djlodging.domain.lodgings.repositories import LodgingRepository, LodgingSearchCacheRepository
 from djlodging.domain.users.models import User
 from djlodging.infrastructure.jobs.celery_tasks import (
-    delete_expired_unpaid_booking,
     send_booking_cancellation_email_to_owner_task,
     send_booking_cancellation_email_to_user_task,
+    send_booking_cancellation_emails_task,
     send_booking_confirmation_email_to_owner_task,
     send_booking_confirmation_email_to_user_task,
+    send_booking_confirmation_emails_task,
 )
 
 
@@ -39,13 +49,7 @@ class BookingService:
     def _is_lodging_available_for_given_dates(
         cls, lodging: Lodging, date_from: date, date_to: date
     ) -> bool:
-        for booking in lodging.booking.all():
-            if booking.status != Booking.Status.CANCELED and (
-                booking.date_from <= date_from < booking.date_to
-                or booking.date_from < date_to <= booking.date_to
-            ):
-                return False
-        return True
+        return not BookingRepository.has_overlapping_bookings(lodging.id, date_from, date_to)
 
     @classmethod
     def create(cls, lodging_id: UUID, user: User, date_from: date, date_to: date) -> Booking:
@@ -63,9 +67,123 @@ class BookingService:
             payment_expiration_time=now()
             + timedelta(minutes=settings.BOOKING_PAYMENT_EXPIRATION_TIME_IN_MINUTES),
         )
-        BookingRepository.save(booking)
+        try:
+            # A concurrent booking for the same dates is rejected by the exclusion constraint.
+            with transaction.atomic():
+                BookingRepository.save(booking)
+        except IntegrityError as exc:
+            if not cls._is_overlapping_stays_error(exc):
+                raise
+            raise LodgingAlreadyBookedError from exc
         return booking
 
+    @classmethod
+    def _is_overlapping_stays_error(cls, exc: IntegrityError) -> bool:
+        # Other violations (e.g. of a foreign key or the reference code) are not about the dates
+        diagnostics = getattr(exc.__cause__, "diag", None)
+        constraint_name = getattr(diagnostics, "constraint_name", None)
+        return constraint_name == NO_OVERLAPPING_STAYS_CONSTRAINT
+
+    @classmethod
+    def bulk_create(
+        cls, user: User, items: List[dict], lodging_projection: Optional[Projection] = None
+    ) -> List[dict]:
+        """
+        Book many lodgings at once, each item has lodging_id, date_from and date_to.
+
+        All items are checked against the booked days in one query and inserted together.
+        Returns a result per item in the same order: {"index", "booking", "error"},
+        where either the booking or the error message is None.
+        The lodgings of the bookings are loaded by `lodging_projection` when it is given.
+        """
+        results = [{"index": index, "booking": None, "error": None} for index in range(len(items))]
+        lodgings = LodgingRepository.get_in_bulk(
+            {item["lodging_id"] for item in items}, lodging_projection
+        )
+
+        valid_indexes = []
+        for index, item in enumerate(items):
+            try:
+                cls._validate_dates(item["date_from"], item["date_to"])
+            except DjLodgingValidationError as exc:
+                results[index]["error"] = exc.message
+                continue
+            if item["lodging_id"] not in lodgings:
+                results[index]["error"] = "Lodging not found."
+                continue
+            valid_indexes.append(index)
+
+        booked_days = BookedDayRepository.get_booked_days_for_stays(
+            (items[index]["lodging_id"], items[index]["date_from"], items[index]["date_to"])
+            for index in valid_indexes
+        )
+        reference_codes = iter(BookingRepository.get_next_reference_codes(len(valid_indexes)))
+        bookings = {}
+        for index in valid_indexes:
+            item = items[index]
+            lodging_booked_days = booked_days.setdefault(item["lodging_id"], set())
+            number_of_nights = (item["date_to"] - item["date_from"]).days
+            nights = {
+                item["date_from"] + timedelta(days=night) for night in range(number_of_nights)
+            }
+            if nights & lodging_booked_days:
+                results[index]["error"] = LodgingAlreadyBookedError().message
+                continue
+            # Later items of the same batch must not overlap this one either
+            lodging_booked_days.update(nights)
+            bookings[index] = Booking(
+                lodging=lodgings[item["lodging_id"]],
+                user=user,
+                date_from=item["date_from"],
+                date_to=item["date_to"],
+                payment_expiration_time=now()
+                + timedelta(minutes=settings.BOOKING_PAYMENT_EXPIRATION_TIME_IN_MINUTES),
+                reference_code=next(reference_codes),
+            )
+
+        cls._save_bulk(bookings, results)
+        return results
+
+    @classmethod
+    def _save_bulk(cls, bookings: Dict[int, Booking], results: List[dict]) -> None:
+        try:
+            with transaction.atomic():
+                BookingRepository.bulk_create(list(bookings.values()))
+        except IntegrityError as exc:
+            if not cls._is_overlapping_stays_error(exc):
+                raise
+            # A concurrent booking took some of the dates, save one by one to find which.
+            saved_bookings = {}
+            for index, booking in bookings.items():
+                try:
+                    with transaction.atomic():
+                        BookingRepository.save(booking)
+                except IntegrityError as exc:
+                    if not cls._is_overlapping_stays_error(exc):
+                        raise
+                    results[index]["error"] = LodgingAlreadyBookedError().message
+                else:
+                    saved_bookings[index] = booking
+            bookings = saved_bookings
+        else:
+            # post_save was not sent for the inserted bookings
+            LodgingSearchCacheRepository.invalidate_many(
+                cls._group_nights_by_lodging(bookings.values())
+            )
+
+        for index, booking in bookings.items():
+            results[index]["booking"] = booking
+
+    @classmethod
+    def _group_nights_by_lodging(cls, bookings: Iterable[Booking]) -> Dict[UUID, Set[date]]:
+        nights_by_lodging = defaultdict(set)
+        for booking in bookings:
+            number_of_nights = (booking.date_to - booking.date_from).days
+            nights_by_lodging[booking.lodging_id].update(
+                booking.date_from + timedelta(days=night) for night in range(number_of_nights)
+            )
+        return nights_by_lodging
+
     @classmethod
     def retrieve(cls, actor: User, booking_id: UUID) -> Booking:
         check_staff_permissions(actor)
@@ -75,24 +193,78 @@ class BookingService:
     def pay(
         cls, actor, booking_id: UUID, currency: str = "usd", capture_method: str = "automatic"
     ) -> str:
+        """
+        The client secret of the booking's payment intent.
+
+        A retried request reuses the booking's intent while it is still payable for the same
+        terms: from the cache without calling the payment provider, or else after one lookup.
+        A new intent is created with an idempotency key derived from the booking and its previous
+        intent, so concurrent requests (e.g. a double click) get the same one.
+        The previous intent is canceled before, a paid one fails the request instead.
+        """
         booking = BookingRepository.get_by_id(booking_id)
         cls._validate_booking_for_payment(actor, booking)
-        metadata = {"booking_id": booking.id}
-        payment_intent = PaymentService.create_payment(
-            actor, booking.lodging.price, metadata, currency, capture_method
+        price = booking.lodging.price
+        terms = {"price": str(price), "currency": currency, "capture_method": capture_method}
+
+        client_secret = PaymentIntentCacheRepository.get(
+            booking.id, booking.payment_intent_id, terms
+        )
+        if client_secret is not None:
+            return client_secret
+
+        payment_intent = None
+        if booking.payment_intent_id:
+            payment_intent = PaymentService.get_reusable_payment(
+                booking.payment_intent_id, price, currency, capture_method
+            )
+        if payment_intent is None:
+            if booking.payment_intent_id:
+                # Only the new intent may be paid, not the one the customer was given before
+                PaymentService.cancel_payment(booking.payment_intent_id)
+            metadata = {"booking_id": booking.id}
+            payment_intent = PaymentService.create_payment(
+                actor,
+                price,
+                metadata,
+                currency,
+                capture_method,
+                idempotency_key=cls._get_payment_idempotency_key(booking, terms),
+            )
+            cls._set_booking_payment_intent_id(booking, payment_intent.id)
+
+        time_to_expiration = (booking.payment_expiration_time - now()).total_seconds()
+        PaymentIntentCacheRepository.set(
+            booking.id,
+            payment_intent.id,
+            terms,
+            payment_intent.client_secret,
+            timeout=min(settings.PAYMENT_INTENT_CACHE_TTL_IN_SECONDS, int(time_to_expiration)),
         )
-        cls._set_booking_payment_intent_id(booking, payment_intent.id)
         return payment_intent.client_secret
 
+    @classmethod
+    def _get_payment_idempotency_key(cls, booking: Booking, terms: dict) -> str:
+        # A booking gets a new intent only when its previous one (if any) can't be reused,
+        # so the previous intent is part of the key.
+        previous_payment_intent_id = booking.payment_intent_id or "none"
+        return (
+            f"booking-payment:{booking.id}:{previous_payment_intent_id}:"
+            f"{terms['price']}:{terms['currency']}:{terms['capture_method']}"
+        )
+
     @classmethod
     def _validate_booking_for_payment(cls, actor: User, booking: Booking) -> Booking:
         if actor != booking.user:
             raise PermissionDenied
 
         if booking.payment_expiration_time < now():
-            delete_expired_unpaid_booking.apply_async(args=[str(booking.id)])
+            # The booking is deleted by the next `expire_due_objects` tick
             raise PaymentExpirationTimePassed
 
+        if booking.status != Booking.Status.PAYMENT_PENDING:
+            raise DjLodgingValidationError("This booking cannot be paid!")
+
     @classmethod
     def _set_booking_payment_intent_id(cls, booking: Booking, payment_intent_id: str) -> None:
         booking.payment_intent_id = payment_intent_id
@@ -101,9 +273,19 @@ class BookingService:
     @classmethod
     def confirm(cls, metadata: dict) -> None:
         booking = BookingRepository.get_by_id(metadata["booking_id"])
+        if booking.status == Booking.Status.PAID:
+            # A replayed payment event: the booking is confirmed and its emails are sent already
+            return
         BookingRepository.change_status(booking, new_status=Booking.Status.PAID)
-        send_booking_confirmation_email_to_user_task(str(booking.id))
-        send_booking_confirmation_email_to_owner_task(str(booking.id))
+        PaymentIntentCacheRepository.delete(booking.id)
+        cls._send_emails_on_commit(
+            booking,
+            send_booking_confirmation_emails_task,
+            (
+                send_booking_confirmation_email_to_user_task,
+                send_booking_confirmation_email_to_owner_task,
+            ),
+        )
 
     @classmethod
     def cancel(cls, actor: User, booking_id: UUID) -> Booking:
@@ -116,10 +298,27 @@ class BookingService:
             metadata={"booking_id": booking.id},
         )
         booking = BookingRepository.change_status(booking, new_status=Booking.Status.CANCELED)
-        send_booking_cancellation_email_to_owner_task(str(booking.id))
-        send_booking_cancellation_email_to_user_task(str(booking.id))
+        cls._send_emails_on_commit(
+            booking,
+            send_booking_cancellation_emails_task,
+            (
+                send_booking_cancellation_email_to_owner_task,
+                send_booking_cancellation_email_to_user_task,
+            ),
+        )
         return booking
 
+    @classmethod
+    def _send_emails_on_commit(cls, booking: Booking, emails_task, per_recipient_tasks) -> None:
+        """
+        With `EMAIL_BATCHING_ENABLED` one task queues the emails of both recipients from one loaded
+        booking. Sent at once instead, every recipient gets a task of its own, so that a retry
+        doesn't send the email of the other recipient again.
+        """
+        tasks = (emails_task,) if settings.EMAIL_BATCHING_ENABLED else per_recipient_tasks
+        for task in tasks:
+            transaction.on_commit(partial(task.delay, str(booking.id)))
+
     @classmethod
     def _validate_booking_for_cancellation(cls, actor: User, booking: Booking) -> Booking:
         if actor != booking.user:
@@ -128,6 +327,8 @@ class BookingService:
             raise DjLodgingValidationError("This booking cannot be canceled!")
 
     @classmethod
-    def get_filtered_paginated_list(cls, actor: User, query_params: dict) -> dict:
+    def get_filtered_paginated_list(
+        cls, actor: User, query_params: dict, projection: Projection
+    ) -> dict:
         check_staff_permissions(actor)
-        return BookingRepository.get_filtered_list(query_params)
+        return BookingRepository.get_filtered_list(query_params, projection)
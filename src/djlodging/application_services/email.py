@@ -1,8 +1,17 @@
+import logging
+from typing import List
+
 from django.conf import settings
+from django.db import transaction
 
+from djlodging.domain.bookings.models import Booking
 from djlodging.domain.bookings.repository import BookingRepository
+from djlodging.domain.emails.models import PendingEmail
+from djlodging.domain.emails.repository import PendingEmailRepository
 from djlodging.infrastructure.providers.email import email_provider
 
+logger = logging.getLogger(__name__)
+
 
 class EmailService:
     @classmethod
@@ -20,61 +29,167 @@ class EmailService:
         link = f"{settings.DOMAIN}/change-email?token={token}&email={new_email}"
         return email_provider.send_change_email_link(email=new_email, link=link)
 
+    @classmethod
+    def send_booking_confirmation_emails(cls, booking_id: str):
+        """Send the confirmation emails to the user and the owner from one loaded booking."""
+        booking = BookingRepository.get_for_notification(booking_id)
+        # Queued with `EMAIL_BATCHING_ENABLED`, both or none
+        with transaction.atomic():
+            cls._send_booking_confirmation_email_to_user(booking)
+            cls._send_booking_confirmation_email_to_owner(booking)
+
+    @classmethod
+    def send_booking_cancellation_emails(cls, booking_id: str):
+        """Send the cancellation emails to the user and the owner from one loaded booking."""
+        booking = BookingRepository.get_for_notification(booking_id)
+        with transaction.atomic():
+            cls._send_booking_cancellation_email_to_user(booking)
+            cls._send_booking_cancellation_email_to_owner(booking)
+
     @classmethod
     def send_booking_confirmation_email_to_user(cls, booking_id: str):
-        booking = BookingRepository.get_by_id(booking_id)
+        booking = BookingRepository.get_for_notification(booking_id)
+        return cls._send_booking_confirmation_email_to_user(booking)
+
+    @classmethod
+    def send_booking_confirmation_email_to_owner(cls, booking_id: str):
+        booking = BookingRepository.get_for_notification(booking_id)
+        return cls._send_booking_confirmation_email_to_owner(booking)
+
+    @classmethod
+    def send_booking_cancellation_email_to_user(cls, booking_id: str):
+        booking = BookingRepository.get_for_notification(booking_id)
+        return cls._send_booking_cancellation_email_to_user(booking)
+
+    @classmethod
+    def send_booking_cancellation_email_to_owner(cls, booking_id: str):
+        booking = BookingRepository.get_for_notification(booking_id)
+        return cls._send_booking_cancellation_email_to_owner(booking)
+
+    @classmethod
+    def _send_booking_confirmation_email_to_user(cls, booking: Booking):
         user = booking.user
         return email_provider.send_booking_confirmation_email_to_user(
             email=user.email,
             username=user.username,
-            lodging_name=booking.lodging.name,
-            city=booking.lodging.city.name,
-            date_from=booking.date_from.strftime("%b %d, %Y"),
-            date_to=booking.date_to.strftime("%b %d, %Y"),
             reference_code=booking.reference_code,
+            **cls._get_booking_email_data(booking),
         )
 
     @classmethod
-    def send_booking_confirmation_email_to_owner(cls, booking_id: str):
-        booking = BookingRepository.get_by_id(booking_id)
-        user = booking.user
+    def _send_booking_confirmation_email_to_owner(cls, booking: Booking):
         owner = booking.lodging.owner
         return email_provider.send_booking_confirmation_email_to_owner(
             email=owner.email,
             owner_name=owner.username,
-            username=user.username,
-            lodging_name=booking.lodging.name,
-            city=booking.lodging.city.name,
-            date_from=booking.date_from.strftime("%b %d, %Y"),
-            date_to=booking.date_to.strftime("%b %d, %Y"),
+            username=booking.user.username,
             reference_code=booking.reference_code,
+            **cls._get_booking_email_data(booking),
         )
 
     @classmethod
-    def send_booking_cancellation_email_to_user(cls, booking_id: str):
-        booking = BookingRepository.get_by_id(booking_id)
+    def _send_booking_cancellation_email_to_user(cls, booking: Booking):
         user = booking.user
         return email_provider.send_booking_cancellation_email_to_user(
             email=user.email,
             username=user.username,
-            lodging_name=booking.lodging.name,
-            city=booking.lodging.city.name,
-            date_from=booking.date_from.strftime("%b %d, %Y"),
-            date_to=booking.date_to.strftime("%b %d, %Y"),
+            **cls._get_booking_email_data(booking),
         )
 
     @classmethod
-    def send_booking_cancellation_email_to_owner(cls, booking_id: str):
-        booking = BookingRepository.get_by_id(booking_id)
-        user = booking.user
+    def _send_booking_cancellation_email_to_owner(cls, booking: Booking):
         owner = booking.lodging.owner
         return email_provider.send_booking_cancellation_email_to_owner(
             email=owner.email,
             owner_name=owner.username,
-            username=user.username,
-            lodging_name=booking.lodging.name,
-            city=booking.lodging.city.name,
-            date_from=booking.date_from.strftime("%b %d, %Y"),
-            date_to=booking.date_to.strftime("%b %d, %Y"),
+            username=booking.user.username,
             reference_code=booking.reference_code,
+            **cls._get_booking_email_data(booking),
+        )
+
+    @classmethod
+    def _get_booking_email_data(cls, booking: Booking) -> dict:
+        return {
+            "lodging_name": booking.lodging.name,
+            "city": booking.lodging.city.name,
+            "date_from": booking.date_from.strftime("%b %d, %Y"),
+            "date_to": booking.date_to.strftime("%b %d, %Y"),
+        }
+
+    @classmethod
+    def send_pending_emails(cls) -> int:
+        """
+        Send the due pending emails, coalescing the emails of one template into requests
+        of up to `email_provider.MAX_BATCH_SIZE` recipients. Returns the number of sent emails.
+
+        The emails are claimed in a short transaction and sent outside of it.
+        Emails of a request that failed with one of `email_provider.RETRYABLE_ERRORS` are retried
+        later with an exponential backoff, emails without attempts left after `EMAIL_MAX_ATTEMPTS`
+        are dropped and logged. A request rejected otherwise is split, see `_send_batch`.
+        """
+        cls._drop_emails(
+            PendingEmailRepository.delete_exhausted(max_attempts=settings.EMAIL_MAX_ATTEMPTS)
         )
+        emails_by_template = PendingEmailRepository.claim_due_by_template(
+            limit=settings.EMAIL_BATCH_MAX_PENDING,
+            max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+            lease_in_seconds=settings.EMAIL_SEND_LEASE_IN_SECONDS,
+        )
+        sent = 0
+        for template_id, emails in emails_by_template.items():
+            for start in range(0, len(emails), email_provider.MAX_BATCH_SIZE):
+                batch = emails[start : start + email_provider.MAX_BATCH_SIZE]
+                sent += cls._send_batch(template_id, batch)
+        return sent
+
+    @classmethod
+    def _send_batch(cls, template_id: str, emails: List[PendingEmail]) -> int:
+        """
+        Send the emails in one request and return the number of sent emails.
+
+        A rejected request (e.g. an invalid address) is bisected, so that only the rejected
+        emails are dropped and the others are sent.
+        """
+        try:
+            email_provider.send_batch(
+                template_id=template_id,
+                personalizations=[email.personalization for email in emails],
+            )
+        except email_provider.RETRYABLE_ERRORS:
+            logger.exception("Sending %s emails of %s failed.", len(emails), template_id)
+            cls._retry_or_drop_emails(emails)
+            return 0
+        except Exception:  # pylint: disable=broad-except
+            if len(emails) > 1:
+                middle = len(emails) // 2
+                return cls._send_batch(template_id, emails[:middle]) + cls._send_batch(
+                    template_id, emails[middle:]
+                )
+            logger.exception("Dropped email %s of %s, it was rejected.", emails[0].id, template_id)
+            PendingEmailRepository.delete_by_ids([emails[0].id])
+            return 0
+        PendingEmailRepository.delete_by_ids([email.id for email in emails])
+        return len(emails)
+
+    @classmethod
+    def _retry_or_drop_emails(cls, emails: List[PendingEmail]) -> None:
+        exhausted_emails = [
+            email for email in emails if email.attempts >= settings.EMAIL_MAX_ATTEMPTS
+        ]
+        PendingEmailRepository.delete_by_ids([email.id for email in exhausted_emails])
+        cls._drop_emails(exhausted_emails)
+        PendingEmailRepository.postpone(
+            [email for email in emails if email.attempts < settings.EMAIL_MAX_ATTEMPTS],
+            backoff_in_seconds=settings.EMAIL_RETRY_BACKOFF_IN_SECONDS,
+        )
+
+    @classmethod
+    def _drop_emails(cls, exhausted_emails: List[PendingEmail]) -> None:
+        """Log the deleted emails that ran out of attempts, they are not retried any more."""
+        for email in exhausted_emails:
+            logger.error(
+                "Dropped email %s of %s after %s failed attempts.",
+                email.id,
+                email.template_id,
+                email.attempts,
+            )
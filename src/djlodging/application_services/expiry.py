@@ -0,0 +1,32 @@
+from time import monotonic
+from typing import Dict
+
+from django.conf import settings
+
+from djlodging.domain.bookings.repository import BookingRepository
+from djlodging.domain.users.repository import UserRepository
+
+
+class ExpiryService:
+    """
+    Deletes objects whose deadline has passed, on every tick of one periodic task.
+
+    The due-time queues are the partial indexes over the deadlines
+    (`booking_unpaid_expiry_idx`, `user_unfinished_signup_idx`): each tick drains
+    everything due from them in batches, instead of one delayed task per object.
+    """
+
+    SWEEPS = {
+        "expired_unpaid_bookings": BookingRepository.delete_all_expired_unpaid_bookings,
+        "unfinished_registrations": UserRepository.delete_users_with_unfinished_registration,
+    }
+
+    @classmethod
+    def expire_due(cls) -> Dict[str, dict]:
+        """Run all sweeps within one shared `EXPIRY_SWEEP_TIME_BUDGET_IN_SECONDS`."""
+        started = monotonic()
+        metrics = {}
+        for name, sweep in cls.SWEEPS.items():
+            time_left = settings.EXPIRY_SWEEP_TIME_BUDGET_IN_SECONDS - (monotonic() - started)
+            metrics[name] = sweep(time_budget_in_seconds=max(time_left, 0)).as_dict()
+        return metrics
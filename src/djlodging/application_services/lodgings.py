@@ -2,6 +2,7 @@ from typing import Dict, List, Optional, Union
 from uuid import UUID
 
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
 
 from djlodging.application_services.exceptions import (
     WrongBookingReferenceCode,
@@ -14,6 +15,7 @@ from djlodging.application_services.helpers import (
 )
 from djlodging.domain.bookings.models import Booking
 from djlodging.domain.bookings.repository import BookingRepository
+from djlodging.domain.core.projections import Projection
 from djlodging.domain.lodgings.models import City, Country
 from djlodging.domain.lodgings.models.lodging import Lodging
 from djlodging.domain.lodgings.models.review import Review
@@ -21,6 +23,7 @@ from djlodging.domain.lodgings.repositories import (
     CityRepository,
     CountryRepository,
     LodgingRepository,
+    LodgingSearchCacheRepository,
     ReviewRepository,
 )
 from djlodging.domain.users.models import User
@@ -43,11 +46,11 @@ class CountryService:
 
     @classmethod
     def get_paginated_list(
-        cls, *, actor: User, query_params: dict
+        cls, *, actor: User, query_params: dict, projection: Projection
     ) -> Dict[str, Union[int, List[Country]]]:
         # Check permissions to prevent unauthorized actions that circumvents API level permissions
         check_staff_permissions(actor)
-        return CountryRepository.get_list(query_params)
+        return CountryRepository.get_list(query_params, projection)
 
     @classmethod
     def update(cls, *, actor: User, country_id: UUID, **kwargs) -> Country:
@@ -68,11 +71,21 @@ class CountryService:
 
 class CityService:
     @classmethod
-    def create(cls, actor: User, country_id: UUID, name: str, region: str = "") -> City:
+    def create(
+        cls,
+        actor: User,
+        country_id: UUID,
+        name: str,
+        region: str = "",
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+    ) -> City:
         # Check permissions to prevent unauthorized actions that circumvents API level permissions
         check_staff_permissions(actor)
         country = CountryRepository.get_by_id(country_id)
-        city = City(country=country, name=name, region=region)
+        city = City(
+            country=country, name=name, region=region, latitude=latitude, longitude=longitude
+        )
         CityRepository.save(city)
         return city
 
@@ -95,11 +108,11 @@ class CityService:
 
     @classmethod
     def get_paginated_list(
-        cls, actor: User, country_id: UUID, query_params: dict
+        cls, actor: User, country_id: UUID, query_params: dict, projection: Projection
     ) -> Dict[str, Union[int, List[City]]]:
         # Check permissions to prevent unauthorized actions that circumvents API level permissions
         check_staff_permissions(actor)
-        return CityRepository.get_paginated_list_by_country(country_id, query_params)
+        return CityRepository.get_paginated_list_by_country(country_id, query_params, projection)
 
     @classmethod
     def delete(cls, actor: User, city_id: UUID) -> tuple:
@@ -123,6 +136,8 @@ class LodgingService:
         email: Optional[str] = "",
         phone_number: Optional[str] = "",
         district: Optional[str] = "",
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
     ) -> Lodging:
 
         # Check permissions to prevent unauthorized actions that circumvents API level permissions
@@ -141,8 +156,12 @@ class LodgingService:
             phone_number=phone_number,
             email=email,
             price=price,
+            latitude=latitude,
+            longitude=longitude,
         )
         LodgingRepository.save(lodging)
+        # Cached searches of the city don't list the new lodging
+        LodgingSearchCacheRepository.invalidate_cities([city.id])
         return lodging
 
     @classmethod
@@ -150,9 +169,13 @@ class LodgingService:
         lodging = LodgingRepository.get_by_id(lodging_id)
         cls._check_owner(actor, lodging)
 
+        former_city_id = lodging.city_id
         for field, value in kwargs.items():
             setattr(lodging, field, value)
         LodgingRepository.save(lodging)
+        # Cached searches of the former and the new city may have filtered or sorted by the
+        # former details
+        LodgingSearchCacheRepository.invalidate_cities({former_city_id, lodging.city_id})
         return lodging
 
     @classmethod
@@ -178,7 +201,9 @@ class ReviewService:
         cls._validate_booking(user, lodging, booking)
 
         review = Review(lodging=lodging, user=user, text=text, score=score)
-        ReviewRepository.save(review)
+        # The lodging's rating is updated along, see djlodging.domain.lodgings.signals
+        with transaction.atomic():
+            ReviewRepository.save(review)
         return review
 
     @classmethod
@@ -194,14 +219,16 @@ class ReviewService:
         cls._verify_review_user_permissions(actor, review)
         for field, value in kwargs.items():
             setattr(review, field, value)
-        ReviewRepository.save(review)
+        with transaction.atomic():
+            ReviewRepository.save(review)
         return review
 
     @classmethod
     def delete(cls, actor: User, review_id: UUID) -> tuple:
         review = ReviewRepository.get_by_id(review_id=review_id)
         cls._verify_review_user_permissions(actor, review)
-        return ReviewRepository.delete(review)
+        with transaction.atomic():
+            return ReviewRepository.delete(review)
 
     @classmethod
     def _verify_review_user_permissions(cls, actor: User, review: Review) -> None:
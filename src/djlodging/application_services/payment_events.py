@@ -0,0 +1,102 @@
+import logging
+from datetime import datetime
+from itertools import groupby
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from djlodging.application_services.bookings import BookingService
+from djlodging.domain.bookings.models import PaymentEvent
+from djlodging.domain.bookings.repository import PaymentEventRepository
+from djlodging.infrastructure.providers.payments import payment_provider
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentEventService:
+    """
+    Payment provider webhook events are stored on receipt, deduplicated by their event ID,
+    and processed later by `process_pending`, in the order they were created per booking.
+    """
+
+    @classmethod
+    def receive(
+        cls, event_id: str, event_type: str, payload: dict, event_created: datetime
+    ) -> bool:
+        """Store an event to be processed. Returns False for an already received event."""
+        booking_id: Optional[str] = payload.get("metadata", {}).get("booking_id")
+        return PaymentEventRepository.add(event_id, event_type, booking_id, payload, event_created)
+
+    @classmethod
+    def backfill(cls, event_type: str, created_after: datetime) -> Tuple[int, int]:
+        """
+        Receive the past events of a type from the payment provider, e.g. after missed webhooks.
+        Returns the number of fetched and of newly stored events.
+        """
+        fetched = stored = 0
+        for event in payment_provider.list_events(event_type, created_after):
+            fetched += 1
+            stored += cls.receive(event["id"], event["type"], event["object"], event["created"])
+        return fetched, stored
+
+    @classmethod
+    def process_all_pending(cls) -> int:
+        """Process pending events in batches until none can be processed."""
+        processed = total = cls.process_pending()
+        while processed:
+            processed = cls.process_pending()
+            total += processed
+        return total
+
+    @classmethod
+    def process_pending(cls) -> int:
+        """
+        Process up to `PAYMENT_EVENT_BATCH_SIZE` pending events. Returns the number processed.
+
+        Events of a booking are processed in order: a failed event, or an earlier pending event
+        handled by a concurrent run, holds back the later events of its booking.
+        Failed events are retried on the next runs, up to `PAYMENT_EVENT_MAX_ATTEMPTS` attempts.
+        """
+        processed_ids = []
+        with transaction.atomic():
+            events = PaymentEventRepository.lock_pending(
+                limit=settings.PAYMENT_EVENT_BATCH_SIZE,
+                max_attempts=settings.PAYMENT_EVENT_MAX_ATTEMPTS,
+            )
+            earliest_other_pending = PaymentEventRepository.get_earliest_pending_by_booking(
+                booking_ids={event.booking_id for event in events if event.booking_id},
+                max_attempts=settings.PAYMENT_EVENT_MAX_ATTEMPTS,
+                exclude_ids=[event.id for event in events],
+            )
+            for booking_id, booking_events in groupby(events, key=lambda event: event.booking_id):
+                for event in booking_events:
+                    other_pending = earliest_other_pending.get(booking_id)
+                    if other_pending is not None and other_pending < event.event_created:
+                        break
+                    if cls._process(event):
+                        processed_ids.append(event.id)
+                    elif booking_id is not None:
+                        break
+            PaymentEventRepository.mark_processed(processed_ids)
+        return len(processed_ids)
+
+    @classmethod
+    def _process(cls, event: PaymentEvent) -> bool:
+        handler = {"payment_intent.succeeded": cls._handle_payment_intent_succeeded}.get(
+            event.type
+        )
+        if handler is None:
+            return True
+        try:
+            with transaction.atomic():
+                handler(event)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Processing payment event %s failed.", event.event_id)
+            PaymentEventRepository.mark_failed(event, error=repr(exc))
+            return False
+        return True
+
+    @classmethod
+    def _handle_payment_intent_succeeded(cls, event: PaymentEvent) -> None:
+        BookingService.confirm(event.payload["metadata"])
@@ -1,8 +1,10 @@
 from decimal import Decimal
+from typing import Optional
 
 from djlodging.domain.core.base_exceptions import DjLodgingValidationError
 from djlodging.domain.users.models import User
 from djlodging.infrastructure.providers.payments import payment_provider
+from djlodging.infrastructure.providers.payments.exceptions import PaymentProviderException
 
 
 class PaymentService:
@@ -14,6 +16,7 @@ class PaymentService:
         metadata: dict,
         currency: str = "usd",
         capture_method: str = "automatic",
+        idempotency_key: Optional[str] = None,
     ):
         if not hasattr(user, "payment_user"):
             raise DjLodgingValidationError(
@@ -27,9 +30,40 @@ class PaymentService:
             metadata=metadata,
             capture_method=capture_method,
             receipt_email=user.email,
+            idempotency_key=idempotency_key,
         )
         return payment_intent
 
+    @classmethod
+    def get_reusable_payment(
+        cls,
+        payment_intent_id: str,
+        price: Decimal,
+        currency: str = "usd",
+        capture_method: str = "automatic",
+    ):
+        """
+        The existing payment intent, or None if it is paid, canceled, for other terms
+        or unknown to the payment provider.
+        """
+        try:
+            payment_intent = payment_provider.get_payment_intent(payment_intent_id)
+        except PaymentProviderException:
+            return None
+        if payment_provider.is_payment_intent_reusable(
+            payment_intent, amount=price, currency=currency, capture_method=capture_method
+        ):
+            return payment_intent
+        return None
+
+    @classmethod
+    def cancel_payment(cls, payment_intent_id: str) -> None:
+        """
+        Cancel a payment intent superseded by a new one, so that it can't be paid as well.
+        Raises PaymentProviderException if it can't be canceled, e.g. as it is paid already.
+        """
+        payment_provider.cancel_payment_intent(payment_intent_id)
+
     @classmethod
     def create_refund(cls, payment_intent_id: str, price: Decimal, metadata: dict):
         refund = payment_provider.create_refund(
@@ -1,8 +1,10 @@
+from functools import partial
 from uuid import UUID, uuid4
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
 from django.utils.timezone import now, timedelta
 
 from djlodging.application_services.exceptions import RegistrationTimePassed
@@ -12,7 +14,6 @@ from djlodging.domain.users.models import PaymentProviderUser
 from djlodging.domain.users.models import User as UserModel
 from djlodging.domain.users.repository import PaymentProviderUserRepository, UserRepository
 from djlodging.infrastructure.jobs.celery_tasks import (
-    delete_unregistered_user_after_security_token_expired,
     send_change_email_link_task,
     send_change_password_link_task,
     send_confirmation_link_task,
@@ -33,7 +34,9 @@ class UserService:
             hours=settings.SECURITY_TOKEN_LIFE_TIME_IN_HOURS
         )
         UserRepository.save(user)
-        send_confirmation_link_task(user.email, user.security_token)
+        transaction.on_commit(
+            partial(send_confirmation_link_task.delay, user.email, str(user.security_token))
+        )
         return user
 
     @classmethod
@@ -41,7 +44,7 @@ class UserService:
         user = UserRepository.get_user_by_id_and_security_token(user_id, security_token)
 
         if user.security_token_expiration_time < now():
-            delete_unregistered_user_after_security_token_expired.apply_async(args=[user_id])
+            # The user is deleted by the next `expire_due_objects` tick
             raise RegistrationTimePassed
 
         user.security_token = ""
@@ -74,7 +77,9 @@ class UserService:
         user = UserRepository.get_by_email(email)
         security_token = uuid4()
         UserRepository.update(user, security_token=security_token)
-        send_change_password_link_task(user.email, security_token)
+        transaction.on_commit(
+            partial(send_change_password_link_task.delay, user.email, str(security_token))
+        )
 
     @classmethod
     def confirm_reset_password(cls, security_token: UUID, email: str, new_password: str) -> None:
@@ -87,7 +92,9 @@ class UserService:
     def send_change_email_link(cls, user: UserModel, new_email: str) -> None:
         security_token = uuid4()
         UserRepository.update(user, security_token=security_token)
-        send_change_email_link_task(new_email, security_token)
+        transaction.on_commit(
+            partial(send_change_email_link_task.delay, new_email, str(security_token))
+        )
 
     @classmethod
     def change_email(cls, security_token: UUID, new_email: str) -> None:
@@ -43,6 +43,7 @@ DJANGO_CORE_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -61,16 +62,21 @@ THIRD_PARTY_APPS = [
     "rest_framework_simplejwt",
     "drf_spectacular",
     "django_filters",
-    "silk",
     "djstripe",
     "django_celery_beat",
 ]
 
-LOCAL_APPS = ["djlodging.domain.lodgings", "djlodging.domain.bookings", "djlodging.domain.users"]
+LOCAL_APPS = [
+    "djlodging.domain.lodgings",
+    "djlodging.domain.bookings",
+    "djlodging.domain.users",
+    "djlodging.domain.emails",
+]
 
 INSTALLED_APPS = DJANGO_CORE_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "djlodging.api.middleware.QueryMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -78,9 +84,15 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "silk.middleware.SilkyMiddleware",
 ]
 
+# Silk profiles every request, so it is only enabled on demand.
+# Query counts and DB time are always recorded by QueryMetricsMiddleware.
+SILK_ENABLED = env.bool("SILK_ENABLED", default=False)
+if SILK_ENABLED:
+    INSTALLED_APPS.append("silk")
+    MIDDLEWARE.append("silk.middleware.SilkyMiddleware")
+
 ROOT_URLCONF = "djlodging.django_app.django_core.urls"
 
 TEMPLATES = [
@@ -120,6 +132,21 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+# Shared between processes through Redis if configured, otherwise per process.
+REDIS_CACHE_URL = env.str("REDIS_CACHE_URL", default="")
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -170,9 +197,7 @@ AUTH_USER_MODEL = "users.User"
 AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("djlodging.api.authentication.ClaimsJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGE_SIZE": 1,
@@ -180,10 +205,73 @@ REST_FRAMEWORK = {
 }
 
 
+# Pagination of list APIs, see djlodging.api.pagination.CountStrategy
+PAGINATION_COUNT_CACHE_TTL_IN_SECONDS = env.int(
+    "PAGINATION_COUNT_CACHE_TTL_IN_SECONDS", default=60
+)
+PAGINATION_ESTIMATED_COUNT_THRESHOLD = env.int(
+    "PAGINATION_ESTIMATED_COUNT_THRESHOLD", default=10000
+)
+
+# Country -> city catalog, see djlodging.domain.lodgings.repositories.LocationCatalogRepository
+LOCATION_CATALOG_CACHE_TTL_IN_SECONDS = env.int(
+    "LOCATION_CATALOG_CACHE_TTL_IN_SECONDS", default=24 * 60 * 60
+)
+LOCATION_CATALOG_LOCAL_TTL_IN_SECONDS = env.int("LOCATION_CATALOG_LOCAL_TTL_IN_SECONDS", default=5)
+
+# Lodging search results, see djlodging.domain.lodgings.repositories.LodgingSearchCacheRepository
+LODGING_SEARCH_CACHE_TTL_IN_SECONDS = env.int("LODGING_SEARCH_CACHE_TTL_IN_SECONDS", default=60)
+# Searches over longer stays are not cached
+LODGING_SEARCH_CACHE_MAX_NIGHTS = env.int("LODGING_SEARCH_CACHE_MAX_NIGHTS", default=31)
+# Only the first results of a search are cached, later pages are read from the database
+LODGING_SEARCH_CACHE_WINDOW = env.int("LODGING_SEARCH_CACHE_WINDOW", default=200)
+# Wider radius searches would cover too many geohash cells to narrow the search down
+LODGING_SEARCH_MAX_RADIUS_IN_KM = env.int("LODGING_SEARCH_MAX_RADIUS_IN_KM", default=50)
+
+# Maximum number of database queries per endpoint ("<method> <URL name>") or Celery task (task
+# name), see djlodging.infrastructure.query_metrics. Exceeding a budget is logged, or raised if
+# enforced. The list budgets hold for full pages, see tests/api/test_query_budgets.py.
+QUERY_BUDGETS = {
+    "GET bookings-list": 5,
+    "GET bookings-detail": 8,
+    "GET my-bookings-list": 5,
+    "POST my-bookings-list": 14,
+    "POST my-bookings-bulk-create": 11,
+    "GET countries-list": 5,
+    "POST countries-list": 4,
+    "GET cities-list": 5,
+    "POST cities-list": 5,
+    "GET lodgings-list": 7,
+    "POST lodgings-list": 7,
+    "GET lodgings-detail": 4,
+    "PUT lodgings-detail": 9,
+    "DELETE lodgings-detail": 10,
+    "GET reviews-list": 5,
+    "GET reviews-detail": 4,
+    "GET my-reviews-list": 5,
+    "POST my-reviews-list": 12,
+    "GET my-reviews-detail": 8,
+    "PUT my-reviews-detail": 10,
+    "DELETE my-reviews-detail": 10,
+}
+QUERY_BUDGETS_ENFORCED = env.bool("QUERY_BUDGETS_ENFORCED", default=False)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_SERIALIZER": "djlodging.api.authentication.ClaimsTokenObtainPairSerializer",
 }
+# The users' auth versions the token claims are checked against, see
+# djlodging.domain.users.repository.UserAuthVersionRepository. Only a cache shared by all
+# processes (Redis) lets a change of a user's roles reach the other processes, without one
+# the claims are not trusted and every request loads its user.
+USER_AUTH_VERSION_CACHE_ENABLED = env.bool(
+    "USER_AUTH_VERSION_CACHE_ENABLED", default=bool(REDIS_CACHE_URL)
+)
+# Bounds how long a version changed behind the application's back (e.g. in SQL) is trusted
+USER_AUTH_VERSION_CACHE_TTL_IN_SECONDS = env.int(
+    "USER_AUTH_VERSION_CACHE_TTL_IN_SECONDS", default=5 * 60
+)
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "dj-lodging API",
@@ -202,9 +290,13 @@ EMAIL_BACKEND = env.str(
     "DJANGO_EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend"
 )
 DEFAULT_FROM_EMAIL = env.str("DEFAULT_FROM_EMAIL", default="example@example.com")
-EMAIL_PROVIDER = "djlodging.infrastructure.providers.email.SendgridEmailProvider"
+# Use "djlodging.infrastructure.providers.email.LocalEmailProvider" to keep emails locally
+EMAIL_PROVIDER = env.str(
+    "EMAIL_PROVIDER", default="djlodging.infrastructure.providers.email.SendgridEmailProvider"
+)
 EMAIL_PROVIDER_SETTINGS = {
     "API_KEY": env.str("EMAIL_PROVIDER_API_KEY", default="SET_YOUR_API_KEY"),
+    "API_HOST": env.str("EMAIL_PROVIDER_API_HOST", default="https://api.sendgrid.com"),
     "CONFIRMATION_LINK_TEMPLATE_ID": "d-118c70b3aa884c74af9d3c14403aa4f5",
     "CHANGE_PASSWORD_LINK_TEMPLATE_ID": "d-788fb445f4b24970abf871901cf43d96",
     "CHANGE_EMAIL_LINK_TEMPLATE_ID": "d-27e74abd0a49487ca6bd59cd95081d27",
@@ -213,27 +305,71 @@ EMAIL_PROVIDER_SETTINGS = {
     "BOOKING_CANCELLATION_EMAIL_FOR_USER_TEMPLATE_ID": "d-ce90d6f80535428faf9df5f651f3d3ac",
     "BOOKING_CANCELLATION_EMAIL_FOR_OWNER_TEMPLATE_ID": "d-92008a09289c4b89a9d873015a0528e1",
 }
+# LocalEmailProvider keeps this many sent requests in memory, and spools them to files
+# in LOCAL_EMAIL_SPOOL_DIR if it is set
+LOCAL_EMAIL_SINK_SIZE = env.int("LOCAL_EMAIL_SINK_SIZE", default=10000)
+LOCAL_EMAIL_SPOOL_DIR = env.str("LOCAL_EMAIL_SPOOL_DIR", default="")
+# Emails are queued and sent in batches of one template by the `send_pending_emails` task
+EMAIL_BATCHING_ENABLED = env.bool("EMAIL_BATCHING_ENABLED", default=True)
+EMAIL_BATCH_MAX_PENDING = env.int("EMAIL_BATCH_MAX_PENDING", default=5000)
+# Failed emails are retried after EMAIL_RETRY_BACKOFF_IN_SECONDS, doubled with every attempt
+EMAIL_MAX_ATTEMPTS = env.int("EMAIL_MAX_ATTEMPTS", default=5)
+EMAIL_RETRY_BACKOFF_IN_SECONDS = env.int("EMAIL_RETRY_BACKOFF_IN_SECONDS", default=30)
+# Claimed emails are not claimed again for this long, unless they were sent or postponed
+EMAIL_SEND_LEASE_IN_SECONDS = env.int("EMAIL_SEND_LEASE_IN_SECONDS", default=300)
 DOMAIN = "https://dj-lodging.com"
 
 # CELERY SETTINGS
 CELERY_BROKER_URL = env.str("CELERY_BROKER_URL")
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_BEAT_SCHEDULE = {
-    "delete_users_with_unfinished_registration": {
-        "task": "djlodging.infrastructure.jobs.celery_tasks.delete_users_with_unfinished_registration",  # noqa pylint: disable=C0301
+    # Catches up on payment events left pending, e.g. after failures
+    "process_payment_events": {
+        "task": "djlodging.infrastructure.jobs.celery_tasks.process_payment_events",
+        "schedule": timedelta(
+            seconds=env.int("CELERY_BEAT_PROCESS_PAYMENT_EVENTS_INTERVAL_IN_SECONDS", default=60)
+        ),
+    },
+    "send_pending_emails": {
+        "task": "djlodging.infrastructure.jobs.celery_tasks.send_pending_emails",
         "schedule": timedelta(
-            hours=env.int(
-                "CELERY_BEAT_DELETE_USERS_WITH_UNFINISHED_REGISTRATION_INTERVAL", default=24
-            )
+            seconds=env.int("CELERY_BEAT_SEND_PENDING_EMAILS_INTERVAL_IN_SECONDS", default=10)
+        ),
+    },
+    # Deletes unpaid bookings and unfinished registrations once their deadline has passed
+    "expire_due_objects": {
+        "task": "djlodging.infrastructure.jobs.celery_tasks.expire_due_objects",
+        "schedule": timedelta(
+            seconds=env.int("CELERY_BEAT_EXPIRE_DUE_OBJECTS_INTERVAL_IN_SECONDS", default=60)
         ),
     },
 }
+# Expiry sweeps delete in batches of this many rows, each batch in its own transaction,
+# and start no new batch after the time budget is spent: the rest waits for the next run.
+EXPIRY_SWEEP_BATCH_SIZE = env.int("EXPIRY_SWEEP_BATCH_SIZE", default=500)
+EXPIRY_SWEEP_TIME_BUDGET_IN_SECONDS = env.int("EXPIRY_SWEEP_TIME_BUDGET_IN_SECONDS", default=30)
+
+# OUTBOUND PROVIDER HTTP SETTINGS
+# Email and payment provider calls share one keep-alive session per provider and worker process
+PROVIDER_HTTP_POOL_SIZE = env.int("PROVIDER_HTTP_POOL_SIZE", default=10)
+PROVIDER_HTTP_KEEP_ALIVE = env.bool("PROVIDER_HTTP_KEEP_ALIVE", default=True)
+PROVIDER_HTTP_CONNECT_TIMEOUT_IN_SECONDS = env.float(
+    "PROVIDER_HTTP_CONNECT_TIMEOUT_IN_SECONDS", default=3.05
+)
+PROVIDER_HTTP_READ_TIMEOUT_IN_SECONDS = env.float(
+    "PROVIDER_HTTP_READ_TIMEOUT_IN_SECONDS", default=30
+)
+# Every worker process logs the latency histograms of its sessions at most this often
+PROVIDER_HTTP_LATENCY_LOG_INTERVAL_IN_SECONDS = env.int(
+    "PROVIDER_HTTP_LATENCY_LOG_INTERVAL_IN_SECONDS", default=300
+)
 
 # PAYMENT SETTINGS
 PAYMENT_PROVIDER = "djlodging.infrastructure.providers.payments.StripePaymentProvider"
 STRIPE_LIVE_SECRET_KEY = env.str("STRIPE_LIVE_SECRET_KEY", "<your secret key>")
 STRIPE_TEST_SECRET_KEY = env.str("STRIPE_TEST_SECRET_KEY", "<your secret key>")
 STRIPE_API_KEY = STRIPE_TEST_SECRET_KEY if DEBUG else STRIPE_LIVE_SECRET_KEY
+STRIPE_API_BASE = env.str("STRIPE_API_BASE", default="https://api.stripe.com")
 STRIPE_LIVE_MODE = False  # Change to True in production
 DJSTRIPE_WEBHOOK_SECRET = env.str(
     "DJSTRIPE_WEBHOOK_SECRET"
@@ -243,3 +379,10 @@ DJSTRIPE_FOREIGN_KEY_TO_FIELD = "id"
 BOOKING_PAYMENT_EXPIRATION_TIME_IN_MINUTES = env.int(
     "BOOKING_PAYMENT_EXPIRATION_TIME_IN_MINUTES", default=15
 )
+# Client secrets of payment intents reused by repeated pay requests, capped by the booking's
+# payment expiration time, see djlodging.domain.bookings.repository.PaymentIntentCacheRepository
+PAYMENT_INTENT_CACHE_TTL_IN_SECONDS = env.int("PAYMENT_INTENT_CACHE_TTL_IN_SECONDS", default=300)
+# Stripe webhook events are stored and processed in batches by the process_payment_events task
+PAYMENT_EVENT_BATCH_SIZE = env.int("PAYMENT_EVENT_BATCH_SIZE", default=100)
+PAYMENT_EVENT_MAX_ATTEMPTS = env.int("PAYMENT_EVENT_MAX_ATTEMPTS", default=5)
+BOOKING_BULK_CREATE_MAX_ITEMS = env.int("BOOKING_BULK_CREATE_MAX_ITEMS", default=100)
@@ -43,10 +43,12 @@ urlpatterns = [
         SpectacularRedocView.as_view(url_name="schema"),
         name="redoc",
     ),
-    path("silk/", include("silk.urls", namespace="silk")),
     path("stripe/", include("djstripe.urls", namespace="djstripe")),
 ]
 
+if settings.SILK_ENABLED:
+    urlpatterns += [path("silk/", include("silk.urls", namespace="silk"))]
+
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 # print(urlpatterns)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from djlodging.domain.bookings.models import Booking
+from djlodging.domain.bookings.models import Booking, PaymentEvent
 
 
 class BookingAdmin(admin.ModelAdmin):
@@ -8,3 +8,10 @@ class BookingAdmin(admin.ModelAdmin):
 
 
 admin.site.register(Booking, BookingAdmin)
+
+
+class PaymentEventAdmin(admin.ModelAdmin):
+    list_display = ["event_id", "type", "booking_id", "event_created", "processed_at", "attempts"]
+
+
+admin.site.register(PaymentEvent, PaymentEventAdmin)
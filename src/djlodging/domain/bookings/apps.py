@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BookingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "djlodging.domain.bookings"
+
+    def ready(self):
+        # pylint: disable=import-outside-toplevel,unused-import
+        from djlodging.domain.bookings import signals  # noqa: F401
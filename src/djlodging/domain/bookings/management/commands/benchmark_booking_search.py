@@ -0,0 +1,157 @@
+from datetime import date
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from faker import Faker
+
+from djlodging.api.bookings.projections import BOOKING_LIST_PROJECTION
+from djlodging.domain.bookings.filters import BookingFilterSet
+from djlodging.domain.bookings.reference_codes import get_next_reference_codes
+from djlodging.domain.bookings.repository import BookingRepository
+from djlodging.domain.core.base_filters import Filter
+from djlodging.domain.lodgings.models import City, Country, Lodging
+
+User = get_user_model()
+
+TRIGRAM_INDEXES = (
+    "country_name_trgm_idx",
+    "city_name_trgm_idx",
+    "city_region_trgm_idx",
+    "lodging_district_trgm_idx",
+    "lodging_street_trgm_idx",
+    "lodging_zip_code_trgm_idx",
+)
+# The icontains filters of BookingFilterSet and the lodging columns behind them
+SEARCHES = {
+    "country_name": lambda lodging: lodging.city.country.name,
+    "country_region": lambda lodging: lodging.city.region,
+    "city_name": lambda lodging: lodging.city.name,
+    "city_district": lambda lodging: lodging.district,
+    "street": lambda lodging: lodging.street,
+    "zip_code": lambda lodging: lodging.zip_code,
+}
+PAGE_SIZE = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate bookings and time the admin booking search (count and first page) for every "
+        "icontains filter of BookingFilterSet, with the trigram indexes and without them. "
+        "Nothing is committed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=1_000_000, help="Bookings to add")
+        parser.add_argument("--lodgings", type=int, default=20_000, help="Lodgings to add")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per search")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = perf_counter()
+            lodgings = self._add_lodgings(options["lodgings"])
+            self._add_bookings(options["bookings"], lodgings)
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+            self.stdout.write(f"Generated the data in {perf_counter() - started:.1f} s.")
+
+            # A lodging's own values, as an admin looking up a booking would type them
+            searches = {
+                filter_name: get_value(lodgings[0]) for filter_name, get_value in SEARCHES.items()
+            }
+            with_indexes = self._time_searches(searches, options["repeat"])
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP INDEX {', '.join(TRIGRAM_INDEXES)}")
+            without_indexes = self._time_searches(searches, options["repeat"])
+            transaction.set_rollback(True)
+
+        for filter_name, term in searches.items():
+            before, after = without_indexes[filter_name], with_indexes[filter_name]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{filter_name}={term!r}: {before:.1f} ms without the trigram indexes, "
+                    f"{after:.1f} ms with them ({before / after:.1f}x)."
+                )
+            )
+
+    def _add_lodgings(self, number_of_lodgings: int) -> list:
+        fake = Faker()
+        Faker.seed(0)
+        countries = Country.objects.bulk_create(
+            Country(name=f"{fake.unique.country()} {index}") for index in range(50)
+        )
+        cities = City.objects.bulk_create(
+            City(country=countries[index % len(countries)], name=fake.city(), region=fake.state())
+            for index in range(max(number_of_lodgings // 10, 1))
+        )
+        owner = self._add_user(fake, is_partner=True)
+        return Lodging.objects.bulk_create(
+            (
+                Lodging(
+                    name=fake.word(),
+                    kind=Lodging.Kind.APARTMENT,
+                    owner=owner,
+                    city=cities[index % len(cities)],
+                    district=fake.city_suffix(),
+                    street=fake.street_name(),
+                    house_number=fake.building_number(),
+                    zip_code=fake.postcode(),
+                    price=100,
+                )
+                for index in range(number_of_lodgings)
+            ),
+            batch_size=5000,
+        )
+
+    def _add_bookings(self, number_of_bookings: int, lodgings: list) -> None:
+        # Consecutive one night stays per lodging, so that none overlap
+        user = self._add_user(Faker())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO bookings_booking (
+                    id, created, updated, lodging_id, user_id, date_from, date_to, status,
+                    payment_intent_id, reference_code
+                )
+                SELECT
+                    gen_random_uuid(), now(), now(),
+                    (%(lodging_ids)s::uuid[])[1 + n %% %(number_of_lodgings)s], %(user_id)s,
+                    %(start)s::date + n / %(number_of_lodgings)s,
+                    %(start)s::date + n / %(number_of_lodgings)s + 1,
+                    'paid', '', (%(reference_codes)s::text[])[1 + n]
+                FROM generate_series(0, %(number_of_bookings)s - 1) AS n
+                """,
+                {
+                    "lodging_ids": [str(lodging.id) for lodging in lodgings],
+                    "number_of_lodgings": len(lodgings),
+                    "user_id": user.id,
+                    "start": date(2030, 1, 1),
+                    "number_of_bookings": number_of_bookings,
+                    "reference_codes": get_next_reference_codes(number_of_bookings),
+                },
+            )
+
+    def _add_user(self, fake: Faker, **kwargs):
+        user = User(email=fake.unique.email(), **kwargs)
+        user.set_unusable_password()
+        user.save()
+        return user
+
+    def _time_searches(self, searches: dict, repeat: int) -> dict:
+        """The best milliseconds of the count and first page of every search."""
+        durations = {}
+        for filter_name, term in searches.items():
+            bookings = Filter(BookingFilterSet).filter(
+                {filter_name: term}, BookingRepository.get_all()
+            )
+            page = BOOKING_LIST_PROJECTION.values(bookings)[:PAGE_SIZE]
+            runs = []
+            # The first run warms the cache and is not counted
+            for _ in range(repeat + 1):
+                started = perf_counter()
+                bookings.count()
+                list(page)
+                runs.append(perf_counter() - started)
+            durations[filter_name] = min(runs[1:]) * 1000
+        return durations
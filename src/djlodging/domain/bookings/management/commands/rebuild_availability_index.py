@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from djlodging.domain.bookings.repository import BookedDayRepository
+
+
+class Command(BaseCommand):
+    help = "Rebuild the lodgings availability index (booked days) from all bookings."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            number_of_booked_days = BookedDayRepository.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Availability index rebuilt: {number_of_booked_days} booked days.")
+        )
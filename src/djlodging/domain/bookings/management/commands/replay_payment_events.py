@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from djlodging.application_services.payment_events import PaymentEventService
+from djlodging.domain.bookings.repository import PaymentEventRepository
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill payment webhook events from the payment provider and process all pending ones. "
+        "Already stored events are skipped, so the command is safe to rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Fetch events created since this ISO datetime")
+        parser.add_argument("--type", default="payment_intent.succeeded", help="Event type")
+        parser.add_argument(
+            "--reset-failed",
+            action="store_true",
+            help="Retry the pending events that ran out of attempts",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset_failed"]:
+            reset = PaymentEventRepository.reset_failed()
+            self.stdout.write(f"{reset} failed events will be retried.")
+
+        if options["since"]:
+            created_after = parse_datetime(options["since"])
+            if created_after is None:
+                raise CommandError("--since must be an ISO datetime, e.g. 2023-01-31T00:00:00Z.")
+            fetched, stored = PaymentEventService.backfill(options["type"], created_after)
+            self.stdout.write(f"{fetched} events fetched, {stored} of them new.")
+
+        processed = PaymentEventService.process_all_pending()
+        self.stdout.write(self.style.SUCCESS(f"{processed} payment events processed."))
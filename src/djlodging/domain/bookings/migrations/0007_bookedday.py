@@ -0,0 +1,50 @@
+# Generated by Django 4.0 on 2026-10-17 22:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+from datetime import timedelta
+
+
+def fill_booked_days(apps, schema_editor):
+    Booking = apps.get_model('bookings', 'Booking')
+    BookedDay = apps.get_model('bookings', 'BookedDay')
+    booked_days = []
+    bookings = Booking.objects.exclude(status='canceled').filter(lodging__isnull=False)
+    for booking in bookings.iterator():
+        for night in range((booking.date_to - booking.date_from).days):
+            booked_days.append(
+                BookedDay(
+                    lodging_id=booking.lodging_id,
+                    booking_id=booking.id,
+                    day=booking.date_from + timedelta(days=night),
+                )
+            )
+    BookedDay.objects.bulk_create(booked_days, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lodgings', '0006_alter_lodging_options_alter_lodgingimage_options_and_more'),
+        ('bookings', '0006_booking_payment_expiration_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookedDay',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('day', models.DateField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booked_days', to='bookings.booking')),
+                ('lodging', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booked_days', to='lodgings.lodging')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='bookedday',
+            index=models.Index(fields=['lodging', 'day'], name='booked_day_lodging_day_idx'),
+        ),
+        migrations.RunPython(fill_booked_days, migrations.RunPython.noop),
+    ]
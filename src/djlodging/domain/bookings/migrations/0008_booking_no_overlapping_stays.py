@@ -0,0 +1,80 @@
+# Generated by Django 4.0 on 2026-10-17 23:05
+
+import logging
+
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+import djlodging.domain.core.db_functions
+
+logger = logging.getLogger(__name__)
+
+
+def cancel_overlapping_bookings(apps, schema_editor):
+    # The former check in the application was racy, so stays may already overlap. Per lodging the
+    # oldest booking keeps the nights, a later one overlapping a kept one is canceled and logged.
+    Booking = apps.get_model('bookings', 'Booking')
+    BookedDay = apps.get_model('bookings', 'BookedDay')
+    db_alias = schema_editor.connection.alias
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT DISTINCT earlier.lodging_id FROM bookings_booking earlier '
+            'JOIN bookings_booking later ON later.lodging_id = earlier.lodging_id '
+            'AND later.id <> earlier.id '
+            "AND DATERANGE(later.date_from, later.date_to, '[)') "
+            "&& DATERANGE(earlier.date_from, earlier.date_to, '[)') "
+            "WHERE earlier.status <> 'canceled' AND later.status <> 'canceled'"
+        )
+        lodging_ids = [lodging_id for lodging_id, in cursor.fetchall()]
+
+    canceled_ids = []
+    for lodging_id in lodging_ids:
+        kept_bookings = []
+        bookings = (
+            Booking.objects.using(db_alias)
+            .filter(lodging_id=lodging_id)
+            .exclude(status='canceled')
+            .order_by('created', 'id')
+        )
+        for booking in bookings:
+            overlapped_booking = next(
+                (
+                    kept_booking
+                    for kept_booking in kept_bookings
+                    if kept_booking.date_from < booking.date_to
+                    and booking.date_from < kept_booking.date_to
+                ),
+                None,
+            )
+            if overlapped_booking is None:
+                kept_bookings.append(booking)
+                continue
+            logger.warning(
+                'Canceled booking %s (%s, %s) of lodging %s, it overlaps booking %s.',
+                booking.id,
+                booking.date_from,
+                booking.date_to,
+                lodging_id,
+                overlapped_booking.id,
+            )
+            canceled_ids.append(booking.id)
+
+    Booking.objects.using(db_alias).filter(id__in=canceled_ids).update(status='canceled')
+    # Canceled bookings occupy no nights, see BookedDayRepository.sync_with_booking
+    BookedDay.objects.using(db_alias).filter(booking_id__in=canceled_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_bookedday'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.RunPython(cancel_overlapping_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status', 'canceled'), _negated=True), expressions=[('lodging', '='), (djlodging.domain.core.db_functions.DateRange('date_from', 'date_to'), '&&')], name='booking_no_overlapping_stays'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0 on 2026-10-17 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0008_booking_no_overlapping_stays'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status', 'payment_pending')), fields=['payment_expiration_time', 'id'], name='booking_unpaid_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.0 on 2026-10-18 00:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lodgings', '0009_lodging_access_path_indexes'),
+        ('users', '0007_user_auth_version'),
+        ('bookings', '0010_paymentevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['lodging', 'date_from', 'date_to', 'status'], name='booking_lodging_stay_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-created', 'id'], name='booking_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['reference_code'], name='booking_reference_code_idx'),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='lodging',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='booking', to='lodgings.lodging'),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='booking', to='users.user'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 4.0 on 2026-10-18 00:39
+
+from django.db import migrations, models
+from django.db.models import Count
+import djlodging.domain.bookings.models
+from djlodging.domain.bookings.reference_codes import (
+    NUMBER_RANGE,
+    SEQUENCE_NAME,
+    encode_reference_code,
+)
+
+
+def create_sequence(apps, schema_editor):
+    # Running out of numbers fails loudly instead of repeating codes.
+    schema_editor.execute(f'CREATE SEQUENCE {SEQUENCE_NAME} MAXVALUE {NUMBER_RANGE - 1}')
+
+
+def drop_sequence(apps, schema_editor):
+    schema_editor.execute(f'DROP SEQUENCE {SEQUENCE_NAME}')
+
+
+def get_next_reference_codes(schema_editor, count):
+    # The migration's own connection, not the default one
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT nextval(%s) FROM generate_series(1, %s)', [SEQUENCE_NAME, count])
+        return [encode_reference_code(number) for number, in cursor.fetchall()]
+
+
+def reassign_duplicate_reference_codes(apps, schema_editor):
+    # The oldest booking keeps a duplicated code, the others get new ones.
+    Booking = apps.get_model('bookings', 'Booking')
+    db_alias = schema_editor.connection.alias
+    duplicated_codes = (
+        Booking.objects.using(db_alias)
+        .values('reference_code')
+        .annotate(bookings=Count('id'))
+        .filter(bookings__gt=1)
+        .values_list('reference_code', flat=True)
+    )
+    for reference_code in list(duplicated_codes):
+        bookings = list(
+            Booking.objects.using(db_alias).filter(reference_code=reference_code).order_by('created')[1:]
+        )
+        new_reference_codes = get_next_reference_codes(schema_editor, len(bookings))
+        for booking, new_reference_code in zip(bookings, new_reference_codes):
+            booking.reference_code = new_reference_code
+        Booking.objects.using(db_alias).bulk_update(bookings, ['reference_code'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0011_booking_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sequence, drop_sequence),
+        migrations.AlterField(
+            model_name='booking',
+            name='reference_code',
+            field=models.CharField(default=djlodging.domain.bookings.models.get_next_reference_code, max_length=8),
+        ),
+        migrations.RunPython(reassign_duplicate_reference_codes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(fields=('reference_code',), name='booking_reference_code_key'),
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_reference_code_idx',
+        ),
+    ]
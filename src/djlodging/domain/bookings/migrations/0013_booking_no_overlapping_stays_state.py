@@ -0,0 +1,13 @@
+# Generated by Django 4.0 on 2026-10-18 01:28
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Formerly declared the constraint added in SQL by 0008, which now declares it itself
+
+    dependencies = [
+        ('bookings', '0012_booking_unique_reference_code'),
+    ]
+
+    operations = []
@@ -2,28 +2,45 @@ from random import choice
 from string import ascii_uppercase, digits
 
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import RangeOperators
 from django.db import models
 
+from djlodging.domain.bookings.reference_codes import (
+    REFERENCE_CODE_LENGTH,
+    get_next_reference_codes,
+)
 from djlodging.domain.core.base_models import BaseModel
+from djlodging.domain.core.db_functions import DateRange
 from djlodging.domain.lodgings.models import Lodging
 
 User = get_user_model()
 
+NO_OVERLAPPING_STAYS_CONSTRAINT = "booking_no_overlapping_stays"
+
 
 def generate_reference_code(size=6, chars=ascii_uppercase + digits):
+    # The former random default, kept for the migrations that reference it
     return "".join(choice(chars) for _ in range(size))
 
 
+def get_next_reference_code() -> str:
+    return get_next_reference_codes(1)[0]
+
+
 class Booking(BaseModel):
     class Status(models.TextChoices):
         PAYMENT_PENDING = "payment_pending", "Payment pending"
         PAID = "paid", "Paid"
         CANCELED = "canceled", "Canceled"
 
+    # The foreign keys are indexed by the composite indexes below, which lead with them
     lodging = models.ForeignKey(
-        Lodging, on_delete=models.SET_NULL, null=True, related_name="booking"
+        Lodging, on_delete=models.SET_NULL, null=True, related_name="booking", db_index=False
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="booking", db_index=False
     )
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="booking")
     date_from = models.DateField()
     date_to = models.DateField()
     status = models.CharField(
@@ -31,10 +48,87 @@ class Booking(BaseModel):
     )
     payment_intent_id = models.CharField(max_length=255, blank=True)
     payment_expiration_time = models.DateTimeField(blank=True, null=True)
-    reference_code = models.CharField(max_length=6, default=generate_reference_code)
+    # Unique, see reference_codes
+    reference_code = models.CharField(
+        max_length=REFERENCE_CODE_LENGTH, default=get_next_reference_code
+    )
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            # A lodging's bookings by stay, see BookingFilterSet
+            models.Index(
+                fields=["lodging", "date_from", "date_to", "status"],
+                name="booking_lodging_stay_idx",
+            ),
+            # A user's bookings in the default and cursor order, see CURSOR_ORDERING
+            models.Index(fields=["user", "-created", "id"], name="booking_user_created_idx"),
+            models.Index(
+                fields=["payment_expiration_time", "id"],
+                condition=models.Q(status="payment_pending"),
+                name="booking_unpaid_expiry_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["reference_code"], name="booking_reference_code_key"),
+            # A night of a lodging is booked at most once, see BookingService.create
+            ExclusionConstraint(
+                name=NO_OVERLAPPING_STAYS_CONSTRAINT,
+                expressions=[
+                    ("lodging", RangeOperators.EQUAL),
+                    (DateRange("date_from", "date_to"), RangeOperators.OVERLAPS),
+                ],
+                condition=~models.Q(status="canceled"),
+            ),
+        ]
 
     def __str__(self):
         return (
             f"{self.user.email} | {self.lodging.name} in {self.lodging.city} | "
             + f"({self.date_from} - {self.date_to})"
         )
+
+
+class BookedDay(BaseModel):
+    """
+    Availability index: one row per night occupied by a non-canceled booking.
+
+    Lets the lodging search probe `(lodging, day)` directly instead of joining all bookings.
+    """
+
+    lodging = models.ForeignKey(Lodging, on_delete=models.CASCADE, related_name="booked_days")
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name="booked_days")
+    day = models.DateField()
+
+    class Meta:
+        indexes = [models.Index(fields=["lodging", "day"], name="booked_day_lodging_day_idx")]
+
+    def __str__(self):
+        return f"{self.lodging_id} | {self.day}"
+
+
+class PaymentEvent(BaseModel):
+    """
+    A payment provider webhook event, stored once per provider event ID
+    and processed asynchronously, in order per booking.
+    """
+
+    event_id = models.CharField(max_length=255, unique=True)
+    type = models.CharField(max_length=255)
+    booking_id = models.UUIDField(null=True, blank=True)
+    payload = models.JSONField()
+    event_created = models.DateTimeField()
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["booking_id", "event_created"],
+                condition=models.Q(processed_at__isnull=True),
+                name="payment_event_pending_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} | {self.type}"
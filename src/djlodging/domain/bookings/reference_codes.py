@@ -0,0 +1,81 @@
+"""
+Booking reference codes: 7 base 36 digits of a sequence number and a check character.
+
+Every code is made from its own number of the `booking_reference_code_seq` sequence, so codes
+never collide and inserts never retry. The number is multiplied by a constant coprime with 36^7,
+which permutes the 7 digit range, so that consecutive bookings don't get guessable neighbours.
+The check character (Damm) rejects a mistyped character or two swapped neighbours
+without a query.
+"""
+from string import ascii_uppercase, digits
+from typing import List
+
+from django.db import connection
+
+ALPHABET = digits + ascii_uppercase
+BASE = len(ALPHABET)
+NUMBER_LENGTH = 7
+NUMBER_RANGE = BASE**NUMBER_LENGTH
+# Coprime with NUMBER_RANGE, so multiplying by it modulo NUMBER_RANGE is a bijection
+MULTIPLIER = 48_271_000_001
+REFERENCE_CODE_LENGTH = NUMBER_LENGTH + 1
+# Codes issued before the sequence, random characters without a check character
+LEGACY_REFERENCE_CODE_LENGTH = 6
+SEQUENCE_NAME = "booking_reference_code_seq"
+
+
+def _build_quasigroup() -> List[List[int]]:
+    """
+    A totally anti-symmetric quasigroup of order 36 for the Damm check character.
+
+    It is the direct product of `x * y = w x + y` over GF(4), with w a root of w^2 = w + 1,
+    and `x * y = 2 x + y` over Z/9, with digit `9 h + l` split into the components (h, l).
+    """
+
+    def times_w(h: int) -> int:
+        return ((h >> 1 ^ h) & 1) << 1 | h >> 1
+
+    return [
+        [9 * (times_w(x // 9) ^ y // 9) + (2 * (x % 9) + y % 9) % 9 for y in range(BASE)]
+        for x in range(BASE)
+    ]
+
+
+QUASIGROUP = _build_quasigroup()
+
+
+def get_next_reference_codes(count: int) -> List[str]:
+    """`count` new reference codes, their numbers are taken from the sequence in one query."""
+    if count <= 0:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT nextval(%s) FROM generate_series(1, %s)", [SEQUENCE_NAME, count])
+        return [encode_reference_code(number) for number, in cursor.fetchall()]
+
+
+def encode_reference_code(number: int) -> str:
+    permuted_number = number * MULTIPLIER % NUMBER_RANGE
+    reversed_digits = []
+    for _ in range(NUMBER_LENGTH):
+        permuted_number, digit = divmod(permuted_number, BASE)
+        reversed_digits.append(ALPHABET[digit])
+    body = "".join(reversed(reversed_digits))
+    return body + _get_check_character(body)
+
+
+def is_valid_reference_code(reference_code: str) -> bool:
+    if any(character not in ALPHABET for character in reference_code):
+        return False
+    if len(reference_code) == LEGACY_REFERENCE_CODE_LENGTH:
+        return True
+    if len(reference_code) != REFERENCE_CODE_LENGTH:
+        return False
+    return _get_check_character(reference_code[:-1]) == reference_code[-1]
+
+
+def _get_check_character(body: str) -> str:
+    interim = 0
+    for character in body:
+        interim = QUASIGROUP[interim][ALPHABET.index(character)]
+    # The check character takes the interim digit to 0
+    return ALPHABET[QUASIGROUP[interim].index(0)]
@@ -1,14 +1,26 @@
-from typing import Dict, List, Optional, Union
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 from uuid import UUID
 
-from django.db.models import QuerySet
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F, Min, Q, QuerySet
 from django.utils.timezone import now
 
-from djlodging.api.pagination import paginate_queryset
+from djlodging.api.pagination import CountStrategy, paginate_queryset
 from djlodging.domain.bookings.filters import BookingFilterSet
-from djlodging.domain.bookings.models import Booking
+from djlodging.domain.bookings.models import BookedDay, Booking, PaymentEvent
+from djlodging.domain.bookings.reference_codes import (
+    get_next_reference_codes,
+    is_valid_reference_code,
+)
 from djlodging.domain.bookings.sorting import sort_queryset
 from djlodging.domain.core.base_filters import Filter
+from djlodging.domain.core.db_functions import DateRange
+from djlodging.domain.core.projections import Projection
+from djlodging.domain.core.sweeps import SweepMetrics, delete_in_batches
 from djlodging.domain.users.models import User
 
 
@@ -23,11 +35,14 @@ class BookingRepository:
 
     @classmethod
     def get_list_by_user(cls, user: User) -> QuerySet[Booking]:
-        return Booking.objects.filter(user=user)
+        # By the id, so that a request user is not loaded just for the filter
+        return Booking.objects.filter(user_id=user.id)
 
     @classmethod
-    def get_paginated_list_by_user(cls, user: User, query_params: dict) -> dict:
-        bookings = cls.get_list_by_user(user)
+    def get_paginated_list_by_user(
+        cls, user: User, query_params: dict, projection: Projection
+    ) -> dict:
+        bookings = projection.values(cls.get_list_by_user(user))
         sorted_bookings = sort_queryset(bookings, query_params)
         return paginate_queryset(sorted_bookings, query_params)
 
@@ -35,10 +50,37 @@ class BookingRepository:
     def get_by_id(cls, booking_id: Union[UUID, str]) -> Booking:
         return Booking.objects.get(id=booking_id)
 
+    @classmethod
+    def get_for_notification(cls, booking_id: Union[UUID, str]) -> Booking:
+        """The booking with what its emails render (user, lodging, city, owner) in one query."""
+        return (
+            Booking.objects.select_related("user", "lodging__city", "lodging__owner")
+            .only(
+                "date_from",
+                "date_to",
+                "reference_code",
+                "user__email",
+                "user__username",
+                "lodging__name",
+                "lodging__city__name",
+                "lodging__owner__email",
+                "lodging__owner__username",
+            )
+            .get(id=booking_id)
+        )
+
     @classmethod
     def get_by_reference_code(cls, reference_code: str) -> Optional[Booking]:
+        # A mistyped code is rejected by its check character, without a query
+        if not is_valid_reference_code(reference_code):
+            return None
         return Booking.objects.filter(reference_code=reference_code).first()
 
+    @classmethod
+    def get_next_reference_codes(cls, count: int) -> List[str]:
+        """Reference codes for `count` new bookings, instead of a query per booking."""
+        return get_next_reference_codes(count)
+
     @classmethod
     def change_status(cls, booking: Booking, new_status: str) -> Booking:
         booking.status = new_status
@@ -46,12 +88,41 @@ class BookingRepository:
         return booking
 
     @classmethod
-    def get_filtered_list(cls, query_params: dict) -> Dict[str, Union[int, List[Booking]]]:
-        qs = BookingRepository.get_all()
+    def has_overlapping_bookings(
+        cls, lodging_id: Union[UUID, str], date_from: date, date_to: date
+    ) -> bool:
+        """Check whether any non-canceled booking of the lodging overlaps [date_from, date_to)."""
+        active_bookings = Booking.objects.filter(lodging_id=lodging_id).exclude(
+            status=Booking.Status.CANCELED
+        )
+        if connection.vendor == "postgresql":
+            # Uses the GiST index behind the `booking_no_overlapping_stays` exclusion constraint.
+            overlapping_bookings = active_bookings.annotate(
+                stay=DateRange(F("date_from"), F("date_to"))
+            ).filter(stay__overlap=(date_from, date_to))
+        else:
+            overlapping_bookings = active_bookings.filter(
+                date_from__lt=date_to, date_to__gt=date_from
+            )
+        return overlapping_bookings.exists()
+
+    @classmethod
+    def get_filtered_list(
+        cls, query_params: dict, projection: Projection
+    ) -> Dict[str, Union[int, List[dict]]]:
+        qs = projection.values(cls.get_all())
         filter_decorator = Filter(BookingFilterSet)
         filtered_qs = filter_decorator.filter(queryset=qs, query_params=query_params)
         sorted_qs = sort_queryset(filtered_qs, query_params)
-        return paginate_queryset(sorted_qs, query_params)
+        # The admin list is filtered by icontains lookups, so recounting every page is expensive.
+        return paginate_queryset(sorted_qs, query_params, count_strategy=CountStrategy.CACHED)
+
+    @classmethod
+    def bulk_create(cls, bookings: List[Booking]) -> List[Booking]:
+        """Insert new bookings at once. No post_save is sent, so booked days are added here."""
+        Booking.objects.bulk_create(bookings, batch_size=BookedDayRepository.BATCH_SIZE)
+        BookedDayRepository.sync_with_bookings(bookings)
+        return bookings
 
     @classmethod
     def delete_by_id(cls, booking_id: Union[UUID, str]) -> tuple:
@@ -59,8 +130,212 @@ class BookingRepository:
         return booking.delete()
 
     @classmethod
-    def delete_all_expired_unpaid_bookings(cls) -> None:
+    def delete_all_expired_unpaid_bookings(
+        cls, time_budget_in_seconds: Optional[float] = None
+    ) -> SweepMetrics:
         expired_unpaid_bookings = Booking.objects.filter(
             status=Booking.Status.PAYMENT_PENDING, payment_expiration_time__lte=now()
         )
-        expired_unpaid_bookings.delete()
+        # Walks the `booking_unpaid_expiry_idx` partial index
+        return delete_in_batches(
+            expired_unpaid_bookings,
+            order_field="payment_expiration_time",
+            name="delete_all_expired_unpaid_bookings",
+            batch_size=settings.EXPIRY_SWEEP_BATCH_SIZE,
+            time_budget_in_seconds=(
+                settings.EXPIRY_SWEEP_TIME_BUDGET_IN_SECONDS
+                if time_budget_in_seconds is None
+                else time_budget_in_seconds
+            ),
+        )
+
+
+class BookedDayRepository:
+    BATCH_SIZE = 1000
+
+    @classmethod
+    def _build_booked_days(cls, booking: Booking) -> List[BookedDay]:
+        if booking.status == Booking.Status.CANCELED or booking.lodging_id is None:
+            return []
+        number_of_nights = (booking.date_to - booking.date_from).days
+        return [
+            BookedDay(
+                lodging_id=booking.lodging_id,
+                booking_id=booking.id,
+                day=booking.date_from + timedelta(days=night),
+            )
+            for night in range(number_of_nights)
+        ]
+
+    @classmethod
+    def sync_with_booking(cls, booking: Booking, is_new: bool = False) -> Set[date]:
+        """Replace the booking's booked days. Returns the days that were or are now booked."""
+        changed_days = set()
+        if not is_new:
+            booked_days = BookedDay.objects.filter(booking_id=booking.id)
+            changed_days.update(booked_days.values_list("day", flat=True))
+            booked_days.delete()
+        new_booked_days = cls._build_booked_days(booking)
+        BookedDay.objects.bulk_create(new_booked_days, batch_size=cls.BATCH_SIZE)
+        return changed_days.union(booked_day.day for booked_day in new_booked_days)
+
+    @classmethod
+    def sync_with_bookings(cls, bookings: Iterable[Booking]) -> int:
+        """Insert booked days for new bookings in batches. Returns the number of inserted rows."""
+        inserted = 0
+        booked_days: List[BookedDay] = []
+        for booking in bookings:
+            booked_days.extend(cls._build_booked_days(booking))
+            if len(booked_days) >= cls.BATCH_SIZE:
+                BookedDay.objects.bulk_create(booked_days, batch_size=cls.BATCH_SIZE)
+                inserted += len(booked_days)
+                booked_days = []
+        BookedDay.objects.bulk_create(booked_days, batch_size=cls.BATCH_SIZE)
+        return inserted + len(booked_days)
+
+    @classmethod
+    def rebuild(cls) -> int:
+        BookedDay.objects.all().delete()
+        bookings = (
+            Booking.objects.exclude(status=Booking.Status.CANCELED)
+            .filter(lodging__isnull=False)
+            .only("id", "lodging_id", "date_from", "date_to", "status")
+            .iterator(chunk_size=cls.BATCH_SIZE)
+        )
+        return cls.sync_with_bookings(bookings)
+
+    @classmethod
+    def get_booked_days_for_stays(
+        cls, stays: Iterable[Tuple[UUID, date, date]]
+    ) -> Dict[UUID, Set[date]]:
+        """Booked days of every (lodging_id, date_from, date_to) stay, in a single query."""
+        stays_filter = Q()
+        for lodging_id, date_from, date_to in stays:
+            stays_filter |= Q(lodging_id=lodging_id, day__gte=date_from, day__lt=date_to)
+        if not stays_filter:
+            return {}
+
+        booked_days = defaultdict(set)
+        for lodging_id, day in BookedDay.objects.filter(stays_filter).values_list(
+            "lodging_id", "day"
+        ):
+            booked_days[lodging_id].add(day)
+        return booked_days
+
+    @classmethod
+    def get_list_between_dates(cls, date_from: date, date_to: date) -> QuerySet[BookedDay]:
+        return BookedDay.objects.filter(day__gte=date_from, day__lt=date_to)
+
+
+class PaymentIntentCacheRepository:
+    """
+    Client secrets of the bookings' payment intents, so that repeated pay requests for a booking
+    don't ask the payment provider for its intent again.
+
+    An entry remembers the intent and the terms (price, currency, capture method) it was made for,
+    and is only used while both still match the booking and the request.
+    """
+
+    KEY_TEMPLATE = "payment-intent:{booking_id}"
+
+    @classmethod
+    def get(
+        cls, booking_id: Union[UUID, str], payment_intent_id: str, terms: dict
+    ) -> Optional[str]:
+        entry = cache.get(cls._get_key(booking_id))
+        if entry is None or entry["payment_intent_id"] != payment_intent_id:
+            return None
+        if entry["terms"] != terms:
+            return None
+        return entry["client_secret"]
+
+    @classmethod
+    def set(
+        cls,
+        booking_id: Union[UUID, str],
+        payment_intent_id: str,
+        terms: dict,
+        client_secret: str,
+        timeout: int,
+    ) -> None:
+        entry = {
+            "payment_intent_id": payment_intent_id,
+            "terms": terms,
+            "client_secret": client_secret,
+        }
+        cache.set(cls._get_key(booking_id), entry, timeout=timeout)
+
+    @classmethod
+    def delete(cls, booking_id: Union[UUID, str]) -> None:
+        cache.delete(cls._get_key(booking_id))
+
+    @classmethod
+    def _get_key(cls, booking_id: Union[UUID, str]) -> str:
+        return cls.KEY_TEMPLATE.format(booking_id=booking_id)
+
+
+class PaymentEventRepository:
+    @classmethod
+    def add(
+        cls,
+        event_id: str,
+        event_type: str,
+        booking_id: Optional[str],
+        payload: dict,
+        event_created: datetime,
+    ) -> bool:
+        """Store an event unless it is already stored. Returns whether it is new."""
+        _, created = PaymentEvent.objects.get_or_create(
+            event_id=event_id,
+            defaults={
+                "type": event_type,
+                "booking_id": booking_id,
+                "payload": payload,
+                "event_created": event_created,
+            },
+        )
+        return created
+
+    @classmethod
+    def lock_pending(cls, limit: int, max_attempts: int) -> List[PaymentEvent]:
+        """
+        Lock up to `limit` pending events, ordered per booking by their creation at the provider.
+        Rows locked by a concurrent run are skipped. Must be called inside a transaction.
+        """
+        return list(
+            PaymentEvent.objects.filter(processed_at__isnull=True, attempts__lt=max_attempts)
+            .order_by("booking_id", "event_created", "id")
+            .select_for_update(skip_locked=True)[:limit]
+        )
+
+    @classmethod
+    def get_earliest_pending_by_booking(
+        cls, booking_ids: Iterable[UUID], max_attempts: int, exclude_ids: Iterable[UUID]
+    ) -> Dict[UUID, datetime]:
+        """The creation time of the earliest other pending event of each booking."""
+        return dict(
+            PaymentEvent.objects.filter(
+                processed_at__isnull=True, attempts__lt=max_attempts, booking_id__in=booking_ids
+            )
+            .exclude(id__in=exclude_ids)
+            .values("booking_id")
+            .annotate(earliest=Min("event_created"))
+            .values_list("booking_id", "earliest")
+        )
+
+    @classmethod
+    def mark_processed(cls, event_ids: Iterable[UUID]) -> None:
+        PaymentEvent.objects.filter(id__in=event_ids).update(processed_at=now())
+
+    @classmethod
+    def mark_failed(cls, event: PaymentEvent, error: str) -> None:
+        PaymentEvent.objects.filter(id=event.id).update(
+            attempts=F("attempts") + 1, last_error=error
+        )
+
+    @classmethod
+    def reset_failed(cls) -> int:
+        """Give the events that ran out of attempts another round of attempts."""
+        return PaymentEvent.objects.filter(processed_at__isnull=True, attempts__gt=0).update(
+            attempts=0
+        )
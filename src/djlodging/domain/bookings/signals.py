@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from djlodging.domain.bookings.models import Booking
+from djlodging.domain.bookings.repository import BookedDayRepository
+from djlodging.domain.lodgings.repositories import LodgingSearchCacheRepository
+
+
+@receiver(post_save, sender=Booking)
+def sync_booked_days(
+    sender, instance: Booking, created: bool, **kwargs
+):  # pylint: disable=unused-argument
+    """Keep the availability index in line with the booking's dates, lodging and status."""
+    changed_days = BookedDayRepository.sync_with_booking(instance, is_new=created)
+    if instance.lodging_id is not None:
+        LodgingSearchCacheRepository.invalidate(instance.lodging_id, changed_days)
+
+
+@receiver(post_delete, sender=Booking)
+def invalidate_lodging_search(
+    sender, instance: Booking, **kwargs
+):  # pylint: disable=unused-argument
+    """The booked days are deleted in cascade, cached searches over them are dropped here."""
+    if instance.lodging_id is None or instance.status == Booking.Status.CANCELED:
+        return
+    number_of_nights = (instance.date_to - instance.date_from).days
+    days = [instance.date_from + timedelta(days=night) for night in range(number_of_nights)]
+    LodgingSearchCacheRepository.invalidate(instance.lodging_id, days)
@@ -0,0 +1,27 @@
+from django.contrib.postgres.fields import DateRangeField
+from django.db.models import ExpressionWrapper, F, FloatField, Func, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+from djlodging.domain.core.geohash import EARTH_RADIUS_IN_KM
+
+
+class DateRange(Func):
+    """Postgres half-open `[date_from, date_to)` range built from two date columns."""
+
+    function = "DATERANGE"
+    template = "%(function)s(%(expressions)s, '[)')"
+    output_field = DateRangeField()
+
+
+def get_distance_in_km(
+    latitude_field: str, longitude_field: str, latitude: float, longitude: float
+) -> ExpressionWrapper:
+    """Great-circle (haversine) distance from the point columns to the given point."""
+    latitude_delta = Radians(F(latitude_field) - Value(latitude))
+    longitude_delta = Radians(F(longitude_field) - Value(longitude))
+    haversine = Power(Sin(latitude_delta / 2), 2) + Cos(Radians(Value(latitude))) * Cos(
+        Radians(F(latitude_field))
+    ) * Power(Sin(longitude_delta / 2), 2)
+    # Rounding must not push ASIN out of its domain
+    central_angle = 2 * ASin(Least(Sqrt(haversine), Value(1.0)))
+    return ExpressionWrapper(central_angle * EARTH_RADIUS_IN_KM, output_field=FloatField())
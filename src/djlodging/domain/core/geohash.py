@@ -0,0 +1,83 @@
+"""
+Geohashes: a point encoded as base 32 characters of interleaved longitude and latitude bits.
+
+Every character halves the cell five more times, so the points of a cell share its geohash as a
+prefix and a B-tree index on the geohash answers "which points lie in these cells" with a few
+range scans, without PostGIS.
+"""
+from math import cos, radians
+from typing import List, Tuple
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# About 5 m x 5 m cells
+GEOHASH_LENGTH = 9
+EARTH_RADIUS_IN_KM = 6371.0088
+LATITUDE_VALIDATORS = [MinValueValidator(-90), MaxValueValidator(90)]
+LONGITUDE_VALIDATORS = [MinValueValidator(-180), MaxValueValidator(180)]
+KM_PER_DEGREE = 111.195
+
+
+def encode_geohash(latitude: float, longitude: float, length: int = GEOHASH_LENGTH) -> str:
+    latitude_range, longitude_range = [-90.0, 90.0], [-180.0, 180.0]
+    characters = []
+    bits, bit_count, is_longitude_bit = 0, 0, True
+    while len(characters) < length:
+        value, value_range = (
+            (longitude, longitude_range) if is_longitude_bit else (latitude, latitude_range)
+        )
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            value_range[0] = middle
+        else:
+            bits *= 2
+            value_range[1] = middle
+        is_longitude_bit = not is_longitude_bit
+        bit_count += 1
+        if bit_count == 5:
+            characters.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(characters)
+
+
+def get_cell_size(length: int) -> Tuple[float, float]:
+    """(height, width) in degrees of the cells of geohashes with `length` characters."""
+    longitude_bits = (5 * length + 1) // 2
+    latitude_bits = 5 * length // 2
+    return 180 / 2**latitude_bits, 360 / 2**longitude_bits
+
+
+def get_covering_geohashes(latitude: float, longitude: float, radius_in_km: float) -> List[str]:
+    """
+    The cells around the point that together contain the whole circle.
+
+    The cells are the longest ones that are at least the radius high and wide, the cell of the
+    point and its (up to 8) neighbours. An empty list means the circle is too wide to be narrowed
+    down by cells, e.g. close to the poles.
+    """
+    radius_height = radius_in_km / KM_PER_DEGREE
+    # A degree of longitude is shortest at the circle's edge closest to a pole
+    polar_latitude = min(abs(latitude) + radius_height, 90)
+    radius_width = radius_in_km / (KM_PER_DEGREE * max(cos(radians(polar_latitude)), 1e-9))
+
+    length = GEOHASH_LENGTH
+    while length > 0:
+        height, width = get_cell_size(length)
+        if height >= radius_height and width >= radius_width:
+            break
+        length -= 1
+    if length == 0:
+        return []
+
+    geohashes = set()
+    for latitude_step in (-1, 0, 1):
+        neighbour_latitude = latitude + latitude_step * height
+        if not -90 <= neighbour_latitude <= 90:
+            continue
+        for longitude_step in (-1, 0, 1):
+            # Across the antimeridian the neighbours continue on the other side
+            neighbour_longitude = (longitude + longitude_step * width + 180) % 360 - 180
+            geohashes.add(encode_geohash(neighbour_latitude, neighbour_longitude, length))
+    return sorted(geohashes)
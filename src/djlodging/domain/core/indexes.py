@@ -0,0 +1,12 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
+
+
+def icontains_trigram_index(field_name: str, name: str) -> GinIndex:
+    """
+    A pg_trgm GIN index that serves `icontains` (and `iexact`, `istartswith`, ...) lookups.
+
+    Django compiles these lookups to `UPPER(column::text) LIKE UPPER(%s)`, so the index is over
+    the same expression. Terms shorter than three characters have no trigrams and still scan.
+    """
+    return GinIndex(OpClass(Upper(field_name), name="gin_trgm_ops"), name=name)
@@ -0,0 +1,132 @@
+from functools import cached_property
+from typing import List, Tuple, Type
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+# Always loaded, as the cursor pagination reads them from every row.
+ALWAYS_LOADED_FIELDS = ("id", "created")
+
+
+class Projection:
+    """
+    A projection plan: the `select_related`, `prefetch_related` and `only()` a queryset of `model`
+    needs to be rendered by `serializer_class` in a constant number of queries.
+
+    The plan is derived from the serializer's fields on first use:
+    nested serializers of forward relations become `select_related`, nested `many=True`
+    serializers become `prefetch_related` and plain fields backed by model columns go to `only()`.
+    Fields without a model column (annotations, properties) are left to the queryset.
+
+    `values()` is the cheaper alternative for lists: plain rows keyed by the `__` joined sources
+    of the serializer's fields, rendered by `djlodging.api.row_serializers.RowSerializer`.
+    """
+
+    def __init__(self, model: Type[Model], serializer_class: Type[BaseSerializer]):
+        self.model = model
+        self.serializer_class = serializer_class
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        select_related, prefetch_related, only = self.plan
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset.only(*only)
+
+    def values(self, queryset: QuerySet) -> QuerySet:
+        """
+        The queryset as `.values()` rows with every column the serializer renders.
+
+        Fields without a model column are added when the queryset has an annotation of that name.
+        """
+        value_paths, optional_paths = self.value_plan
+        annotations = queryset.query.annotations
+        return queryset.values(
+            *value_paths, *[path for path in optional_paths if path in annotations]
+        )
+
+    @cached_property
+    def value_plan(self) -> Tuple[List[str], List[str]]:
+        if self.plan[1]:
+            raise ValueError(f"{self.serializer_class.__name__} has many=True nested serializers.")
+        value_paths, optional_paths = self._plan_values(
+            self.model, self.serializer_class(), prefix=""
+        )
+        value_paths = list(ALWAYS_LOADED_FIELDS) + [
+            path for path in value_paths if path not in ALWAYS_LOADED_FIELDS
+        ]
+        return value_paths, optional_paths
+
+    @cached_property
+    def plan(self) -> Tuple[List[str], List[str], List[str]]:
+        select_related, prefetch_related, only = self._plan(
+            self.model, self.serializer_class(), prefix=""
+        )
+        only = list(ALWAYS_LOADED_FIELDS) + [
+            field for field in only if field not in ALWAYS_LOADED_FIELDS
+        ]
+        return select_related, prefetch_related, only
+
+    @classmethod
+    def _plan(
+        cls, model: Type[Model], serializer: BaseSerializer, prefix: str
+    ) -> Tuple[List[str], List[str], List[str]]:
+        select_related, prefetch_related, only = [], [], []
+        for field in serializer.fields.values():
+            model_field = cls._get_model_field(model, field.source)
+            if model_field is None:
+                continue
+            path = f"{prefix}{model_field.name}"
+
+            if isinstance(field, ListSerializer) and model_field.is_relation:
+                prefetch_related.append(path)
+            elif isinstance(field, BaseSerializer) and (
+                model_field.many_to_one or model_field.one_to_one
+            ):
+                nested_select_related, nested_prefetch_related, nested_only = cls._plan(
+                    model_field.related_model, field, prefix=f"{path}__"
+                )
+                select_related += [path] + nested_select_related
+                prefetch_related += nested_prefetch_related
+                only += [path] + nested_only
+            elif model_field.concrete and not model_field.many_to_many:
+                only.append(path)
+        return select_related, prefetch_related, only
+
+    @classmethod
+    def _plan_values(
+        cls, model: Type[Model], serializer: BaseSerializer, prefix: str
+    ) -> Tuple[List[str], List[str]]:
+        value_paths, optional_paths = [], []
+        for field in serializer.fields.values():
+            model_field = cls._get_model_field(model, field.source)
+            path = f"{prefix}{field.source}"
+            if model_field is None:
+                if not prefix:
+                    optional_paths.append(path)
+            elif isinstance(field, BaseSerializer) and (
+                model_field.many_to_one or model_field.one_to_one
+            ):
+                # The foreign key tells a missing related row from one with empty columns
+                nested_value_paths, _ = cls._plan_values(
+                    model_field.related_model, field, prefix=f"{path}__"
+                )
+                value_paths += [path] + nested_value_paths
+            elif model_field.concrete and not model_field.many_to_many:
+                value_paths.append(path)
+        return value_paths, optional_paths
+
+    @classmethod
+    def _get_model_field(cls, model: Type[Model], source: str):
+        if source == "*" or "." in source:
+            return None
+        try:
+            return model._meta.get_field(source)
+        except FieldDoesNotExist:
+            # Serializer fields may point at a foreign key column, e.g. `user_id`
+            for model_field in model._meta.concrete_fields:
+                if model_field.attname == source:
+                    return model_field
+        return None
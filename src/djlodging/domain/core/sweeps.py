@@ -0,0 +1,100 @@
+import logging
+from time import monotonic
+from typing import List, Optional
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+logger = logging.getLogger(__name__)
+
+
+class SweepMetrics:
+    """Rows removed and time spent by a `delete_in_batches` run, in total and per batch."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.deleted = 0
+        self.batch_durations: List[float] = []
+        self.is_complete = False
+
+    @property
+    def batches(self) -> int:
+        return len(self.batch_durations)
+
+    @property
+    def duration(self) -> float:
+        return sum(self.batch_durations)
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "deleted": self.deleted,
+            "batches": self.batches,
+            "duration_ms": round(self.duration * 1000, 3),
+            "batch_durations_ms": [round(duration * 1000, 3) for duration in self.batch_durations],
+            "is_complete": self.is_complete,
+        }
+
+
+def delete_in_batches(
+    queryset: QuerySet,
+    order_field: str,
+    name: str,
+    batch_size: int,
+    time_budget_in_seconds: Optional[float] = None,
+) -> SweepMetrics:
+    """
+    Delete the rows of `queryset` in batches of at most `batch_size` rows, each in its own
+    transaction, so that a large backlog never holds long locks or one huge cascade.
+
+    Batches are walked by the keyset `(order_field, id)`, which an index on these columns
+    (partial on the queryset's condition) serves without rescanning already deleted rows.
+    Each batch is deleted through `queryset` again, so rows that stopped matching in the
+    meantime (e.g. a booking paid in between) are kept.
+    No new batch is started once `time_budget_in_seconds` is spent; the rest is left
+    for the next run and `is_complete` stays False.
+    """
+    metrics = SweepMetrics(name)
+    started = monotonic()
+    last_key = None
+    while time_budget_in_seconds is None or monotonic() - started < time_budget_in_seconds:
+        batch_started = monotonic()
+        batch = queryset
+        if last_key is not None:
+            last_value, last_id = last_key
+            batch = batch.filter(
+                Q(**{f"{order_field}__gt": last_value})
+                | Q(**{order_field: last_value, "id__gt": last_id})
+            )
+        keys = list(batch.order_by(order_field, "id").values_list(order_field, "id")[:batch_size])
+        if not keys:
+            metrics.is_complete = True
+            break
+
+        with transaction.atomic():
+            _, deleted_by_model = queryset.filter(id__in=[key[1] for key in keys]).delete()
+        deleted = deleted_by_model.get(queryset.model._meta.label, 0)
+        metrics.deleted += deleted
+        metrics.batch_durations.append(monotonic() - batch_started)
+        logger.info(
+            "%s: batch %s deleted %s rows in %.1f ms.",
+            name,
+            metrics.batches,
+            deleted,
+            metrics.batch_durations[-1] * 1000,
+        )
+
+        last_key = keys[-1]
+        if len(keys) < batch_size:
+            metrics.is_complete = True
+            break
+
+    logger.info(
+        "%s: deleted %s rows in %s batches, %.1f ms%s.",
+        name,
+        metrics.deleted,
+        metrics.batches,
+        metrics.duration * 1000,
+        "" if metrics.is_complete else ", time budget spent",
+    )
+    return metrics
@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from djlodging.domain.emails.models import PendingEmail
+
+
+class PendingEmailAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "template_id",
+        "attempts",
+        "next_attempt_at",
+    ]
+
+
+admin.site.register(PendingEmail, PendingEmailAdmin)
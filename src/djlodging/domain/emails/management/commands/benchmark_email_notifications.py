@@ -0,0 +1,73 @@
+from itertools import cycle, islice
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from djlodging.application_services import email
+from djlodging.application_services.email import EmailService
+from djlodging.domain.bookings.models import Booking
+from djlodging.infrastructure.providers.email import LocalEmailProvider
+from djlodging.infrastructure.query_metrics import collect_query_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Push booking confirmation and cancellation events for existing bookings through "
+        "EmailService into LocalEmailProvider and report messages/sec and queries per message. "
+        "Nothing is committed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=1000, help="Number of booking events")
+
+    def handle(self, *args, **options):
+        provider = email.email_provider
+        if not isinstance(provider, LocalEmailProvider):
+            raise CommandError(
+                "Set EMAIL_PROVIDER to LocalEmailProvider, the benchmark must not send emails."
+            )
+        number_of_events = options["events"]
+        booking_ids = list(Booking.objects.values_list("id", flat=True)[:number_of_events])
+        if not booking_ids:
+            raise CommandError("There are no bookings to send emails about.")
+
+        messages_before = provider.message_count
+        with transaction.atomic(), collect_query_metrics() as metrics:
+            started = perf_counter()
+            for index, booking_id in enumerate(islice(cycle(booking_ids), number_of_events)):
+                for send_emails in self._get_email_senders(is_cancellation=bool(index % 2)):
+                    send_emails(str(booking_id))
+            if settings.EMAIL_BATCHING_ENABLED:
+                while EmailService.send_pending_emails():
+                    pass
+            duration = perf_counter() - started
+            transaction.set_rollback(True)
+
+        number_of_messages = provider.message_count - messages_before
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{number_of_events} events, {number_of_messages} messages in {duration:.2f} s: "
+                f"{number_of_messages / duration:.0f} messages/s, "
+                f"{metrics.count / max(number_of_messages, 1):.2f} queries/message "
+                f"(batching {'on' if settings.EMAIL_BATCHING_ENABLED else 'off'})."
+            )
+        )
+
+    @staticmethod
+    def _get_email_senders(is_cancellation: bool):
+        # What the tasks enqueued by BookingService._send_emails_on_commit run
+        if settings.EMAIL_BATCHING_ENABLED:
+            if is_cancellation:
+                return [EmailService.send_booking_cancellation_emails]
+            return [EmailService.send_booking_confirmation_emails]
+        if is_cancellation:
+            return [
+                EmailService.send_booking_cancellation_email_to_owner,
+                EmailService.send_booking_cancellation_email_to_user,
+            ]
+        return [
+            EmailService.send_booking_confirmation_email_to_user,
+            EmailService.send_booking_confirmation_email_to_owner,
+        ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.0 on 2026-10-17 23:38
+
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingEmail',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('template_id', models.CharField(max_length=255)),
+                ('personalization', models.JSONField()),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Pending email',
+                'verbose_name_plural': 'Pending emails',
+                'ordering': ('-created',),
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pendingemail',
+            index=models.Index(fields=['next_attempt_at'], name='pending_email_next_attempt_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import models
+from django.utils.timezone import now
+
+from djlodging.domain.core.base_models import BaseModel
+
+
+class PendingEmail(BaseModel):
+    """
+    An email rendered for a provider template and waiting to be sent,
+    together with other pending emails of the same template.
+    """
+
+    template_id = models.CharField(max_length=255)
+    personalization = models.JSONField()
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=now)
+
+    class Meta(BaseModel.Meta):
+        verbose_name = "Pending email"
+        verbose_name_plural = "Pending emails"
+        indexes = [models.Index(fields=["next_attempt_at"], name="pending_email_next_attempt_idx")]
+
+    def __str__(self):
+        return f"{self.template_id} | {self.attempts} attempts"
@@ -0,0 +1,75 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List
+from uuid import UUID
+
+from django.db import transaction
+from django.db.models import F
+from django.utils.timezone import now, timedelta
+
+from djlodging.domain.emails.models import PendingEmail
+
+
+class PendingEmailRepository:
+    @classmethod
+    def add(cls, template_id: str, personalization: dict) -> PendingEmail:
+        return PendingEmail.objects.create(
+            template_id=template_id, personalization=personalization
+        )
+
+    @classmethod
+    def claim_due_by_template(
+        cls, limit: int, max_attempts: int, lease_in_seconds: int
+    ) -> Dict[str, List[PendingEmail]]:
+        """
+        Claim up to `limit` of the oldest due emails, grouped by template.
+
+        A claim counts an attempt and moves the emails out of reach for `lease_in_seconds`,
+        in a short transaction of its own, so they are sent without holding row locks.
+        Rows locked by a concurrent claim are skipped.
+        """
+        with transaction.atomic():
+            due_emails = list(
+                PendingEmail.objects.filter(next_attempt_at__lte=now(), attempts__lt=max_attempts)
+                .order_by("next_attempt_at", "created")
+                .select_for_update(skip_locked=True)[:limit]
+            )
+            leased_until = now() + timedelta(seconds=lease_in_seconds)
+            PendingEmail.objects.filter(id__in=[email.id for email in due_emails]).update(
+                attempts=F("attempts") + 1, next_attempt_at=leased_until
+            )
+        emails_by_template = defaultdict(list)
+        for email in due_emails:
+            email.attempts += 1
+            email.next_attempt_at = leased_until
+            emails_by_template[email.template_id].append(email)
+        return emails_by_template
+
+    @classmethod
+    def delete_by_ids(cls, email_ids: Iterable[UUID]) -> None:
+        PendingEmail.objects.filter(id__in=email_ids).delete()
+
+    @classmethod
+    def postpone(cls, emails: Iterable[PendingEmail], backoff_in_seconds: int) -> None:
+        """Retry claimed emails after a backoff that doubles with every attempt."""
+        email_ids_by_attempts = defaultdict(list)
+        for email in emails:
+            email_ids_by_attempts[email.attempts].append(email.id)
+        for attempts, email_ids in email_ids_by_attempts.items():
+            PendingEmail.objects.filter(id__in=email_ids).update(
+                next_attempt_at=now() + timedelta(seconds=backoff_in_seconds * 2 ** (attempts - 1))
+            )
+
+    @classmethod
+    def delete_exhausted(cls, max_attempts: int) -> List[PendingEmail]:
+        """
+        Delete and return the due emails without attempts left,
+        such as those claimed by a run that died before it could send them.
+        """
+        with transaction.atomic():
+            exhausted_emails = list(
+                PendingEmail.objects.filter(next_attempt_at__lte=now(), attempts__gte=max_attempts)
+                .select_for_update(skip_locked=True)
+                .only("id", "template_id", "attempts")
+            )
+            cls.delete_by_ids([email.id for email in exhausted_emails])
+        return exhausted_emails
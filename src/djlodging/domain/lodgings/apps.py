@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LodgingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "djlodging.domain.lodgings"
+
+    def ready(self):
+        # pylint: disable=import-outside-toplevel,unused-import
+        from djlodging.domain.lodgings import signals  # noqa: F401
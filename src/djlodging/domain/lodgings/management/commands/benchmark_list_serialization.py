@@ -0,0 +1,67 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djlodging.api.bookings.projections import BOOKING_LIST_PROJECTION
+from djlodging.api.lodging.projections import LODGING_LIST_PROJECTION, REVIEW_LIST_PROJECTION
+from djlodging.api.row_serializers import RowSerializer
+
+LISTS = {
+    "bookings": BOOKING_LIST_PROJECTION,
+    "lodgings": LODGING_LIST_PROJECTION,
+    "reviews": REVIEW_LIST_PROJECTION,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the DRF serializers of the list endpoints with the `.values()` rows rendered by "
+        "RowSerializer on pages of existing bookings, lodgings and reviews. "
+        "Reports milliseconds per page for rendering only and for fetching and rendering."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=100, help="Items per page")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per list")
+
+    def handle(self, *args, **options):
+        for name, projection in LISTS.items():
+            queryset = projection.model.objects.order_by("-created", "id")[: options["page_size"]]
+            if not queryset.exists():
+                raise CommandError(f"There are no {name} to render.")
+            timings = self._benchmark(projection, queryset, options["repeat"])
+            render_serializer, render_rows, fetch_serializer, fetch_rows = timings
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: render {render_serializer:.2f} ms serializer, "
+                    f"{render_rows:.2f} ms rows ({render_serializer / render_rows:.1f}x); "
+                    f"fetch and render {fetch_serializer:.2f} ms serializer, "
+                    f"{fetch_rows:.2f} ms rows ({fetch_serializer / fetch_rows:.1f}x)."
+                )
+            )
+
+    def _benchmark(self, projection, queryset, repeat: int) -> tuple:
+        """Milliseconds per page: rendering only and fetching and rendering, both ways."""
+        serializer_class = projection.serializer_class
+        row_serializer = RowSerializer(serializer_class)
+        instances = list(projection.apply(queryset))
+        rows = list(projection.values(queryset))
+        return (
+            self._time(lambda: serializer_class(instances, many=True).data, repeat),
+            self._time(lambda: row_serializer.to_representation(rows), repeat),
+            self._time(
+                lambda: serializer_class(list(projection.apply(queryset)), many=True).data, repeat
+            ),
+            self._time(
+                lambda: row_serializer.to_representation(projection.values(queryset)), repeat
+            ),
+        )
+
+    def _time(self, run, repeat: int) -> float:
+        """Milliseconds per run, the best of `repeat` runs."""
+        durations = []
+        for _ in range(repeat):
+            started = perf_counter()
+            run()
+            durations.append(perf_counter() - started)
+        return min(durations) * 1000
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from djlodging.domain.lodgings.repositories import LodgingRepository
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored review count, score sum and average rating of all lodgings."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            number_of_lodgings = LodgingRepository.reconcile_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Ratings reconciled for {number_of_lodgings} lodgings.")
+        )
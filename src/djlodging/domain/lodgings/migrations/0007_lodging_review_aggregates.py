@@ -0,0 +1,51 @@
+# Generated by Django 4.0 on 2026-10-17 22:51
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, ExpressionWrapper, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+
+
+def fill_review_aggregates(apps, schema_editor):
+    Lodging = apps.get_model('lodgings', 'Lodging')
+    Review = apps.get_model('lodgings', 'Review')
+    reviews = Review.objects.filter(lodging=OuterRef('pk')).order_by().values('lodging')
+    review_count = Coalesce(Subquery(reviews.annotate(count=Count('id')).values('count')), 0)
+    review_score_sum = Coalesce(
+        Subquery(reviews.annotate(score_sum=Sum('score')).values('score_sum')), 0
+    )
+    average = ExpressionWrapper(
+        Cast(review_score_sum, DecimalField(max_digits=12, decimal_places=2))
+        / NullIf(review_count, Value(0)),
+        output_field=DecimalField(),
+    )
+    Lodging.objects.update(
+        review_count=review_count,
+        review_score_sum=review_score_sum,
+        average_rating=Round(average, precision=1),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lodgings', '0006_alter_lodging_options_alter_lodgingimage_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lodging',
+            name='average_rating',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='lodging',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='lodging',
+            name='review_score_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_review_aggregates, migrations.RunPython.noop),
+    ]
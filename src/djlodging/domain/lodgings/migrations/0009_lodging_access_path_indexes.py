@@ -0,0 +1,32 @@
+# Generated by Django 4.0 on 2026-10-18 00:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lodgings', '0008_icontains_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lodging',
+            index=models.Index(fields=['city', 'number_of_rooms', 'kind', 'number_of_people'], name='lodging_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['lodging', '-created', 'id'], name='review_lodging_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='lodging',
+            name='city',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='lodgings.city'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='lodging',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='lodgings.lodging'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.0 on 2026-10-18 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lodgings', '0009_lodging_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lodging',
+            index=models.Index(fields=['city', 'price'], name='lodging_city_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lodging',
+            index=models.Index(fields=['city', 'average_rating'], name='lodging_city_rating_idx'),
+        ),
+    ]
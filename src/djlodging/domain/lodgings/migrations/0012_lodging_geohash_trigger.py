@@ -0,0 +1,99 @@
+# Generated by Django 4.0 on 2026-10-18 03:10
+
+from django.db import migrations
+
+from djlodging.domain.core.geohash import BASE32, GEOHASH_LENGTH
+
+# The same bisection as djlodging.domain.core.geohash.encode_geohash, on the same doubles
+CREATE_FUNCTION = f"""
+CREATE FUNCTION lodging_geohash(latitude double precision, longitude double precision)
+RETURNS varchar LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    latitude_range double precision[] := ARRAY[-90.0, 90.0];
+    longitude_range double precision[] := ARRAY[-180.0, 180.0];
+    middle double precision;
+    bits integer := 0;
+    bit_count integer := 0;
+    is_longitude_bit boolean := true;
+    geohash varchar := '';
+BEGIN
+    IF latitude IS NULL OR longitude IS NULL THEN
+        RETURN '';
+    END IF;
+    WHILE length(geohash) < {GEOHASH_LENGTH} LOOP
+        IF is_longitude_bit THEN
+            middle := (longitude_range[1] + longitude_range[2]) / 2;
+            IF longitude >= middle THEN
+                bits := bits * 2 + 1;
+                longitude_range[1] := middle;
+            ELSE
+                bits := bits * 2;
+                longitude_range[2] := middle;
+            END IF;
+        ELSE
+            middle := (latitude_range[1] + latitude_range[2]) / 2;
+            IF latitude >= middle THEN
+                bits := bits * 2 + 1;
+                latitude_range[1] := middle;
+            ELSE
+                bits := bits * 2;
+                latitude_range[2] := middle;
+            END IF;
+        END IF;
+        is_longitude_bit := NOT is_longitude_bit;
+        bit_count := bit_count + 1;
+        IF bit_count = 5 THEN
+            geohash := geohash || substr('{BASE32}', bits + 1, 1);
+            bits := 0;
+            bit_count := 0;
+        END IF;
+    END LOOP;
+    RETURN geohash;
+END
+$$
+"""
+
+CREATE_TRIGGER_FUNCTION = """
+CREATE FUNCTION lodging_set_geohash() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.geohash := lodging_geohash(NEW.latitude, NEW.longitude);
+    RETURN NEW;
+END
+$$
+"""
+
+
+def add_geohash_trigger(apps, schema_editor):
+    # Triggers are Postgres only (e.g. skipped for SQLite), Lodging.save() sets the geohash too.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(CREATE_FUNCTION)
+    schema_editor.execute(CREATE_TRIGGER_FUNCTION)
+    # Also bulk_create(), update() and raw SQL, which skip Lodging.save()
+    schema_editor.execute(
+        'CREATE TRIGGER lodging_geohash_trigger BEFORE INSERT OR UPDATE ON lodgings_lodging '
+        'FOR EACH ROW EXECUTE FUNCTION lodging_set_geohash()'
+    )
+    schema_editor.execute(
+        'UPDATE lodgings_lodging SET geohash = lodging_geohash(latitude, longitude) '
+        'WHERE geohash <> lodging_geohash(latitude, longitude)'
+    )
+
+
+def remove_geohash_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP TRIGGER lodging_geohash_trigger ON lodgings_lodging')
+    schema_editor.execute('DROP FUNCTION lodging_set_geohash()')
+    schema_editor.execute('DROP FUNCTION lodging_geohash(double precision, double precision)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lodgings', '0011_lodging_city_coordinates'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_geohash_trigger, remove_geohash_trigger),
+    ]
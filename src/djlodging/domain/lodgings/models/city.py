@@ -1,6 +1,8 @@
 from django.db import models
 
 from djlodging.domain.core.base_models import BaseModel
+from djlodging.domain.core.geohash import LATITUDE_VALIDATORS, LONGITUDE_VALIDATORS
+from djlodging.domain.core.indexes import icontains_trigram_index
 
 from .country import Country
 
@@ -9,9 +11,17 @@ class City(BaseModel):
     country = models.ForeignKey(Country, related_name="city", on_delete=models.CASCADE)
     region = models.CharField(max_length=255, blank=True)
     name = models.CharField(max_length=255)
+    # The center of the radius search around the city, see LodgingRepository
+    latitude = models.FloatField(null=True, blank=True, validators=LATITUDE_VALIDATORS)
+    longitude = models.FloatField(null=True, blank=True, validators=LONGITUDE_VALIDATORS)
 
     def __str__(self):
         return self.name
 
     class Meta:
         verbose_name_plural = "Cities"
+        # For the icontains filters of the booking search, see BookingFilterSet
+        indexes = [
+            icontains_trigram_index("name", name="city_name_trgm_idx"),
+            icontains_trigram_index("region", name="city_region_trgm_idx"),
+        ]
@@ -1,6 +1,7 @@
 from django.db import models
 
 from djlodging.domain.core.base_models import BaseModel
+from djlodging.domain.core.indexes import icontains_trigram_index
 
 
 class Country(BaseModel):
@@ -11,3 +12,5 @@ class Country(BaseModel):
 
     class Meta:
         verbose_name_plural = "Countries"
+        # For the icontains filters of the booking search, see BookingFilterSet
+        indexes = [icontains_trigram_index("name", name="country_name_trgm_idx")]
@@ -2,6 +2,13 @@ from django.contrib.auth import get_user_model
 from django.db import models
 
 from djlodging.domain.core.base_models import BaseModel
+from djlodging.domain.core.geohash import (
+    GEOHASH_LENGTH,
+    LATITUDE_VALIDATORS,
+    LONGITUDE_VALIDATORS,
+    encode_geohash,
+)
+from djlodging.domain.core.indexes import icontains_trigram_index
 
 from .city import City
 
@@ -18,7 +25,8 @@ class Lodging(BaseModel):
     name = models.CharField(max_length=100)
     kind = models.CharField(max_length=50, choices=Kind.choices)
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="lodging")
-    city = models.ForeignKey(City, on_delete=models.CASCADE)
+    # Indexed by `lodging_search_idx`, which leads with it
+    city = models.ForeignKey(City, on_delete=models.CASCADE, db_index=False)
     district = models.CharField(max_length=255, blank=True)
     street = models.CharField(max_length=255)
     house_number = models.CharField(max_length=255)
@@ -28,10 +36,49 @@ class Lodging(BaseModel):
     number_of_people = models.PositiveSmallIntegerField(default=1)
     number_of_rooms = models.PositiveSmallIntegerField(default=1)
     price = models.DecimalField(max_digits=7, decimal_places=2)
+    # Review aggregates maintained by ReviewService, see LodgingRepository.update_rating
+    review_count = models.PositiveIntegerField(default=0)
+    review_score_sum = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(null=True, blank=True)
+    latitude = models.FloatField(null=True, blank=True, validators=LATITUDE_VALIDATORS)
+    longitude = models.FloatField(null=True, blank=True, validators=LONGITUDE_VALIDATORS)
+    # Derived from the coordinates on save and by the `lodging_geohash_trigger` for the writes
+    # that skip save(), empty without them
+    geohash = models.CharField(max_length=GEOHASH_LENGTH, blank=True, editable=False)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            # The lodging search filters, see LodgingRepository._construct_lodging_filter.
+            # The equality columns come first, number_of_people is a range condition.
+            models.Index(
+                fields=["city", "number_of_rooms", "kind", "number_of_people"],
+                name="lodging_search_idx",
+            ),
+            # The price and rating ranges and orders of the lodging search
+            models.Index(fields=["city", "price"], name="lodging_city_price_idx"),
+            models.Index(fields=["city", "average_rating"], name="lodging_city_rating_idx"),
+            # The cells of the radius search, see LodgingRepository._construct_radius_filter
+            models.Index(
+                fields=["geohash"], opclasses=["varchar_pattern_ops"], name="lodging_geohash_idx"
+            ),
+            # For the icontains filters of the booking search, see BookingFilterSet
+            icontains_trigram_index("district", name="lodging_district_trgm_idx"),
+            icontains_trigram_index("street", name="lodging_street_trgm_idx"),
+            icontains_trigram_index("zip_code", name="lodging_zip_code_trgm_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} in {self.city}"
 
+    def save(self, *args, **kwargs):
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ""
+        else:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "geohash"}
+        return super().save(*args, **kwargs)
+
 
 def images_folder(instance, filename):
     return f"{instance.lodging}/{filename}"
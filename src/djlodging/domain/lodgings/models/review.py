@@ -10,10 +10,26 @@ User = get_user_model()
 
 
 class Review(BaseModel):
-    lodging = models.ForeignKey(Lodging, on_delete=models.CASCADE, related_name="reviews")
+    # Indexed by `review_lodging_created_idx`, which leads with it
+    lodging = models.ForeignKey(
+        Lodging, on_delete=models.CASCADE, related_name="reviews", db_index=False
+    )
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="reviews")
     text = models.TextField()
     score = models.PositiveSmallIntegerField(validators=[MaxValueValidator(10)])
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            # A lodging's reviews in the default and cursor order, see CURSOR_ORDERING
+            models.Index(fields=["lodging", "-created", "id"], name="review_lodging_created_idx")
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        review = super().from_db(db, field_names, values)
+        # The lodging's rating changes by the difference to it, see lodgings.signals
+        review.saved_score = dict(zip(field_names, values)).get("score")
+        return review
+
     def __str__(self):
         return f"Review for {self.lodging} with a score {self.score}"
@@ -1,22 +1,49 @@
-from datetime import date
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
-from uuid import UUID
-
-from django.db.models import Avg, Case, Q, QuerySet, Value, When
-from django.db.models.functions import Round
-
-from djlodging.api.pagination import paginate_queryset
+import json
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from hashlib import sha256
+from time import monotonic
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from uuid import UUID, uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DecimalField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.utils.dateparse import parse_date
+
+from djlodging.api.pagination import (
+    CURSOR_QUERY_PARAM,
+    CountStrategy,
+    count_queryset,
+    get_page_slice,
+    paginate_queryset,
+)
+from djlodging.domain.bookings.repository import BookedDayRepository
 from djlodging.domain.bookings.sorting import sort_queryset
 from djlodging.domain.core.base_exceptions import DjLodgingValidationError
+from djlodging.domain.core.db_functions import get_distance_in_km
+from djlodging.domain.core.geohash import KM_PER_DEGREE, get_covering_geohashes
+from djlodging.domain.core.projections import Projection
 from djlodging.domain.lodgings.models import Country
 from djlodging.domain.lodgings.models.city import City
 from djlodging.domain.lodgings.models.lodging import Lodging
 from djlodging.domain.lodgings.models.review import Review
 from djlodging.domain.users.models import User
 
-if TYPE_CHECKING:
-    from django.db.models.query import ValuesQuerySet
-
 
 class CountryRepository:
     @classmethod
@@ -37,8 +64,10 @@ class CountryRepository:
         return country.delete()
 
     @classmethod
-    def get_list(cls, query_params: dict) -> Dict[str, Union[int, List[Country]]]:
-        countries = cls.get_all()
+    def get_list(
+        cls, query_params: dict, projection: Projection
+    ) -> Dict[str, Union[int, List[Country]]]:
+        countries = projection.apply(cls.get_all())
         sorted_countries = sort_queryset(countries, query_params)
         return paginate_queryset(sorted_countries, query_params)
 
@@ -58,19 +87,286 @@ class CityRepository:
 
     @classmethod
     def get_paginated_list_by_country(
-        cls, country_id: UUID, query_params: dict
+        cls, country_id: UUID, query_params: dict, projection: Projection
     ) -> Dict[str, Union[int, List[City]]]:
-        cities = cls.get_list_by_country(country_id)
+        cities = projection.apply(cls.get_list_by_country(country_id))
         sorted_cities = sort_queryset(cities, query_params)
         return paginate_queryset(sorted_cities, query_params)
 
+    @classmethod
+    def get_coordinates(cls, city_ids: Iterable[UUID]) -> Optional[Tuple[float, float]]:
+        """(latitude, longitude) of the first of the cities that has coordinates."""
+        return (
+            City.objects.filter(id__in=city_ids, latitude__isnull=False, longitude__isnull=False)
+            .order_by("created")
+            .values_list("latitude", "longitude")
+            .first()
+        )
+
+    @classmethod
+    def get_location_names_in_bulk(cls, city_ids: Iterable[UUID]) -> List[Tuple[str, str]]:
+        """(country name, city name) of the cities."""
+        return list(City.objects.filter(id__in=city_ids).values_list("country__name", "name"))
+
     @classmethod
     def delete(cls, city_id: UUID) -> tuple:
         city = cls.get_by_id(city_id)
         return city.delete()
 
 
+class LocationCatalogRepository:
+    """
+    Read-through cache of the country -> city tree: {country name: {city name: [city ids]}}.
+
+    The tree is kept in the shared cache (Redis) under a version key and copied to the process,
+    which trusts its copy for LOCATION_CATALOG_LOCAL_TTL_IN_SECONDS before checking the version.
+    `invalidate` is called on every country and city save and delete, see the lodgings signals.
+    """
+
+    VERSION_KEY = "location-catalog:version"
+    TREE_KEY_TEMPLATE = "location-catalog:tree:{version}"
+
+    # (version, tree, checked at) of the in-process copy
+    _local: Tuple[Optional[str], Optional[dict], float] = (None, None, 0.0)
+
+    @classmethod
+    def get_tree(cls) -> Dict[str, Dict[str, List[UUID]]]:
+        local_version, local_tree, checked_at = cls._local
+        if (
+            local_tree is not None
+            and monotonic() - checked_at < settings.LOCATION_CATALOG_LOCAL_TTL_IN_SECONDS
+        ):
+            return local_tree
+
+        version = cls._get_version()
+        if version == local_version and local_tree is not None:
+            tree = local_tree
+        else:
+            tree_key = cls.TREE_KEY_TEMPLATE.format(version=version)
+            tree = cache.get(tree_key)
+            if tree is None:
+                tree = cls._build_tree()
+                cache.set(tree_key, tree, timeout=settings.LOCATION_CATALOG_CACHE_TTL_IN_SECONDS)
+        cls._local = (version, tree, monotonic())
+        return tree
+
+    @classmethod
+    def get_city_ids(cls, country: str, city: Optional[str] = None) -> List[UUID]:
+        cities = cls.get_tree().get(country, {})
+        if city:
+            return list(cities.get(city, []))
+        return [city_id for city_ids in cities.values() for city_id in city_ids]
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls._bump_version()
+        # Another process may rebuild the tree before this transaction commits.
+        transaction.on_commit(cls._bump_version)
+
+    @classmethod
+    def _bump_version(cls) -> None:
+        cache.set(cls.VERSION_KEY, uuid4().hex, timeout=None)
+        cls._local = (None, None, 0.0)
+
+    @classmethod
+    def _get_version(cls) -> str:
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            cache.add(cls.VERSION_KEY, uuid4().hex, timeout=None)
+            version = cache.get(cls.VERSION_KEY)
+        return version
+
+    @classmethod
+    def _build_tree(cls) -> Dict[str, Dict[str, List[UUID]]]:
+        tree = {}
+        # A single LEFT JOIN, countries without cities come with a NULL city
+        for country_name, city_id, city_name in Country.objects.values_list(
+            "name", "city__id", "city__name"
+        ):
+            cities = tree.setdefault(country_name, {})
+            if city_id is not None:
+                cities.setdefault(city_name, []).append(city_id)
+        return tree
+
+
+class LodgingSearchCacheRepository:
+    """
+    Short-lived cache of lodging search results: the count and the ordered (lodging id, available)
+    of the first results, see `LodgingRepository.get_paginated_filtered_list`.
+
+    A result is keyed on the normalized search parameters and stamped with the versions of the
+    (country, city, night) buckets it covers. A booking change bumps only the buckets of its
+    lodging's location and nights, so searches for other cities and dates stay cached.
+    A lodging change (price, rating) bumps the lodgings version of its location, which every
+    search there is stamped with too. Location names are hashed into the version keys.
+    """
+
+    RESULT_KEY_TEMPLATE = "lodging-search:result:{digest}"
+    VERSION_KEY_TEMPLATE = "lodging-search:version:{location}:{day}"
+    LODGINGS_VERSION_KEY_TEMPLATE = "lodging-search:version:{location}:lodgings"
+    ANY_CITY = "*"
+
+    @classmethod
+    def get_or_set(
+        cls, query_params: dict, get_search_results: Callable[[], dict]
+    ) -> Optional[dict]:
+        """The cached or new search results, None for searches that are not cached."""
+        params = cls._normalize(query_params)
+        date_from, date_to = cls._parse_dates(query_params)
+        number_of_nights = (date_to - date_from).days
+        if not 0 < number_of_nights <= settings.LODGING_SEARCH_CACHE_MAX_NIGHTS:
+            return None
+
+        city = params["city"] or cls.ANY_CITY
+        version_keys = [cls._get_lodgings_version_key(params["country"], city)] + [
+            cls._get_version_key(params["country"], city, day)
+            for day in cls._get_days(date_from, number_of_nights)
+        ]
+        versions = cache.get_many(version_keys)
+        stamp = [versions.get(version_key, "") for version_key in version_keys]
+        digest = sha256(json.dumps([params, stamp]).encode()).hexdigest()
+        result_key = cls.RESULT_KEY_TEMPLATE.format(digest=digest)
+
+        search_results = cache.get(result_key)
+        if search_results is None:
+            search_results = get_search_results()
+            cache.set(
+                result_key, search_results, timeout=settings.LODGING_SEARCH_CACHE_TTL_IN_SECONDS
+            )
+        return search_results
+
+    @classmethod
+    def invalidate(cls, lodging_id: UUID, days: Iterable[date]) -> None:
+        """Drop cached searches covering any of the days in the lodging's city or country."""
+        cls.invalidate_many({lodging_id: days})
+
+    @classmethod
+    def invalidate_many(cls, days_by_lodging: Dict[UUID, Iterable[date]]) -> None:
+        days_by_lodging = {
+            lodging_id: set(days) for lodging_id, days in days_by_lodging.items() if days
+        }
+        if not days_by_lodging:
+            return
+        locations = LodgingRepository.get_location_names_in_bulk(days_by_lodging.keys())
+        version_keys = set()
+        for lodging_id, days in days_by_lodging.items():
+            if lodging_id not in locations:
+                continue
+            country, city = locations[lodging_id]
+            for day in days:
+                for city_key in (city, cls.ANY_CITY):
+                    version_keys.add(cls._get_version_key(country, city_key, day))
+        cls._invalidate_versions(version_keys)
+
+    @classmethod
+    def invalidate_lodgings(cls, lodging_ids: Iterable[UUID]) -> None:
+        """Drop cached searches of any dates in the lodgings' cities or countries."""
+        locations = LodgingRepository.get_location_names_in_bulk(lodging_ids)
+        cls._invalidate_locations(locations.values())
+
+    @classmethod
+    def invalidate_cities(cls, city_ids: Iterable[UUID]) -> None:
+        """Drop cached searches of any dates in the cities or their countries."""
+        cls._invalidate_locations(CityRepository.get_location_names_in_bulk(city_ids))
+
+    @classmethod
+    def _invalidate_locations(cls, locations: Iterable[Tuple[str, str]]) -> None:
+        cls._invalidate_versions(
+            {
+                cls._get_lodgings_version_key(country, city_key)
+                for country, city in locations
+                for city_key in (city, cls.ANY_CITY)
+            }
+        )
+
+    @classmethod
+    def _invalidate_versions(cls, version_keys: Set[str]) -> None:
+        if not version_keys:
+            return
+        cls._bump_versions(version_keys)
+        # A search before this transaction commits reads the former rows under the new versions.
+        transaction.on_commit(lambda: cls._bump_versions(version_keys))
+
+    @classmethod
+    def _bump_versions(cls, version_keys: Set[str]) -> None:
+        version = uuid4().hex
+        # Versions outlive no result they stamp, as both expire after the same TTL.
+        cache.set_many(
+            {version_key: version for version_key in version_keys},
+            timeout=settings.LODGING_SEARCH_CACHE_TTL_IN_SECONDS,
+        )
+
+    @classmethod
+    def _normalize(cls, query_params: dict) -> dict:
+        # The same defaults and conversions as LodgingRepository.get_filtered_list
+        return {
+            "country": str(query_params.get("country") or "").strip(),
+            "city": str(query_params.get("city") or "").strip(),
+            "date_from": str(query_params.get("date_from")),
+            "date_to": str(query_params.get("date_to")),
+            "number_of_people": int(query_params.get("number_of_people", 1)),
+            "number_of_rooms": int(query_params.get("number_of_rooms", 1)),
+            "kind": query_params.get("kind", ""),
+            "available_only": bool(query_params.get("available_only", False)),
+            "price_min": cls._normalize_decimal(query_params.get("price_min")),
+            "price_max": cls._normalize_decimal(query_params.get("price_max")),
+            "min_rating": cls._normalize_decimal(query_params.get("min_rating")),
+            "order_by": query_params.get("order_by") or "",
+        }
+
+    @classmethod
+    def _normalize_decimal(cls, value) -> str:
+        # "60", "60.0" and "6E1" are the same search
+        if value is None or value == "":
+            return ""
+        try:
+            return format(Decimal(str(value)).normalize(), "f")
+        except InvalidOperation:
+            return str(value)
+
+    @classmethod
+    def _parse_dates(cls, query_params: dict) -> Tuple[date, date]:
+        try:
+            date_from = parse_date(str(query_params["date_from"]))
+            date_to = parse_date(str(query_params["date_to"]))
+        except (KeyError, ValueError) as exc:
+            raise DjLodgingValidationError("Invalid dates.") from exc
+        if date_from is None or date_to is None:
+            raise DjLodgingValidationError("Invalid dates.")
+        return date_from, date_to
+
+    @classmethod
+    def _get_days(cls, date_from: date, number_of_nights: int) -> List[date]:
+        return [date_from + timedelta(days=night) for night in range(number_of_nights)]
+
+    @classmethod
+    def _get_version_key(cls, country: str, city: str, day: date) -> str:
+        location = cls._hash_location(country, city)
+        return cls.VERSION_KEY_TEMPLATE.format(location=location, day=day.isoformat())
+
+    @classmethod
+    def _get_lodgings_version_key(cls, country: str, city: str) -> str:
+        return cls.LODGINGS_VERSION_KEY_TEMPLATE.format(location=cls._hash_location(country, city))
+
+    @classmethod
+    def _hash_location(cls, country: str, city: str) -> str:
+        # User input never reaches a cache key as is
+        return sha256(json.dumps([country, city]).encode()).hexdigest()
+
+
 class LodgingRepository:
+    # The `order_by` values of the lodging search, ties are broken by the id for stable pages
+    SEARCH_ORDERINGS = {
+        "name": (F("name").asc(), F("id").asc()),
+        "-name": (F("name").desc(), F("id").asc()),
+        "price": (F("price").asc(), F("id").asc()),
+        "-price": (F("price").desc(), F("id").asc()),
+        "average_rating": (F("average_rating").asc(nulls_last=True), F("id").asc()),
+        "-average_rating": (F("average_rating").desc(nulls_last=True), F("id").asc()),
+        # Radius searches only, nearest first is their default
+        "distance": (F("distance").asc(), F("id").asc()),
+    }
+
     @classmethod
     def get_by_id(cls, lodging_id: UUID) -> Lodging:
         return Lodging.objects.get(id=lodging_id)
@@ -93,23 +389,97 @@ class LodgingRepository:
         available_only = bool(query_params.get("available_only", False))
         country = query_params.get("country")
         city = query_params.get("city")
+        price_min = cls._get_decimal_param(query_params, "price_min")
+        price_max = cls._get_decimal_param(query_params, "price_max")
+        min_rating = cls._get_decimal_param(query_params, "min_rating")
+        radius_in_km = cls._get_decimal_param(query_params, "radius")
 
-        if not (country and city or country):
+        if not (country and city or country) and radius_in_km is None:
             raise DjLodgingValidationError(
-                "You must provide either a city with a country or at least a country!"
+                "You must provide either a city with a country, at least a country or a radius!"
             )
+        if radius_in_km is not None:
+            radius_in_km = float(radius_in_km)
+            if not 0 < radius_in_km <= settings.LODGING_SEARCH_MAX_RADIUS_IN_KM:
+                raise DjLodgingValidationError(
+                    "The radius must be greater than 0 and at most "
+                    f"{settings.LODGING_SEARCH_MAX_RADIUS_IN_KM} km."
+                )
+            # The country and the city only place the center, lodgings around it may be elsewhere
+            latitude, longitude = cls._get_search_center(query_params, country, city)
+            country = city = None
 
         lodging_filter = cls._construct_lodging_filter(
-            number_of_people, number_of_rooms, kind, country, city
+            number_of_people,
+            number_of_rooms,
+            kind,
+            country,
+            city,
+            price_min=price_min,
+            price_max=price_max,
+            min_rating=min_rating,
+        )
+        if radius_in_km is None:
+            return cls._get_filtered_lodgings(available_only, lodging_filter, date_from, date_to)
+
+        lodging_filter &= cls._construct_radius_filter(latitude, longitude, radius_in_km)
+        return (
+            cls._get_filtered_lodgings(available_only, lodging_filter, date_from, date_to)
+            .annotate(distance=get_distance_in_km("latitude", "longitude", latitude, longitude))
+            .filter(distance__lte=radius_in_km)
+            .order_by(*cls.SEARCH_ORDERINGS["distance"])
         )
-        filtered_lodgings_ids_list = cls._get_list_of_filtered_lodgings_ids(lodging_filter)
-        query_expression = cls._generate_query_expression_for_filter(
-            date_from, date_to, filtered_lodgings_ids_list
+
+    @classmethod
+    def _get_search_center(
+        cls, query_params: dict, country: Optional[str], city: Optional[str]
+    ) -> Tuple[float, float]:
+        """The given coordinates or else the coordinates of the given city."""
+        latitude = cls._get_decimal_param(query_params, "latitude")
+        longitude = cls._get_decimal_param(query_params, "longitude")
+        if latitude is not None and longitude is not None:
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise DjLodgingValidationError("The coordinates are invalid.")
+            return float(latitude), float(longitude)
+        if country and city:
+            city_ids = LocationCatalogRepository.get_city_ids(str(country), str(city))
+            center = CityRepository.get_coordinates(city_ids)
+            if center is not None:
+                return center
+        raise DjLodgingValidationError(
+            "A radius search needs a latitude and a longitude or a city with coordinates."
         )
-        filtered_lodgings = cls._get_filtered_lodgings(available_only, query_expression)
-        # Add average_rating to each lodging
-        result = cls._annotate_lodgings_with_average_ratings(filtered_lodgings).distinct()
-        return result
+
+    @classmethod
+    def _construct_radius_filter(cls, latitude: float, longitude: float, radius_in_km: float) -> Q:
+        """
+        The geohash cells covering the circle, which `lodging_geohash_idx` finds with a range
+        scan each. The exact distance is checked on the lodgings in these cells only.
+        """
+        geohashes = get_covering_geohashes(latitude, longitude, radius_in_km)
+        if not geohashes:
+            # No cells around a pole, the circle's band of latitudes still bounds the search
+            radius_height = radius_in_km / KM_PER_DEGREE
+            return Q(
+                latitude__gte=latitude - radius_height, latitude__lte=latitude + radius_height
+            )
+        radius_filter = Q()
+        for geohash in geohashes:
+            radius_filter |= Q(geohash__startswith=geohash)
+        return radius_filter
+
+    @classmethod
+    def _get_decimal_param(cls, query_params: dict, name: str) -> Optional[Decimal]:
+        value = query_params.get(name)
+        if value is None or value == "":
+            return None
+        try:
+            number = Decimal(str(value))
+        except InvalidOperation as exc:
+            raise DjLodgingValidationError(f"{name} must be a number.") from exc
+        if not number.is_finite():
+            raise DjLodgingValidationError(f"{name} must be a number.")
+        return number
 
     @classmethod
     def _construct_lodging_filter(
@@ -119,85 +489,207 @@ class LodgingRepository:
         kind: str,
         country: Optional[str],
         city: Optional[str],
+        price_min: Optional[Decimal] = None,
+        price_max: Optional[Decimal] = None,
+        min_rating: Optional[Decimal] = None,
     ) -> Q:
         lodging_filter = Q(
             number_of_people__gte=number_of_people,
             number_of_rooms__exact=number_of_rooms,
         )
-        if city and country:
-            lodging_filter |= Q(city__name__exact=city, city__country__name__exact=country)
-        elif country:
-            lodging_filter |= Q(city__country__name__exact=country)
-        else:
-            raise DjLodgingValidationError(
-                "You must provide a city name with a country name! "
-                "Or at least the name of the country."
+        if country:
+            # City ids from the cached catalog instead of joining cities and countries
+            city_ids = LocationCatalogRepository.get_city_ids(
+                str(country), str(city) if city else None
             )
+            lodging_filter &= Q(city_id__in=city_ids)
         if kind:
-            lodging_filter |= Q(kind__exact=kind)
+            lodging_filter &= Q(kind__exact=kind)
+        if price_min is not None:
+            lodging_filter &= Q(price__gte=price_min)
+        if price_max is not None:
+            lodging_filter &= Q(price__lte=price_max)
+        if min_rating is not None:
+            # Lodgings without reviews have no rating and are left out
+            lodging_filter &= Q(average_rating__gte=min_rating)
         return lodging_filter
 
     @classmethod
-    def _generate_query_expression_for_filter(
-        cls,
-        date_from: date,
-        date_to: date,
-        filtered_lodgings_ids_list: "ValuesQuerySet[Lodging, Any]",
-    ) -> Q:
-
-        query_expression = (
-            ~Q(booking__lodging__id__in=filtered_lodgings_ids_list)
-            | Q(id__in=filtered_lodgings_ids_list) & Q(booking__date_to__lte=date_from)
-            | Q(id__in=filtered_lodgings_ids_list) & Q(booking__date_from__gte=date_to)
+    def _get_filtered_lodgings(
+        cls, available_only: bool, lodging_filter: Q, date_from: date, date_to: date
+    ) -> QuerySet[Lodging]:
+        # A single probe into the booked days index per lodging instead of a join with bookings
+        is_booked = Exists(
+            BookedDayRepository.get_list_between_dates(date_from, date_to).filter(
+                lodging=OuterRef("pk")
+            )
         )
-        return query_expression
+        filtered_lodgings = Lodging.objects.filter(lodging_filter)
+        if available_only:
+            return filtered_lodgings.filter(~is_booked)
+        return filtered_lodgings.annotate(available=~is_booked)
 
     @classmethod
-    def _get_list_of_filtered_lodgings_ids(
-        cls, lodging_filter: Q
-    ) -> "ValuesQuerySet[Lodging, Any]":
-        filtered_lodgings = Lodging.objects.filter(lodging_filter)
-        filtered_lodgings_ids_list = filtered_lodgings.values_list("id", flat=True)
-        return filtered_lodgings_ids_list
+    def get_paginated_filtered_list(
+        cls, query_params: dict, projection: Projection
+    ) -> Dict[str, Union[int, List[dict]]]:
+        if CURSOR_QUERY_PARAM in query_params and query_params.get("radius"):
+            # The cursor would order by creation instead of distance
+            raise DjLodgingValidationError("Radius searches are paginated by page, not by cursor.")
+        lodgings = cls._sort_search(cls.get_filtered_list(query_params), query_params)
+        # Radius searches are paginated by the database, the search cache is kept per city
+        search_window = None
+        if CURSOR_QUERY_PARAM not in query_params and not query_params.get("radius"):
+            search_window = LodgingSearchCacheRepository.get_or_set(
+                query_params, lambda: cls._get_search_window(lodgings)
+            )
+        # Broad searches match many lodgings, their exact total is not worth a second scan.
+        if search_window is None:
+            return paginate_queryset(
+                projection.values(lodgings), query_params, count_strategy=CountStrategy.ESTIMATE
+            )
+
+        page_slice = get_page_slice(query_params)
+        window_results = search_window["results"]
+        if page_slice.stop <= len(window_results) or search_window["is_complete"]:
+            results = cls._hydrate_search_results(window_results[page_slice], projection)
+        else:
+            results = list(projection.values(lodgings)[page_slice])
+        return {
+            "count": search_window["count"],
+            "count_is_estimate": search_window["count_is_estimate"],
+            "results": results,
+        }
 
     @classmethod
-    def _get_filtered_lodgings(
-        cls, available_only: bool, query_expression: Q
-    ) -> QuerySet[Lodging]:
-        if available_only:
-            # TODO: Filter for Bookings status!
-            filtered_lodgings = Lodging.objects.filter(query_expression)
+    def _get_search_window(cls, lodgings: QuerySet[Lodging]) -> dict:
+        """
+        The count and the ordered (id, available) of the first LODGING_SEARCH_CACHE_WINDOW found
+        lodgings, available is None for available only. Later pages are read from the database.
+        """
+        window_size = settings.LODGING_SEARCH_CACHE_WINDOW
+        if "available" in lodgings.query.annotations:
+            results = list(lodgings.values_list("id", "available")[:window_size])
         else:
-            filtered_lodgings = Lodging.objects.annotate(
-                available=Case(
-                    When(
-                        query_expression,
-                        then=Value(True),
-                    ),
-                    default=Value(False),
-                )
+            results = [
+                (lodging_id, None)
+                for lodging_id in lodgings.values_list("id", flat=True)[:window_size]
+            ]
+        is_complete = len(results) < window_size
+        if is_complete:
+            count, count_is_estimate = len(results), False
+        else:
+            count, count_is_estimate = count_queryset(lodgings, CountStrategy.ESTIMATE)
+        return {
+            "count": count,
+            "count_is_estimate": count_is_estimate,
+            "is_complete": is_complete,
+            "results": results,
+        }
+
+    @classmethod
+    def _sort_search(cls, lodgings: QuerySet[Lodging], query_params: dict) -> QuerySet[Lodging]:
+        """Order by one of SEARCH_ORDERINGS, the raw `order_by` never reaches the query."""
+        order_by = query_params.get("order_by")
+        if not order_by:
+            return lodgings
+        if order_by not in cls.SEARCH_ORDERINGS:
+            raise DjLodgingValidationError(
+                f"order_by must be one of: {', '.join(cls.SEARCH_ORDERINGS)}."
             )
+        if order_by == "distance" and "distance" not in lodgings.query.annotations:
+            raise DjLodgingValidationError("order_by=distance needs a radius search.")
+        return lodgings.order_by(*cls.SEARCH_ORDERINGS[order_by])
 
-        return filtered_lodgings
+    @classmethod
+    def _hydrate_search_results(
+        cls, search_results: List[Tuple[UUID, Optional[bool]]], projection: Projection
+    ) -> List[dict]:
+        lodging_ids = [lodging_id for lodging_id, _ in search_results]
+        lodgings = projection.values(Lodging.objects.filter(id__in=lodging_ids))
+        lodgings_by_id = {lodging["id"]: lodging for lodging in lodgings}
+
+        hydrated_lodgings = []
+        for lodging_id, available in search_results:
+            lodging = lodgings_by_id.get(lodging_id)
+            if lodging is None:  # Deleted after the search was cached
+                continue
+            if available is not None:
+                lodging["available"] = available
+            hydrated_lodgings.append(lodging)
+        return hydrated_lodgings
 
     @classmethod
-    def _annotate_lodgings_with_average_ratings(
-        cls, filtered_lodgings: QuerySet
-    ) -> QuerySet[Lodging]:
-        return filtered_lodgings.annotate(average_rating=Round(Avg("reviews__score"), precision=1))
+    def get_location_names_in_bulk(
+        cls, lodging_ids: Iterable[UUID]
+    ) -> Dict[UUID, Tuple[str, str]]:
+        """(country name, city name) of every lodging by its id."""
+        return {
+            lodging_id: (country_name, city_name)
+            for lodging_id, country_name, city_name in Lodging.objects.filter(
+                id__in=lodging_ids
+            ).values_list("id", "city__country__name", "city__name")
+        }
 
     @classmethod
-    def get_paginated_filtered_list(
-        cls, query_params: dict
-    ) -> Dict[str, Union[int, List[Lodging]]]:
-        lodgings = cls.get_filtered_list(query_params)
-        sorted_lodgings = sort_queryset(lodgings, query_params)
-        return paginate_queryset(sorted_lodgings, query_params)
+    def get_in_bulk(
+        cls, lodging_ids: Iterable[UUID], projection: Optional[Projection] = None
+    ) -> Dict[UUID, Lodging]:
+        """Lodgings by their ids, loaded by the projection when they are rendered."""
+        lodgings = Lodging.objects.all()
+        if projection is not None:
+            lodgings = projection.apply(lodgings)
+        return lodgings.in_bulk(lodging_ids)
 
     @classmethod
-    def retrieve_lodging_with_average_rating(cls, lodging_id: UUID) -> Optional[Lodging]:
-        lodging = Lodging.objects.filter(id=lodging_id)
-        return cls._annotate_lodgings_with_average_ratings(lodging).first()
+    def retrieve_lodging_with_average_rating(
+        cls, lodging_id: UUID, projection: Projection
+    ) -> Optional[Lodging]:
+        # average_rating is a stored column, no reviews are aggregated here.
+        return projection.apply(Lodging.objects.filter(id=lodging_id)).first()
+
+    @classmethod
+    def update_rating(
+        cls, lodging_id: UUID, review_count_delta: int, review_score_delta: int
+    ) -> None:
+        """
+        Apply a review change to the stored aggregates in a single atomic UPDATE.
+
+        Called by the review signals, see djlodging.domain.lodgings.signals.
+        """
+        review_count = F("review_count") + review_count_delta
+        review_score_sum = F("review_score_sum") + review_score_delta
+        Lodging.objects.filter(id=lodging_id).update(
+            review_count=review_count,
+            review_score_sum=review_score_sum,
+            average_rating=cls._get_average_rating_expression(review_count, review_score_sum),
+        )
+        # Searches filtered or sorted by the rating are outdated
+        LodgingSearchCacheRepository.invalidate_lodgings([lodging_id])
+
+    @classmethod
+    def reconcile_ratings(cls) -> int:
+        """Recompute the stored review aggregates of all lodgings from their reviews."""
+        reviews = Review.objects.filter(lodging=OuterRef("pk")).order_by().values("lodging")
+        review_count = Coalesce(Subquery(reviews.annotate(count=Count("id")).values("count")), 0)
+        review_score_sum = Coalesce(
+            Subquery(reviews.annotate(score_sum=Sum("score")).values("score_sum")), 0
+        )
+        return Lodging.objects.update(
+            review_count=review_count,
+            review_score_sum=review_score_sum,
+            average_rating=cls._get_average_rating_expression(review_count, review_score_sum),
+        )
+
+    @classmethod
+    def _get_average_rating_expression(cls, review_count, review_score_sum) -> Round:
+        # NULL for lodgings without reviews, like the former Avg() annotation.
+        average = ExpressionWrapper(
+            Cast(review_score_sum, DecimalField(max_digits=12, decimal_places=2))
+            / NullIf(review_count, Value(0)),
+            output_field=DecimalField(),
+        )
+        return Round(average, precision=1)
 
 
 class ReviewRepository:
@@ -209,15 +701,20 @@ class ReviewRepository:
     def get_by_id(cls, review_id: UUID) -> Review:
         return Review.objects.get(id=review_id)
 
+    @classmethod
+    def get_score(cls, review_id: UUID) -> Optional[int]:
+        """The stored score, None for a review that was not saved yet."""
+        return Review.objects.filter(id=review_id).values_list("score", flat=True).first()
+
     @classmethod
     def get_list_by_lodging(cls, lodging_id: UUID) -> QuerySet[Review]:
         return Review.objects.filter(lodging__id=lodging_id)
 
     @classmethod
     def get_paginated_list_by_lodging(
-        cls, lodging_id: UUID, query_params: dict
-    ) -> Dict[str, Union[int, List[Review]]]:
-        reviews = cls.get_list_by_lodging(lodging_id)
+        cls, lodging_id: UUID, query_params: dict, projection: Projection
+    ) -> Dict[str, Union[int, List[dict]]]:
+        reviews = projection.values(cls.get_list_by_lodging(lodging_id))
         sorted_reviews = sort_queryset(reviews, query_params)
         return paginate_queryset(sorted_reviews, query_params)
 
@@ -227,12 +724,12 @@ class ReviewRepository:
 
     @classmethod
     def get_list_by_user(cls, user: User) -> QuerySet[Review]:
-        return Review.objects.filter(user=user)
+        return Review.objects.filter(user_id=user.id)
 
     @classmethod
     def get_paginated_list_by_user(
-        cls, user: User, query_params: dict
+        cls, user: User, query_params: dict, projection: Projection
     ) -> Dict[str, Union[int, List[Review]]]:
-        my_reviews = cls.get_list_by_user(user)
+        my_reviews = projection.apply(cls.get_list_by_user(user))
         my_sorted_reviews = sort_queryset(my_reviews, query_params)
         return paginate_queryset(my_sorted_reviews, query_params)
@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from djlodging.domain.lodgings.models import City, Country
+from djlodging.domain.lodgings.models.review import Review
+from djlodging.domain.lodgings.repositories import (
+    LocationCatalogRepository,
+    LodgingRepository,
+    ReviewRepository,
+)
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+def invalidate_location_catalog(sender, **kwargs):  # pylint: disable=unused-argument
+    """Any country or city write, by a service, the admin or a fixture, outdates the catalog."""
+    LocationCatalogRepository.invalidate()
+
+
+@receiver(pre_save, sender=Review)
+def load_saved_score(
+    sender, instance: Review, raw: bool, **kwargs
+):  # pylint: disable=unused-argument
+    """Reviews loaded with a deferred score don't know the saved one, see Review.from_db."""
+    if raw or instance._state.adding:  # pylint: disable=protected-access
+        return
+    if getattr(instance, "saved_score", None) is None:
+        instance.saved_score = ReviewRepository.get_score(instance.id)
+
+
+@receiver(post_save, sender=Review)
+def update_lodging_rating(
+    sender, instance: Review, created: bool, raw: bool, **kwargs
+):  # pylint: disable=unused-argument
+    """Keep the lodging's review aggregates in line with its reviews, whoever saves them."""
+    if raw:
+        return
+    if created:
+        LodgingRepository.update_rating(
+            instance.lodging_id, review_count_delta=1, review_score_delta=instance.score
+        )
+    elif instance.saved_score is not None and instance.score != instance.saved_score:
+        LodgingRepository.update_rating(
+            instance.lodging_id,
+            review_count_delta=0,
+            review_score_delta=instance.score - instance.saved_score,
+        )
+    instance.saved_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def remove_from_lodging_rating(
+    sender, instance: Review, **kwargs
+):  # pylint: disable=unused-argument
+    LodgingRepository.update_rating(
+        instance.lodging_id, review_count_delta=-1, review_score_delta=-instance.score
+    )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "djlodging.domain.users"
+
+    def ready(self):
+        # pylint: disable=import-outside-toplevel,unused-import
+        from djlodging.domain.users import signals  # noqa: F401
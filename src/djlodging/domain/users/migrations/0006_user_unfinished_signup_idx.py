@@ -0,0 +1,17 @@
+# Generated by Django 4.0 on 2026-10-17 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_alter_user_security_token_expiration_time'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['security_token_expiration_time', 'id'], name='user_unfinished_signup_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.0 on 2026-10-18 03:17
+
+from django.db import migrations
+import djlodging.domain.users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_user_auth_version'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', djlodging.domain.users.models.UserManager()),
+            ],
+        ),
+    ]
@@ -1,11 +1,33 @@
 from uuid import uuid4
 
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as DjangoUserManager
 from django.core.validators import EmailValidator
 from django.db import models
+from django.db.models import F
+from django.dispatch import Signal
 
 from djlodging.domain.core.base_models import BaseModel
 
+# Sent with the `user_ids` whose claimed fields a queryset update changed, see UserQuerySet
+claimed_fields_updated = Signal()
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """Bump the `auth_version` of the users along with their claimed fields, as save() does."""
+        if not set(kwargs) & set(User.CLAIMED_FIELDS):
+            return super().update(**kwargs)
+        user_ids = list(self.values_list("id", flat=True))
+        kwargs.setdefault("auth_version", F("auth_version") + 1)
+        rows = super().update(**kwargs)
+        claimed_fields_updated.send(sender=self.model, user_ids=user_ids)
+        return rows
+
+
+class UserManager(DjangoUserManager.from_queryset(UserQuerySet)):
+    pass
+
 
 class User(AbstractUser, BaseModel):
     """Users in djlodging"""
@@ -27,22 +49,54 @@ class User(AbstractUser, BaseModel):
     gender = models.CharField(max_length=20, blank=True, choices=Gender.choices)
     security_token = models.CharField(max_length=100, blank=True, default=uuid4)
     security_token_expiration_time = models.DateTimeField(blank=True, null=True)
+    # Bumped when a field the access tokens claim or depend on changes, see `CLAIMED_FIELDS`
+    auth_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
+    CLAIMED_FIELDS = ("is_active", "is_staff", "is_superuser", "is_user", "is_partner", "password")
+
+    objects = UserManager()
 
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            models.Index(
+                fields=["security_token_expiration_time", "id"],
+                condition=models.Q(is_active=False),
+                name="user_unfinished_signup_idx",
+            )
+        ]
 
     def __str__(self):
         return self.email or self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._claimed_values = instance._get_claimed_values()
+        return instance
+
     def save(self, *args, **kwargs):
         if self.username == "":
             self.username = self.email
+        claimed_values = self._get_claimed_values()
+        are_claims_changed = getattr(self, "_claimed_values", claimed_values) != claimed_values
         self.full_clean()
-        return super().save(*args, **kwargs)
+        if are_claims_changed:
+            # Incremented by the database, so that concurrent changes never share a version
+            self.auth_version = F("auth_version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "auth_version"}
+        result = super().save(*args, **kwargs)
+        if are_claims_changed:
+            self.refresh_from_db(fields=["auth_version"])
+        self._claimed_values = claimed_values
+        return result
+
+    def _get_claimed_values(self) -> tuple:
+        return tuple(self.__dict__.get(field) for field in self.CLAIMED_FIELDS)
 
     @property
     def full_name(self):
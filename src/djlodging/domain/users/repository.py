@@ -1,9 +1,12 @@
-from typing import Union
+from typing import Iterable, Optional, Union
 from uuid import UUID
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils.timezone import now
 
+from djlodging.domain.core.sweeps import SweepMetrics, delete_in_batches
 from djlodging.domain.users.constants import (
     USER_DOES_NOT_EXIST_MESSAGE,
     USER_DOES_NOT_EXIST_OR_WAS_DELETED_MESSAGE,
@@ -63,11 +66,66 @@ class UserRepository:
         return user.delete()
 
     @classmethod
-    def delete_users_with_unfinished_registration(cls) -> None:
+    def delete_users_with_unfinished_registration(
+        cls, time_budget_in_seconds: Optional[float] = None
+    ) -> SweepMetrics:
         unregistered_users = User.objects.filter(
             is_active=False, security_token_expiration_time__lte=now()
         )
-        unregistered_users.delete()
+        # Walks the `user_unfinished_signup_idx` partial index
+        return delete_in_batches(
+            unregistered_users,
+            order_field="security_token_expiration_time",
+            name="delete_users_with_unfinished_registration",
+            batch_size=settings.EXPIRY_SWEEP_BATCH_SIZE,
+            time_budget_in_seconds=(
+                settings.EXPIRY_SWEEP_TIME_BUDGET_IN_SECONDS
+                if time_budget_in_seconds is None
+                else time_budget_in_seconds
+            ),
+        )
+
+
+class UserAuthVersionRepository:
+    """
+    Cache of the users' `auth_version`, which the access tokens are checked against.
+
+    It's filled by the authentication when it loads a user and dropped when a user is saved,
+    or their claimed fields are updated, see djlodging.domain.users.signals.
+    An inactive user is cached as `INACTIVE_VERSION`, which matches no token.
+    Unless USER_AUTH_VERSION_CACHE_ENABLED, i.e. the cache is shared by all processes,
+    nothing is cached, so that no process trusts a version another process has changed.
+    """
+
+    KEY_TEMPLATE = "user-auth-version:{user_id}"
+    INACTIVE_VERSION = -1
+
+    @classmethod
+    def get(cls, user_id: Union[UUID, str]) -> Optional[int]:
+        if not settings.USER_AUTH_VERSION_CACHE_ENABLED:
+            return None
+        return cache.get(cls._get_key(user_id))
+
+    @classmethod
+    def update(cls, user: UserModel) -> None:
+        if not settings.USER_AUTH_VERSION_CACHE_ENABLED:
+            return
+        version = user.auth_version if user.is_active else cls.INACTIVE_VERSION
+        cache.set(
+            cls._get_key(user.id), version, timeout=settings.USER_AUTH_VERSION_CACHE_TTL_IN_SECONDS
+        )
+
+    @classmethod
+    def delete(cls, user_id: Union[UUID, str]) -> None:
+        cache.delete(cls._get_key(user_id))
+
+    @classmethod
+    def delete_many(cls, user_ids: Iterable[Union[UUID, str]]) -> None:
+        cache.delete_many([cls._get_key(user_id) for user_id in user_ids])
+
+    @classmethod
+    def _get_key(cls, user_id: Union[UUID, str]) -> str:
+        return cls.KEY_TEMPLATE.format(user_id=user_id)
 
 
 class PaymentProviderUserRepository:
@@ -0,0 +1,33 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from djlodging.domain.users.models import User, claimed_fields_updated
+from djlodging.domain.users.repository import UserAuthVersionRepository
+
+
+@receiver(post_save, sender=User)
+def forget_saved_auth_version(
+    sender, instance: User, created: bool, **kwargs
+):  # pylint: disable=unused-argument
+    """
+    Tokens issued before a change of the claimed fields stop matching the cached version.
+
+    The version is dropped rather than set, so that commits in any order leave no former version
+    behind, and the next request caches it from the database.
+    """
+    if created:
+        return
+    transaction.on_commit(partial(UserAuthVersionRepository.delete, instance.id))
+
+
+@receiver(claimed_fields_updated, sender=User)
+def forget_updated_auth_versions(sender, user_ids, **kwargs):  # pylint: disable=unused-argument
+    transaction.on_commit(partial(UserAuthVersionRepository.delete_many, user_ids))
+
+
+@receiver(post_delete, sender=User)
+def forget_auth_version(sender, instance: User, **kwargs):  # pylint: disable=unused-argument
+    transaction.on_commit(partial(UserAuthVersionRepository.delete, instance.id))
@@ -1,12 +1,37 @@
+import logging
 import os
 
-from celery import Celery
+from celery import Celery, Task
 from django.conf import settings
 
+from djlodging.infrastructure.query_metrics import check_query_budget, collect_query_metrics
+
+logger = logging.getLogger(__name__)
+
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djlodging.django_app.django_core.settings")
 
-app = Celery("djlodging")
+
+class QueryMetricsTask(Task):
+    """
+    Records the number of database queries and their time for every task run.
+
+    The numbers are checked against the task's budget from `QUERY_BUDGETS` (by task name). The
+    check runs in the task itself, so an enforced budget fails the task, unlike in a signal
+    handler whose errors Celery only logs.
+    """
+
+    def __call__(self, *args, **kwargs):
+        with collect_query_metrics() as metrics:
+            result = super().__call__(*args, **kwargs)
+        logger.info(
+            "Task %s made %d queries in %.1f ms", self.name, metrics.count, metrics.duration_ms
+        )
+        check_query_budget(self.name, metrics)
+        return result
+
+
+app = Celery("djlodging", task_cls=QueryMetricsTask)
 
 # Using a string here means the worker doesn't have to serialize
 # the configuration object to child processes.
@@ -1,39 +1,76 @@
+from django.conf import settings
+from django.db import OperationalError
+
 from djlodging.application_services.email import EmailService
+from djlodging.application_services.expiry import ExpiryService
 from djlodging.domain.bookings.repository import BookingRepository
 from djlodging.domain.users.repository import UserRepository
 from djlodging.infrastructure.jobs.celery_config import app as celery_app
+from djlodging.infrastructure.providers.email import email_provider
+
+# Transient database and email provider errors are retried with an exponential backoff.
+EMAIL_TASK_OPTIONS = {
+    "autoretry_for": (OperationalError,) + email_provider.RETRYABLE_ERRORS,
+    "retry_backoff": settings.EMAIL_RETRY_BACKOFF_IN_SECONDS,
+    "retry_backoff_max": 60 * 60,
+    "retry_jitter": True,
+    "max_retries": settings.EMAIL_MAX_ATTEMPTS,
+}
 
 
 # ==================EMAIL TASKS=========================================
+@celery_app.task(**EMAIL_TASK_OPTIONS)
 def send_confirmation_link_task(email: str, security_token: str):
-    return EmailService.send_confirmation_link(email=email, security_token=security_token)
+    EmailService.send_confirmation_link(email=email, security_token=security_token)
 
 
+@celery_app.task(**EMAIL_TASK_OPTIONS)
 def send_change_password_link_task(email: str, token: str):
-    return EmailService.send_change_password_link(email=email, token=token)
+    EmailService.send_change_password_link(email=email, token=token)
 
 
+@celery_app.task(**EMAIL_TASK_OPTIONS)
 def send_change_email_link_task(new_email: str, token: str):
-    return EmailService.send_change_email_link(new_email=new_email, token=token)
+    EmailService.send_change_email_link(new_email=new_email, token=token)
+
+
+# With EMAIL_BATCHING_ENABLED the emails of both recipients are queued by one task,
+# see BookingService._send_emails_on_commit.
+@celery_app.task(**EMAIL_TASK_OPTIONS)
+def send_booking_confirmation_emails_task(booking_id: str):
+    EmailService.send_booking_confirmation_emails(booking_id)
 
 
+@celery_app.task(**EMAIL_TASK_OPTIONS)
+def send_booking_cancellation_emails_task(booking_id: str):
+    EmailService.send_booking_cancellation_emails(booking_id)
+
+
+# Sent at once, one task per recipient, so that a retry doesn't send the email of the other
+# recipient again.
+@celery_app.task(**EMAIL_TASK_OPTIONS)
 def send_booking_confirmation_email_to_user_task(booking_id: str):
-    return EmailService.send_booking_confirmation_email_to_user(booking_id)
+    EmailService.send_booking_confirmation_email_to_user(booking_id)
 
 
+@celery_app.task(**EMAIL_TASK_OPTIONS)
 def send_booking_confirmation_email_to_owner_task(booking_id: str):
-    return EmailService.send_booking_confirmation_email_to_owner(booking_id)
+    EmailService.send_booking_confirmation_email_to_owner(booking_id)
 
 
+@celery_app.task(**EMAIL_TASK_OPTIONS)
 def send_booking_cancellation_email_to_owner_task(booking_id: str):
-    return EmailService.send_booking_cancellation_email_to_owner(booking_id)
+    EmailService.send_booking_cancellation_email_to_owner(booking_id)
 
 
+@celery_app.task(**EMAIL_TASK_OPTIONS)
 def send_booking_cancellation_email_to_user_task(booking_id: str):
-    return EmailService.send_booking_cancellation_email_to_user(booking_id)
+    EmailService.send_booking_cancellation_email_to_user(booking_id)
 
 
 # ==================CELERY TASKS=========================================
+# Not enqueued anymore, expired objects are deleted by `expire_due_objects`.
+# Kept registered for messages enqueued before.
 @celery_app.task()
 def delete_unregistered_user_after_security_token_expired(user_id: str):
     UserRepository.delete_by_id(user_id)
@@ -44,12 +81,31 @@ def delete_expired_unpaid_booking(booking_id: str):
     BookingRepository.delete_by_id(booking_id)
 
 
+@celery_app.task()
+def process_payment_events():
+    # pylint: disable=import-outside-toplevel
+    # PaymentEventService needs BookingService, which imports this module
+    from djlodging.application_services.payment_events import PaymentEventService
+
+    return PaymentEventService.process_pending()
+
+
 # ================CELERY BEAT PERIODIC TASKS==============================
+@celery_app.task
+def send_pending_emails():
+    return EmailService.send_pending_emails()
+
+
+@celery_app.task
+def expire_due_objects():
+    return ExpiryService.expire_due()
+
+
 @celery_app.task
 def delete_users_with_unfinished_registration():
-    UserRepository.delete_users_with_unfinished_registration()
+    return UserRepository.delete_users_with_unfinished_registration().as_dict()
 
 
 @celery_app.task
 def delete_all_expired_unpaid_bookings():
-    BookingRepository.delete_all_expired_unpaid_bookings()
+    return BookingRepository.delete_all_expired_unpaid_bookings().as_dict()
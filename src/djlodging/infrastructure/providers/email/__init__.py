@@ -3,9 +3,10 @@ from typing import Union
 from djlodging.infrastructure.providers.provider_injector import get_provider
 
 from .base_email_provider import BaseEmailProvider
+from .local import LocalEmailProvider
 from .sendgrid import SendgridEmailProvider
 
-email_provider_type = Union[BaseEmailProvider, SendgridEmailProvider]
+email_provider_type = Union[BaseEmailProvider, SendgridEmailProvider, LocalEmailProvider]
 
 email_provider: email_provider_type = get_provider("EMAIL_PROVIDER")
 
@@ -13,4 +14,5 @@ __all__ = [
     "email_provider",
     "BaseEmailProvider",
     "SendgridEmailProvider",
+    "LocalEmailProvider",
 ]
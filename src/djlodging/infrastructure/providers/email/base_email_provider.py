@@ -1,15 +1,40 @@
 from abc import ABC, abstractmethod
+from typing import List, Tuple, Type
 
 from django.conf import settings
 
+from djlodging.domain.emails.repository import PendingEmailRepository
+
 
 class BaseEmailProvider(ABC):
     """Abstract Base EmailProvider class"""
 
+    # Maximum number of personalizations (recipients) sent in one request
+    MAX_BATCH_SIZE = 1
+    # Errors worth retrying, e.g. network errors and rate limits
+    RETRYABLE_ERRORS: Tuple[Type[Exception], ...] = (OSError,)
+
     def __init__(self):
         super().__init__()
         self.from_email = settings.DEFAULT_FROM_EMAIL
 
+    def _send(self, template_id: str, email: str, dynamic_template_data: dict):
+        """
+        Send one email of a template. With `EMAIL_BATCHING_ENABLED` it is queued instead,
+        to be sent with other emails of the template by `EmailService.send_pending_emails`.
+        """
+        personalization = {
+            "to": [{"email": email}],
+            "dynamic_template_data": dynamic_template_data,
+        }
+        if settings.EMAIL_BATCHING_ENABLED:
+            return PendingEmailRepository.add(template_id, personalization)
+        return self.send_batch(template_id=template_id, personalizations=[personalization])
+
+    @abstractmethod
+    def send_batch(self, *, template_id: str, personalizations: List[dict]):
+        """Send one template to up to `MAX_BATCH_SIZE` recipients in a single request."""
+
     @abstractmethod
     def send_confirmation_link(self, *, email: str, link: str):
         pass
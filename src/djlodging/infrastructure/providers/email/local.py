@@ -0,0 +1,42 @@
+import json
+import os
+from collections import deque
+from threading import Lock
+from typing import List
+
+from django.conf import settings
+
+from djlodging.infrastructure.providers.email.sendgrid import SendgridEmailProvider
+
+
+class LocalEmailProvider(SendgridEmailProvider):
+    """
+    Keeps emails locally instead of sending them, for development and offline load tests.
+
+    Renders the same requests as `SendgridEmailProvider` and keeps the last
+    `LOCAL_EMAIL_SINK_SIZE` of them in memory. With `LOCAL_EMAIL_SPOOL_DIR` set,
+    every request is also appended to a JSON lines file per process there.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sent = deque(maxlen=settings.LOCAL_EMAIL_SINK_SIZE)
+        self.message_count = 0
+        self._lock = Lock()
+
+    def send_batch(self, *, template_id: str, personalizations: List[dict]):
+        data = {
+            "personalizations": personalizations,
+            "from": {"email": self.from_email},
+            "template_id": template_id,
+        }
+        with self._lock:
+            self.sent.append(data)
+            self.message_count += len(personalizations)
+            if settings.LOCAL_EMAIL_SPOOL_DIR:
+                spool_path = os.path.join(
+                    settings.LOCAL_EMAIL_SPOOL_DIR, f"emails-{os.getpid()}.jsonl"
+                )
+                with open(spool_path, "a", encoding="utf-8") as spool:
+                    spool.write(json.dumps(data) + "\n")
+        return data
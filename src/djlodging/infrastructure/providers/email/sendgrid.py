@@ -1,17 +1,29 @@
+from typing import List
+
+import requests
 from django.conf import settings
-from sendgrid import SendGridAPIClient
 
 from djlodging.infrastructure.providers.email.base_email_provider import BaseEmailProvider
+from djlodging.infrastructure.providers.http_session import (
+    RetryableHTTPError,
+    get_session,
+    raise_for_status,
+)
 
 
 # pylint: disable=too-many-instance-attributes
 class SendgridEmailProvider(BaseEmailProvider):
     """Sendgrid Email Provider class"""
 
+    # The Mail Send API accepts up to 1000 personalizations per request
+    MAX_BATCH_SIZE = 1000
+    RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, RetryableHTTPError)
+
     def __init__(self):
         super().__init__()
         email_provider_settings = settings.EMAIL_PROVIDER_SETTINGS
-        self.sendgrid_api = SendGridAPIClient(api_key=email_provider_settings["API_KEY"])
+        self.api_key = email_provider_settings["API_KEY"]
+        self.mail_send_url = f"{email_provider_settings['API_HOST']}/v3/mail/send"
         self.confirmation_link_template_id = email_provider_settings[
             "CONFIRMATION_LINK_TEMPLATE_ID"
         ]
@@ -38,26 +50,31 @@ class SendgridEmailProvider(BaseEmailProvider):
             "BOOKING_CANCELLATION_EMAIL_FOR_OWNER_TEMPLATE_ID"
         ]
 
+    def send_batch(self, *, template_id: str, personalizations: List[dict]):
+        data = {
+            "personalizations": personalizations,
+            "from": {"email": self.from_email},
+            "template_id": template_id,
+        }
+        response = get_session("sendgrid").post(
+            self.mail_send_url, json=data, headers={"Authorization": f"Bearer {self.api_key}"}
+        )
+        return raise_for_status(response)
+
     def send_confirmation_link(
         self,
         *,
         email: str,
         link: str,
     ):
-        data = {
-            "personalizations": [
-                {
-                    "to": [{"email": email}],
-                    "dynamic_template_data": {
-                        "email": email,
-                        "link": link,
-                    },
-                }
-            ],
-            "from": {"email": self.from_email},
-            "template_id": self.confirmation_link_template_id,
-        }
-        return self.sendgrid_api.client.mail.send.post(request_body=data)
+        return self._send(
+            self.confirmation_link_template_id,
+            email,
+            {
+                "email": email,
+                "link": link,
+            },
+        )
 
     def send_change_password_link(
         self,
@@ -65,46 +82,28 @@ class SendgridEmailProvider(BaseEmailProvider):
         email: str,
         link: str,
     ):
-        data = {
-            "personalizations": [
-                {
-                    "to": [{"email": email}],
-                    "dynamic_template_data": {
-                        "email": email,
-                        "link": link,
-                    },
-                }
-            ],
-            "from": {"email": self.from_email},
-            "template_id": self.change_password_link_template_id,
-        }
-        return self.sendgrid_api.client.mail.send.post(request_body=data)
+        return self._send(
+            self.change_password_link_template_id,
+            email,
+            {
+                "email": email,
+                "link": link,
+            },
+        )
 
     def send_forgot_password_email(self, *, email: str, username: str, link: str):
-        data = {
-            "personalizations": [
-                {
-                    "to": [{"email": email}],
-                    "dynamic_template_data": {"name": username, "user_email": email, "link": link},
-                }
-            ],
-            "from": {"email": self.from_email},
-            "template_id": self.forgot_password_template_id,
-        }
-        return self.sendgrid_api.client.mail.send.post(request_body=data)
+        return self._send(
+            self.forgot_password_template_id,
+            email,
+            {"name": username, "user_email": email, "link": link},
+        )
 
     def send_change_email_link(self, *, email: str, link: str):
-        data = {
-            "personalizations": [
-                {
-                    "to": [{"email": email}],
-                    "dynamic_template_data": {"user_email": email, "link": link},
-                }
-            ],
-            "from": {"email": self.from_email},
-            "template_id": self.change_email_link_template_id,
-        }
-        return self.sendgrid_api.client.mail.send.post(request_body=data)
+        return self._send(
+            self.change_email_link_template_id,
+            email,
+            {"user_email": email, "link": link},
+        )
 
     def send_booking_confirmation_email_to_user(
         self,
@@ -117,25 +116,19 @@ class SendgridEmailProvider(BaseEmailProvider):
         date_to: str,
         reference_code: str,
     ):
-        data = {
-            "personalizations": [
-                {
-                    "to": [{"email": email}],
-                    "dynamic_template_data": {
-                        "user_email": email,
-                        "username": username,
-                        "lodging_name": lodging_name,
-                        "city": city,
-                        "date_from": date_from,
-                        "date_to": date_to,
-                        "reference_code": reference_code,
-                    },
-                }
-            ],
-            "from": {"email": self.from_email},
-            "template_id": self.booking_confirmation_email_for_user_template_id,
-        }
-        return self.sendgrid_api.client.mail.send.post(request_body=data)
+        return self._send(
+            self.booking_confirmation_email_for_user_template_id,
+            email,
+            {
+                "user_email": email,
+                "username": username,
+                "lodging_name": lodging_name,
+                "city": city,
+                "date_from": date_from,
+                "date_to": date_to,
+                "reference_code": reference_code,
+            },
+        )
 
     def send_booking_confirmation_email_to_owner(
         self,
@@ -149,26 +142,20 @@ class SendgridEmailProvider(BaseEmailProvider):
         date_to: str,
         reference_code: str,
     ):
-        data = {
-            "personalizations": [
-                {
-                    "to": [{"email": email}],
-                    "dynamic_template_data": {
-                        "owner_email": email,
-                        "owner_name": owner_name,
-                        "username": username,
-                        "lodging_name": lodging_name,
-                        "city": city,
-                        "date_from": date_from,
-                        "date_to": date_to,
-                        "reference_code": reference_code,
-                    },
-                }
-            ],
-            "from": {"email": self.from_email},
-            "template_id": self.booking_confirmation_email_for_owner_template_id,
-        }
-        return self.sendgrid_api.client.mail.send.post(request_body=data)
+        return self._send(
+            self.booking_confirmation_email_for_owner_template_id,
+            email,
+            {
+                "owner_email": email,
+                "owner_name": owner_name,
+                "username": username,
+                "lodging_name": lodging_name,
+                "city": city,
+                "date_from": date_from,
+                "date_to": date_to,
+                "reference_code": reference_code,
+            },
+        )
 
     def send_booking_cancellation_email_to_user(
         self,
@@ -180,24 +167,18 @@ class SendgridEmailProvider(BaseEmailProvider):
         date_from: str,
         date_to: str,
     ):
-        data = {
-            "personalizations": [
-                {
-                    "to": [{"email": email}],
-                    "dynamic_template_data": {
-                        "user_email": email,
-                        "username": username,
-                        "lodging_name": lodging_name,
-                        "city": city,
-                        "date_from": date_from,
-                        "date_to": date_to,
-                    },
-                }
-            ],
-            "from": {"email": self.from_email},
-            "template_id": self.booking_cancellation_email_to_user_template_id,
-        }
-        return self.sendgrid_api.client.mail.send.post(request_body=data)
+        return self._send(
+            self.booking_cancellation_email_to_user_template_id,
+            email,
+            {
+                "user_email": email,
+                "username": username,
+                "lodging_name": lodging_name,
+                "city": city,
+                "date_from": date_from,
+                "date_to": date_to,
+            },
+        )
 
     def send_booking_cancellation_email_to_owner(
         self,
@@ -211,23 +192,17 @@ class SendgridEmailProvider(BaseEmailProvider):
         date_to: str,
         reference_code: str,
     ):
-        data = {
-            "personalizations": [
-                {
-                    "to": [{"email": email}],
-                    "dynamic_template_data": {
-                        "owner_email": email,
-                        "owner_name": owner_name,
-                        "username": username,
-                        "lodging_name": lodging_name,
-                        "city": city,
-                        "date_from": date_from,
-                        "date_to": date_to,
-                        "reference_code": reference_code,
-                    },
-                }
-            ],
-            "from": {"email": self.from_email},
-            "template_id": self.booking_cancellation_email_to_owner_template_id,
-        }
-        return self.sendgrid_api.client.mail.send.post(request_body=data)
+        return self._send(
+            self.booking_cancellation_email_to_owner_template_id,
+            email,
+            {
+                "owner_email": email,
+                "owner_name": owner_name,
+                "username": username,
+                "lodging_name": lodging_name,
+                "city": city,
+                "date_from": date_from,
+                "date_to": date_to,
+                "reference_code": reference_code,
+            },
+        )
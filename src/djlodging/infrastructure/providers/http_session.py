@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+from bisect import bisect_left
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Dict
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets
+LATENCY_BUCKETS_IN_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class RetryableHTTPError(requests.HTTPError):
+    """A provider response worth retrying later: rate limited or temporarily unavailable."""
+
+
+class LatencyHistogram:
+    """Request latencies of one provider, counted in `LATENCY_BUCKETS_IN_MS` buckets."""
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS_IN_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self._lock = Lock()
+
+    def observe(self, duration_ms: float) -> None:
+        index = bisect_left(LATENCY_BUCKETS_IN_MS, duration_ms)
+        with self._lock:
+            self.bucket_counts[index] += 1
+            self.count += 1
+            self.sum_ms += duration_ms
+
+    def as_dict(self) -> dict:
+        """Cumulative counts per bucket upper bound, like a Prometheus histogram."""
+        buckets, cumulative_count = {}, 0
+        for upper_bound, bucket_count in zip(LATENCY_BUCKETS_IN_MS + ("inf",), self.bucket_counts):
+            cumulative_count += bucket_count
+            buckets[str(upper_bound)] = cumulative_count
+        return {"count": self.count, "sum_ms": round(self.sum_ms, 3), "buckets": buckets}
+
+
+class ProviderSession(requests.Session):
+    """
+    A keep-alive session with a connection pool for the calls to one provider,
+    so that consecutive calls reuse open TLS connections instead of a handshake per call.
+
+    Requests get the `PROVIDER_HTTP_*` timeouts unless given their own,
+    and their latency is recorded in the provider's histogram.
+    """
+
+    def __init__(self, provider_name: str):
+        super().__init__()
+        self.provider_name = provider_name
+        self.latency_histogram = LatencyHistogram()
+        if not settings.PROVIDER_HTTP_KEEP_ALIVE:
+            self.headers["Connection"] = "close"
+        self.reset_pool()
+
+    def reset_pool(self) -> None:
+        """Mount fresh connection pools, dropping (without closing) the current connections."""
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=settings.PROVIDER_HTTP_POOL_SIZE, max_retries=0
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    # pylint: disable=arguments-differ
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault(
+            "timeout",
+            (
+                settings.PROVIDER_HTTP_CONNECT_TIMEOUT_IN_SECONDS,
+                settings.PROVIDER_HTTP_READ_TIMEOUT_IN_SECONDS,
+            ),
+        )
+        started = perf_counter()
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            duration_ms = (perf_counter() - started) * 1000
+            self.latency_histogram.observe(duration_ms)
+            logger.debug("%s %s %s took %.1f ms", self.provider_name, method, url, duration_ms)
+            _log_latency_histograms_if_due()
+
+
+_sessions: Dict[str, ProviderSession] = {}
+_sessions_lock = Lock()
+_histograms_logged_at = monotonic()
+
+
+def get_session(provider_name: str) -> ProviderSession:
+    """The session of a provider, shared by all calls to it in this worker process."""
+    with _sessions_lock:
+        if provider_name not in _sessions:
+            _sessions[provider_name] = ProviderSession(provider_name)
+        return _sessions[provider_name]
+
+
+def get_latency_histograms() -> Dict[str, dict]:
+    return {name: session.latency_histogram.as_dict() for name, session in _sessions.items()}
+
+
+def log_latency_histograms() -> None:
+    """Log the histograms of this worker process, one line per provider."""
+    for provider_name, histogram in get_latency_histograms().items():
+        logger.info("%s latency histogram: %s", provider_name, json.dumps(histogram))
+
+
+def _log_latency_histograms_if_due() -> None:
+    global _histograms_logged_at  # pylint: disable=global-statement
+    with _sessions_lock:
+        logged_ago = monotonic() - _histograms_logged_at
+        if logged_ago < settings.PROVIDER_HTTP_LATENCY_LOG_INTERVAL_IN_SECONDS:
+            return
+        _histograms_logged_at = monotonic()
+    log_latency_histograms()
+
+
+def raise_for_status(response: requests.Response) -> requests.Response:
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        raise RetryableHTTPError(
+            f"{response.status_code} Error for url: {response.url}", response=response
+        )
+    response.raise_for_status()
+    return response
+
+
+def _reset_pools_after_fork() -> None:
+    # A forked worker (e.g. Celery prefork) must not share the parent's sockets.
+    global _sessions_lock  # pylint: disable=global-statement
+    _sessions_lock = Lock()
+    for session in _sessions.values():
+        session.reset_pool()
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
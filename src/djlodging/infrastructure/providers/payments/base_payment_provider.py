@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from decimal import Decimal
+from typing import Iterator, Optional
 from uuid import UUID
 
 
@@ -19,6 +21,7 @@ class BasePaymentProvider(ABC):
         metadata: dict,
         capture_method: str,
         receipt_email: str,
+        idempotency_key: Optional[str] = None,
     ):
         pass
 
@@ -26,6 +29,16 @@ class BasePaymentProvider(ABC):
     def get_payment_intent(self, payment_intent_id: str):
         pass
 
+    @abstractmethod
+    def cancel_payment_intent(self, payment_intent_id: str) -> None:
+        """Cancel an intent that must not be paid anymore, missing or canceled ones are kept."""
+
+    @abstractmethod
+    def is_payment_intent_reusable(
+        self, payment_intent, amount: Decimal, currency: str, capture_method: str
+    ) -> bool:
+        """Whether the customer can still pay the intent and it is for the given amount."""
+
     @abstractmethod
     def create_refund(
         self,
@@ -34,3 +47,7 @@ class BasePaymentProvider(ABC):
         metadata: dict,
     ):
         pass
+
+    @abstractmethod
+    def list_events(self, event_type: str, created_after: datetime) -> Iterator[dict]:
+        """Past webhook events as dicts with id, type, object (the payload) and created."""
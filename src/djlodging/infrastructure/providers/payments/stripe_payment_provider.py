@@ -1,18 +1,39 @@
+from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Iterator, Optional
 from uuid import UUID
 
 import stripe
 from django.conf import settings
+from django.db import transaction
 from djstripe import webhooks
 from stripe.error import InvalidRequestError
+from stripe.http_client import RequestsClient
 
+from djlodging.infrastructure.providers.http_session import get_session
 from djlodging.infrastructure.providers.payments.base_payment_provider import BasePaymentProvider
 from djlodging.infrastructure.providers.payments.exceptions import PaymentProviderException
 
 stripe.api_key = settings.STRIPE_API_KEY
+stripe.api_base = settings.STRIPE_API_BASE
+# Stripe calls go through the shared keep-alive session instead of the client's own
+stripe.default_http_client = RequestsClient(
+    session=get_session("stripe"),
+    timeout=(
+        settings.PROVIDER_HTTP_CONNECT_TIMEOUT_IN_SECONDS,
+        settings.PROVIDER_HTTP_READ_TIMEOUT_IN_SECONDS,
+    ),
+)
 
 
 class StripePaymentProvider(BasePaymentProvider):
+    # The statuses of a payment intent the customer can still confirm
+    REUSABLE_PAYMENT_INTENT_STATUSES = (
+        "requires_payment_method",
+        "requires_confirmation",
+        "requires_action",
+    )
+
     def create_payment_user(self, email: str) -> stripe.Customer:
         """Create a stripe customer."""
         return stripe.Customer.create(email=email)
@@ -25,6 +46,7 @@ class StripePaymentProvider(BasePaymentProvider):
         metadata: dict,
         capture_method: str,
         receipt_email: str,
+        idempotency_key: Optional[str] = None,
     ) -> stripe.PaymentIntent:
         amount_in_cents = int(amount * 100)
         payment_intent = stripe.PaymentIntent.create(
@@ -34,11 +56,40 @@ class StripePaymentProvider(BasePaymentProvider):
             capture_method=capture_method,
             metadata=metadata,
             receipt_email=receipt_email,
+            idempotency_key=idempotency_key,
         )
         return payment_intent
 
     def get_payment_intent(self, payment_intent_id: str) -> stripe.PaymentIntent:
-        return stripe.PaymentIntent.retrieve(id=payment_intent_id)
+        try:
+            return stripe.PaymentIntent.retrieve(id=payment_intent_id)
+        except InvalidRequestError as exc:
+            raise PaymentProviderException(message=exc.user_message) from exc
+
+    def cancel_payment_intent(self, payment_intent_id: str) -> None:
+        try:
+            stripe.PaymentIntent.cancel(payment_intent_id)
+        except InvalidRequestError as exc:
+            error = (exc.json_body or {}).get("error", {})
+            if exc.code == "resource_missing" or (
+                error.get("payment_intent", {}).get("status") == "canceled"
+            ):
+                return
+            raise PaymentProviderException(message=exc.user_message) from exc
+
+    def is_payment_intent_reusable(
+        self,
+        payment_intent: stripe.PaymentIntent,
+        amount: Decimal,
+        currency: str,
+        capture_method: str,
+    ) -> bool:
+        return (
+            payment_intent.status in self.REUSABLE_PAYMENT_INTENT_STATUSES
+            and payment_intent.amount == int(amount * 100)
+            and payment_intent.currency == currency
+            and payment_intent.capture_method == capture_method
+        )
 
     def create_refund(
         self,
@@ -54,12 +105,30 @@ class StripePaymentProvider(BasePaymentProvider):
         except InvalidRequestError as exc:
             raise PaymentProviderException(message=exc.user_message) from exc
 
+    def list_events(self, event_type: str, created_after: datetime) -> Iterator[dict]:
+        events = stripe.Event.list(
+            type=event_type, created={"gte": int(created_after.timestamp())}, limit=100
+        )
+        for event in events.auto_paging_iter():
+            yield {
+                "id": event.id,
+                "type": event.type,
+                "object": event.data.object.to_dict_recursive(),
+                "created": datetime.fromtimestamp(event.created, tz=timezone.utc),
+            }
+
 
 @webhooks.handler("payment_intent.succeeded")
 def confirm_payment(event, **kwargs):
-    """Change booking status to 'PAID'"""
+    """Store the event to change booking status to 'PAID' asynchronously"""
     # pylint: disable=import-outside-toplevel
-    from djlodging.application_services.bookings import BookingService
+    from djlodging.application_services.payment_events import PaymentEventService
+    from djlodging.infrastructure.jobs.celery_tasks import process_payment_events
 
-    payment_intent = event.data["object"]
-    BookingService.confirm(payment_intent["metadata"])
+    if PaymentEventService.receive(
+        event_id=event.id,
+        event_type=event.type,
+        payload=event.data["object"],
+        event_created=event.created,
+    ):
+        transaction.on_commit(process_payment_events.delay)
@@ -0,0 +1,58 @@
+import logging
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceededError(Exception):
+    pass
+
+
+class QueryMetrics:
+    """Database query count and time, collected by a connection execute wrapper."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += perf_counter() - start
+
+
+@contextmanager
+def collect_query_metrics() -> Iterator[QueryMetrics]:
+    """Count the queries and measure their time on all database connections of this thread."""
+    metrics = QueryMetrics()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        yield metrics
+
+
+def check_query_budget(name: Optional[str], metrics: QueryMetrics) -> None:
+    """
+    Compare the number of queries with the budget from `QUERY_BUDGETS` for a URL or task name.
+
+    An exceeded budget is logged, or raised if `QUERY_BUDGETS_ENFORCED` is set (as in tests).
+    """
+    budget = settings.QUERY_BUDGETS.get(name)
+    if budget is None or metrics.count <= budget:
+        return
+    message = f"{name} made {metrics.count} database queries, the budget is {budget}."
+    if settings.QUERY_BUDGETS_ENFORCED:
+        raise QueryBudgetExceededError(message)
+    logger.warning(message)
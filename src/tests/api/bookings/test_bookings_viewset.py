@@ -26,10 +26,10 @@ class TestBookingViewSet:
         assert Booking.objects.count() == 0
 
         bookings_for_lodging_1 = BookingFactory.create_batch(
-            size=bookings_count_1, user=user_1, lodging=lodging_1
+            size=bookings_count_1, user=user_1, lodging=lodging_1, consecutive=True
         )
         bookings_for_lodging_2 = BookingFactory.create_batch(
-            size=bookings_count_2, user=user_2, lodging=lodging_2
+            size=bookings_count_2, user=user_2, lodging=lodging_2, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -63,7 +63,9 @@ class TestBookingViewSet:
 
         assert Booking.objects.count() == 0
 
-        BookingFactory.create_batch(size=bookings_count, user=user, lodging=lodging)
+        BookingFactory.create_batch(
+            size=bookings_count, user=user, lodging=lodging, consecutive=True
+        )
 
         url = reverse("bookings-list")
         response = user_api_client_pytest_fixture.get(url)
@@ -295,10 +295,10 @@ class TestQueryParamsFilteredList:
         lodging_2_bookings_number = 2
 
         lodging_1_bookings = BookingFactory.create_batch(
-            size=lodging_1_bookings_number, lodging=lodging_1
+            size=lodging_1_bookings_number, lodging=lodging_1, consecutive=True
         )
         lodging_2_bookings = BookingFactory.create_batch(  # noqa
-            size=lodging_2_bookings_number, lodging=lodging_2
+            size=lodging_2_bookings_number, lodging=lodging_2, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -328,10 +328,10 @@ class TestQueryParamsFilteredList:
         owner_2_bookings_number = 2
 
         owner_1_bookings = BookingFactory.create_batch(
-            size=owner_1_bookings_number, lodging=lodging_1
+            size=owner_1_bookings_number, lodging=lodging_1, consecutive=True
         )
         owner_2_bookings = BookingFactory.create_batch(  # noqa
-            size=owner_2_bookings_number, lodging=lodging_2
+            size=owner_2_bookings_number, lodging=lodging_2, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -358,9 +358,11 @@ class TestQueryParamsFilteredList:
         hotel_bookings_number = 3
         apartment_bookings_number = 2
 
-        hotel_bookings = BookingFactory.create_batch(size=hotel_bookings_number, lodging=hotel)
+        hotel_bookings = BookingFactory.create_batch(
+            size=hotel_bookings_number, lodging=hotel, consecutive=True
+        )
         apartment_bookings = BookingFactory.create_batch(  # noqa
-            size=apartment_bookings_number, lodging=apartment
+            size=apartment_bookings_number, lodging=apartment, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -390,10 +392,10 @@ class TestQueryParamsFilteredList:
         country_2_bookings_number = 2
 
         country_1_bookings = BookingFactory.create_batch(
-            size=country_1_bookings_number, lodging=country_1_lodging
+            size=country_1_bookings_number, lodging=country_1_lodging, consecutive=True
         )
         country_2_bookings = BookingFactory.create_batch(  # noqa
-            size=country_2_bookings_number, lodging=country_2_lodging
+            size=country_2_bookings_number, lodging=country_2_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -430,10 +432,10 @@ class TestQueryParamsFilteredList:
         region_2_bookings_number = 2
 
         region_1_bookings = BookingFactory.create_batch(
-            size=region_1_bookings_number, lodging=region_1_lodging
+            size=region_1_bookings_number, lodging=region_1_lodging, consecutive=True
         )
         region_2_bookings = BookingFactory.create_batch(  # noqa
-            size=region_2_bookings_number, lodging=region_2_lodging
+            size=region_2_bookings_number, lodging=region_2_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -465,10 +467,10 @@ class TestQueryParamsFilteredList:
         city_2_bookings_number = 2
 
         city_1_bookings = BookingFactory.create_batch(
-            size=city_1_bookings_number, lodging=city_1_lodging
+            size=city_1_bookings_number, lodging=city_1_lodging, consecutive=True
         )
         city_2_bookings = BookingFactory.create_batch(  # noqa
-            size=city_2_bookings_number, lodging=city_2_lodging
+            size=city_2_bookings_number, lodging=city_2_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -500,10 +502,10 @@ class TestQueryParamsFilteredList:
         district_2_lodging_bookings_number = 2
 
         district_1_bookings = BookingFactory.create_batch(
-            size=district_1_lodging_bookings_number, lodging=district_1_lodging
+            size=district_1_lodging_bookings_number, lodging=district_1_lodging, consecutive=True
         )
         district_2_bookings = BookingFactory.create_batch(  # noqa
-            size=district_2_lodging_bookings_number, lodging=district_2_lodging
+            size=district_2_lodging_bookings_number, lodging=district_2_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -538,10 +540,10 @@ class TestQueryParamsFilteredList:
         street_2_lodging_bookings_number = 2
 
         street_1_bookings = BookingFactory.create_batch(
-            size=street_1_lodging_bookings_number, lodging=street_1_lodging
+            size=street_1_lodging_bookings_number, lodging=street_1_lodging, consecutive=True
         )
         street_2_bookings = BookingFactory.create_batch(  # noqa
-            size=street_2_lodging_bookings_number, lodging=street_2_lodging
+            size=street_2_lodging_bookings_number, lodging=street_2_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -576,10 +578,10 @@ class TestQueryParamsFilteredList:
         zip_code_2_lodging_bookings_number = 2
 
         zip_code_1_bookings = BookingFactory.create_batch(
-            size=zip_code_1_lodging_bookings_number, lodging=zip_code_1_lodging
+            size=zip_code_1_lodging_bookings_number, lodging=zip_code_1_lodging, consecutive=True
         )
         zip_code_2_bookings = BookingFactory.create_batch(  # noqa
-            size=zip_code_2_lodging_bookings_number, lodging=zip_code_2_lodging
+            size=zip_code_2_lodging_bookings_number, lodging=zip_code_2_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -614,10 +616,10 @@ class TestQueryParamsFilteredList:
         email_2_lodging_bookings_number = 2
 
         email_1_bookings = BookingFactory.create_batch(
-            size=email_1_lodging_bookings_number, lodging=email_1_lodging
+            size=email_1_lodging_bookings_number, lodging=email_1_lodging, consecutive=True
         )
         email_2_bookings = BookingFactory.create_batch(  # noqa
-            size=email_2_lodging_bookings_number, lodging=email_2_lodging
+            size=email_2_lodging_bookings_number, lodging=email_2_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -652,10 +654,10 @@ class TestQueryParamsFilteredList:
         lodging_2_bookings_number = 2
 
         lodging_1_bookings = BookingFactory.create_batch(
-            size=lodging_1_bookings_number, lodging=lodging_1
+            size=lodging_1_bookings_number, lodging=lodging_1, consecutive=True
         )
         lodging_2_bookings = BookingFactory.create_batch(  # noqa
-            size=lodging_2_bookings_number, lodging=lodging_2
+            size=lodging_2_bookings_number, lodging=lodging_2, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -687,10 +689,10 @@ class TestQueryParamsFilteredList:
         lodging_2_bookings_number = 2
 
         lodging_1_bookings = BookingFactory.create_batch(
-            size=lodging_1_bookings_number, lodging=lodging_1
+            size=lodging_1_bookings_number, lodging=lodging_1, consecutive=True
         )
         lodging_2_bookings = BookingFactory.create_batch(  # noqa
-            size=lodging_2_bookings_number, lodging=lodging_2
+            size=lodging_2_bookings_number, lodging=lodging_2, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -726,13 +728,13 @@ class TestQueryParamsFilteredList:
         high_price_bookings_number = 1
 
         low_price_bookings = BookingFactory.create_batch(  # noqa
-            size=low_price_bookings_number, lodging=low_price_lodging
+            size=low_price_bookings_number, lodging=low_price_lodging, consecutive=True
         )
         medium_price_bookings = BookingFactory.create_batch(
-            size=medium_price_bookings_number, lodging=medium_price_lodging
+            size=medium_price_bookings_number, lodging=medium_price_lodging, consecutive=True
         )
         high_price_bookings = BookingFactory.create_batch(  # noqa
-            size=high_price_bookings_number, lodging=high_price_lodging
+            size=high_price_bookings_number, lodging=high_price_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -774,13 +776,13 @@ class TestQueryParamsFilteredList:
         high_price_bookings_number = 1
 
         low_price_bookings = BookingFactory.create_batch(
-            size=low_price_bookings_number, lodging=low_price_lodging
+            size=low_price_bookings_number, lodging=low_price_lodging, consecutive=True
         )
         medium_price_bookings = BookingFactory.create_batch(
-            size=medium_price_bookings_number, lodging=medium_price_lodging
+            size=medium_price_bookings_number, lodging=medium_price_lodging, consecutive=True
         )
         high_price_bookings = BookingFactory.create_batch(  # noqa
-            size=high_price_bookings_number, lodging=high_price_lodging
+            size=high_price_bookings_number, lodging=high_price_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
@@ -825,16 +827,16 @@ class TestQueryParamsFilteredList:
         highest_price_bookings_number = 2
 
         low_price_bookings = BookingFactory.create_batch(  # noqa
-            size=low_price_bookings_number, lodging=low_price_lodging
+            size=low_price_bookings_number, lodging=low_price_lodging, consecutive=True
         )
         medium_price_bookings = BookingFactory.create_batch(
-            size=medium_price_bookings_number, lodging=medium_price_lodging
+            size=medium_price_bookings_number, lodging=medium_price_lodging, consecutive=True
         )
         high_price_bookings = BookingFactory.create_batch(
-            size=high_price_bookings_number, lodging=high_price_lodging
+            size=high_price_bookings_number, lodging=high_price_lodging, consecutive=True
         )
         highest_price_bookings = BookingFactory.create_batch(  # noqa
-            size=highest_price_bookings_number, lodging=highest_price_lodging
+            size=highest_price_bookings_number, lodging=highest_price_lodging, consecutive=True
         )
 
         url = reverse("bookings-list")
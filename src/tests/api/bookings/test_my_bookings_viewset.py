@@ -131,10 +131,10 @@ class TestMyBookingViewSet:
         lodging_2 = LodgingFactory()
 
         bookings_for_lodging_1 = BookingFactory.create_batch(
-            size=bookings_number_1, user=user, lodging=lodging_1
+            size=bookings_number_1, user=user, lodging=lodging_1, consecutive=True
         )
         bookings_for_lodging_2 = BookingFactory.create_batch(
-            size=bookings_number_2, user=user, lodging=lodging_2
+            size=bookings_number_2, user=user, lodging=lodging_2, consecutive=True
         )
 
         url = reverse("my-bookings-list")
@@ -163,10 +163,17 @@ class TestMyBookingViewSet:
         lodging_1 = LodgingFactory()
         lodging_2 = LodgingFactory()
 
-        BookingFactory.create_batch(size=bookings_number_1, user=user, lodging=lodging_1)
-        BookingFactory.create_batch(size=bookings_number_2, user=user, lodging=lodging_2)
         BookingFactory.create_batch(
-            size=another_user_bookings_number, user=another_user, lodging=lodging_1
+            size=bookings_number_1, user=user, lodging=lodging_1, consecutive=True
+        )
+        BookingFactory.create_batch(
+            size=bookings_number_2, user=user, lodging=lodging_2, consecutive=True
+        )
+        BookingFactory.create_batch(
+            size=another_user_bookings_number,
+            user=another_user,
+            lodging=lodging_1,
+            consecutive=True,
         )
 
         url = reverse("my-bookings-list")
@@ -249,6 +256,33 @@ class TestMyBookingViewSet:
         booking.refresh_from_db()
         assert booking.payment_intent_id == payment_intent_id
 
+    def test_bulk_create_succeeds(self, user_api_client_pytest_fixture, user):
+        lodgings = LodgingFactory.create_batch(size=2)
+        date_from = timezone.now().date() + timezone.timedelta(days=1)
+        date_to = date_from + timezone.timedelta(days=2)
+        items = [
+            {"lodging_id": str(lodging.id), "date_from": str(date_from), "date_to": str(date_to)}
+            for lodging in lodgings + lodgings[:1]
+        ]
+
+        url = reverse("my-bookings-bulk-create")
+        response = user_api_client_pytest_fixture.post(url, {"items": items}, format="json")
+
+        assert response.status_code == HTTP_200_OK
+        results = response.data["results"]
+        assert [result["booking"]["lodging"]["id"] for result in results[:2]] == [
+            str(lodging.id) for lodging in lodgings
+        ]
+        assert results[2]["booking"] is None
+        assert results[2]["error"] == "This lodging is already booked for these dates"
+        assert Booking.objects.filter(user=user).count() == 2
+
+    def test_bulk_create_without_items_fails(self, user_api_client_pytest_fixture):
+        url = reverse("my-bookings-bulk-create")
+        response = user_api_client_pytest_fixture.post(url, {"items": []}, format="json")
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
     def test_pay_by_another_user_fails(self, user_api_client_pytest_fixture, user):
         booking = BookingFactory()
 
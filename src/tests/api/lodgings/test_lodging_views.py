@@ -14,6 +14,7 @@ from rest_framework.status import (
 )
 from rest_framework.test import APIClient
 
+from djlodging.api.lodging.projections import LODGING_DETAIL_PROJECTION
 from djlodging.application_services.exceptions import WrongOwnerError
 from djlodging.domain.lodgings.models.lodging import Lodging
 from djlodging.domain.lodgings.repositories import LodgingRepository
@@ -284,7 +285,7 @@ class TestLodgingViewSet:
 
         # Assert that the newly created lodging has no rating since it has not reviews yet
         annotated_lodging = LodgingRepository.retrieve_lodging_with_average_rating(
-            lodging_id=lodging.id
+            lodging_id=lodging.id, projection=LODGING_DETAIL_PROJECTION
         )
 
         assert annotated_lodging.average_rating is None
@@ -304,7 +305,7 @@ class TestLodgingViewSet:
 
         # Once again retrieve the lodging but this time it should have an 'average_rating'
         annotated_lodging = LodgingRepository.retrieve_lodging_with_average_rating(
-            lodging_id=lodging.id
+            lodging_id=lodging.id, projection=LODGING_DETAIL_PROJECTION
         )
 
         assert annotated_lodging.average_rating == round(average_rating, ndigits=1)
@@ -108,8 +108,10 @@ class TestMyReviewViewSet:
         correct_user = UserFactory()
         wrong_user = UserFactory()
         lodging = LodgingFactory()
-        correct_booking = BookingFactory(user=correct_user, lodging=lodging)  # noqa
-        wrong_booking = BookingFactory(user=wrong_user, lodging=lodging)
+        correct_booking = BookingFactory(  # noqa
+            user=correct_user, lodging=lodging, consecutive=True
+        )
+        wrong_booking = BookingFactory(user=wrong_user, lodging=lodging, consecutive=True)
         wrong_reference_code = wrong_booking.reference_code
 
         text = fake.paragraph()
@@ -0,0 +1,151 @@
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_403_FORBIDDEN,
+)
+from rest_framework.test import APIClient
+
+from djlodging.api.authentication import ClaimsTokenObtainPairSerializer, ClaimsUser
+from djlodging.domain.users import repository
+from djlodging.domain.users.models import User
+from djlodging.domain.users.repository import UserRepository
+from tests.domain.users.factories import UserFactory
+
+
+def get_api_client(user) -> APIClient:
+    client = APIClient()
+    refresh = ClaimsTokenObtainPairSerializer.get_token(user)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return client
+
+
+def count_user_queries(queries) -> int:
+    return sum('FROM "users_user"' in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+class TestClaimsJWTAuthentication:
+    @pytest.fixture(autouse=True)
+    def shared_cache(self, settings):
+        # The tests run in one process, so its cache is as good as a shared one
+        settings.USER_AUTH_VERSION_CACHE_ENABLED = True
+
+    def test_cached_auth_version_authorizes_without_user_query(self):
+        api_client = get_api_client(UserFactory(is_staff=True))
+        url = reverse("countries-list")
+
+        with CaptureQueriesContext(connection) as first_request:
+            assert api_client.get(url).status_code == HTTP_200_OK
+        with CaptureQueriesContext(connection) as second_request:
+            assert api_client.get(url).status_code == HTTP_200_OK
+
+        assert count_user_queries(first_request.captured_queries) == 1
+        assert count_user_queries(second_request.captured_queries) == 0
+
+    def test_changed_roles_are_checked_against_the_user(self, django_capture_on_commit_callbacks):
+        partner = UserFactory(is_partner=True)
+        api_client = get_api_client(partner)
+        url = reverse("lodgings-list")
+        assert api_client.post(url, {}).status_code == HTTP_400_BAD_REQUEST
+
+        with django_capture_on_commit_callbacks(execute=True):
+            UserRepository.update(UserRepository.get_by_id(partner.id), is_partner=False)
+
+        assert api_client.post(url, {}).status_code == HTTP_403_FORBIDDEN
+
+    def test_deactivated_user_is_rejected(self, django_capture_on_commit_callbacks):
+        user = UserFactory()
+        api_client = get_api_client(user)
+        url = reverse("my-bookings-list")
+        assert api_client.get(url).status_code == HTTP_200_OK
+
+        with django_capture_on_commit_callbacks(execute=True):
+            UserRepository.update(UserRepository.get_by_id(user.id), is_active=False)
+
+        assert api_client.get(url).status_code == HTTP_401_UNAUTHORIZED
+
+    def test_roles_changed_by_queryset_update_are_checked_against_the_user(
+        self, django_capture_on_commit_callbacks
+    ):
+        partner = UserFactory(is_partner=True)
+        api_client = get_api_client(partner)
+        url = reverse("lodgings-list")
+        assert api_client.post(url, {}).status_code == HTTP_400_BAD_REQUEST
+
+        with django_capture_on_commit_callbacks(execute=True):
+            User.objects.filter(id=partner.id).update(is_partner=False)
+
+        assert UserRepository.get_by_id(partner.id).auth_version == partner.auth_version + 1
+        assert api_client.post(url, {}).status_code == HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestClaimsJWTAuthenticationWithoutSharedCache:
+    def test_roles_changed_by_another_process_are_not_trusted(
+        self, settings, mocker, django_capture_on_commit_callbacks
+    ):
+        settings.USER_AUTH_VERSION_CACHE_ENABLED = False
+        this_process_cache = LocMemCache("this-process", {})
+        other_process_cache = LocMemCache("other-process", {})
+        partner = UserFactory(is_partner=True)
+        api_client = get_api_client(partner)
+        url = reverse("lodgings-list")
+
+        mocker.patch.object(repository, "cache", this_process_cache)
+        assert api_client.post(url, {}).status_code == HTTP_400_BAD_REQUEST
+
+        mocker.patch.object(repository, "cache", other_process_cache)
+        with django_capture_on_commit_callbacks(execute=True):
+            UserRepository.update(UserRepository.get_by_id(partner.id), is_partner=False)
+
+        mocker.patch.object(repository, "cache", this_process_cache)
+        with CaptureQueriesContext(connection) as request:
+            assert api_client.post(url, {}).status_code == HTTP_403_FORBIDDEN
+        assert count_user_queries(request.captured_queries) == 1
+
+
+@pytest.mark.django_db
+class TestClaimsUser:
+    def test_roles_are_read_from_the_claims_and_the_user_is_loaded_lazily(
+        self, django_assert_num_queries
+    ):
+        user = UserFactory(is_partner=True)
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+
+        with django_assert_num_queries(0):
+            claims_user = ClaimsUser(token)
+            assert claims_user.pk == user.pk
+            assert claims_user.is_partner is True
+            assert claims_user.is_staff is False
+            assert claims_user == user
+
+        with django_assert_num_queries(1):
+            assert claims_user.email == user.email
+            assert isinstance(claims_user, type(user))
+
+    def test_auth_version_is_bumped_by_claimed_fields_only(self):
+        user = UserRepository.get_by_id(UserFactory().id)
+        auth_version = user.auth_version
+
+        UserRepository.update(user, first_name="New name")
+        assert user.auth_version == auth_version
+
+        UserRepository.update(user, is_partner=True)
+        assert user.auth_version == auth_version + 1
+        assert UserRepository.get_by_id(user.id).auth_version == auth_version + 1
+
+    def test_concurrent_changes_of_claimed_fields_get_distinct_versions(self):
+        user_id = UserFactory().id
+        user, same_user = UserRepository.get_by_id(user_id), UserRepository.get_by_id(user_id)
+        auth_version = user.auth_version
+
+        UserRepository.update(user, is_partner=True)
+        UserRepository.update(same_user, is_staff=True)
+
+        assert (user.auth_version, same_user.auth_version) == (auth_version + 1, auth_version + 2)
@@ -0,0 +1,144 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+
+from djlodging.api.pagination import CountStrategy, paginate_queryset
+from djlodging.domain.bookings.models import Booking
+from djlodging.domain.core.base_exceptions import DjLodgingValidationError
+from tests.domain.bookings.factories import BookingFactory
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+    def test_walk_forward_and_backward_succeeds(self, user_api_client_pytest_fixture, user):
+        bookings_number = 5
+        BookingFactory.create_batch(size=bookings_number, user=user)
+        expected_ids = [
+            str(booking_id)
+            for booking_id in Booking.objects.order_by("-created", "id").values_list(
+                "id", flat=True
+            )
+        ]
+        url = reverse("my-bookings-list")
+
+        response = user_api_client_pytest_fixture.get(url, {"cursor": "", "page_size": 2})
+
+        assert response.status_code == HTTP_200_OK
+        assert "count" not in response.data
+        assert response.data["previous"] is None
+        assert [item["id"] for item in response.data["results"]] == expected_ids[:2]
+
+        response = user_api_client_pytest_fixture.get(
+            url, {"cursor": response.data["next"], "page_size": 2}
+        )
+        assert [item["id"] for item in response.data["results"]] == expected_ids[2:4]
+
+        last_page = user_api_client_pytest_fixture.get(
+            url, {"cursor": response.data["next"], "page_size": 2}
+        )
+        assert [item["id"] for item in last_page.data["results"]] == expected_ids[4:]
+        assert last_page.data["next"] is None
+
+        response = user_api_client_pytest_fixture.get(
+            url, {"cursor": last_page.data["previous"], "page_size": 2}
+        )
+        assert [item["id"] for item in response.data["results"]] == expected_ids[2:4]
+
+        response = user_api_client_pytest_fixture.get(
+            url, {"cursor": response.data["previous"], "page_size": 2}
+        )
+        assert [item["id"] for item in response.data["results"]] == expected_ids[:2]
+        assert response.data["previous"] is None
+
+    def test_page_number_mode_is_the_default(self, user_api_client_pytest_fixture, user):
+        BookingFactory.create_batch(size=3, user=user)
+
+        url = reverse("my-bookings-list")
+        response = user_api_client_pytest_fixture.get(url, {"page_size": 2})
+
+        assert response.status_code == HTTP_200_OK
+        assert response.data["count"] == 3
+        assert "next" not in response.data
+
+    def test_invalid_cursor_fails(self, user_api_client_pytest_fixture):
+        url = reverse("my-bookings-list")
+        response = user_api_client_pytest_fixture.get(url, {"cursor": "not-a-cursor"})
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.data["message"] == "Invalid cursor."
+
+    def test_custom_ordering_with_cursor_fails(self):
+        with pytest.raises(DjLodgingValidationError):
+            paginate_queryset(Booking.objects.all(), {"cursor": "", "order_by": "date_from"})
+
+
+@pytest.mark.django_db
+class TestCountStrategies:
+    def test_exact_count_succeeds(self):
+        BookingFactory.create_batch(size=3)
+
+        response = paginate_queryset(Booking.objects.all(), {}, count_strategy=CountStrategy.EXACT)
+
+        assert response["count"] == 3
+        assert response["count_is_estimate"] is False
+
+    def test_cached_count_is_reused_until_expired(self):
+        BookingFactory.create_batch(size=2)
+        queryset = Booking.objects.all()
+
+        first_response = paginate_queryset(queryset, {}, count_strategy=CountStrategy.CACHED)
+        BookingFactory(consecutive=True)
+        second_response = paginate_queryset(queryset, {}, count_strategy=CountStrategy.CACHED)
+
+        assert first_response["count"] == 2
+        assert second_response["count"] == 2
+
+        cache.clear()
+        third_response = paginate_queryset(queryset, {}, count_strategy=CountStrategy.CACHED)
+        assert third_response["count"] == 3
+
+    def test_exact_count_from_cache_is_not_an_estimate(self):
+        BookingFactory.create_batch(size=2)
+        queryset = Booking.objects.all()
+        paginate_queryset(queryset, {}, count_strategy=CountStrategy.CACHED)
+
+        response = paginate_queryset(queryset, {}, count_strategy=CountStrategy.CACHED)
+
+        assert response["count"] == 2
+        assert response["count_is_estimate"] is False
+
+    def test_cached_count_is_kept_per_filter(self):
+        booking = BookingFactory()
+        BookingFactory()
+
+        filtered = paginate_queryset(
+            Booking.objects.filter(id=booking.id), {}, count_strategy=CountStrategy.CACHED
+        )
+        unfiltered = paginate_queryset(
+            Booking.objects.all(), {}, count_strategy=CountStrategy.CACHED
+        )
+
+        assert filtered["count"] == 1
+        assert unfiltered["count"] == 2
+
+    def test_estimated_count_of_small_list_is_exact(self):
+        BookingFactory.create_batch(size=3)
+
+        response = paginate_queryset(
+            Booking.objects.all(), {}, count_strategy=CountStrategy.ESTIMATE
+        )
+
+        assert response["count"] == 3
+        assert response["count_is_estimate"] is False
+
+    def test_estimated_count_of_large_list_comes_from_planner(self, settings):
+        settings.PAGINATION_ESTIMATED_COUNT_THRESHOLD = 0
+        BookingFactory.create_batch(size=3)
+
+        response = paginate_queryset(
+            Booking.objects.all(), {}, count_strategy=CountStrategy.ESTIMATE
+        )
+
+        assert isinstance(response["count"], int)
+        assert response["count_is_estimate"] is True
@@ -0,0 +1,136 @@
+from typing import Callable, Tuple
+
+import pytest
+from django.utils import timezone
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK
+from rest_framework.test import APIClient
+
+from djlodging.api.authentication import ClaimsTokenObtainPairSerializer
+from djlodging.api.middleware import QUERY_COUNT_HEADER
+from tests.domain.bookings.factories import BookingFactory
+from tests.domain.lodgings.factories import (
+    CityFactory,
+    CountryFactory,
+    LodgingFactory,
+    ReviewFactory,
+)
+from tests.domain.users.factories import UserFactory
+
+PAGE_SIZE = 5
+
+
+def get_api_client(user) -> APIClient:
+    client = APIClient()
+    refresh = ClaimsTokenObtainPairSerializer.get_token(user)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return client
+
+
+def bookings_list() -> Tuple[APIClient, str, dict, Callable]:
+    return (
+        get_api_client(UserFactory(is_staff=True)),
+        reverse("bookings-list"),
+        {},
+        lambda: BookingFactory(consecutive=True),
+    )
+
+
+def my_bookings_list() -> Tuple[APIClient, str, dict, Callable]:
+    user = UserFactory()
+    return (
+        get_api_client(user),
+        reverse("my-bookings-list"),
+        {},
+        lambda: BookingFactory(user=user, consecutive=True),
+    )
+
+
+def countries_list() -> Tuple[APIClient, str, dict, Callable]:
+    return (
+        get_api_client(UserFactory(is_staff=True)),
+        reverse("countries-list"),
+        {},
+        CountryFactory,
+    )
+
+
+def cities_list() -> Tuple[APIClient, str, dict, Callable]:
+    country = CountryFactory()
+    return (
+        get_api_client(UserFactory(is_staff=True)),
+        reverse("cities-list", args=[str(country.id)]),
+        {},
+        lambda: CityFactory(country=country),
+    )
+
+
+def lodgings_list() -> Tuple[APIClient, str, dict, Callable]:
+    city = CityFactory()
+    query_params = {
+        "country": city.country.name,
+        "city": city.name,
+        "date_from": timezone.now().date(),
+        "date_to": timezone.now().date() + timezone.timedelta(days=2),
+    }
+    return (
+        get_api_client(UserFactory()),
+        reverse("lodgings-list"),
+        query_params,
+        lambda: ReviewFactory(lodging=LodgingFactory(city=city)),
+    )
+
+
+def reviews_list() -> Tuple[APIClient, str, dict, Callable]:
+    lodging = LodgingFactory()
+    return (
+        get_api_client(UserFactory()),
+        reverse("reviews-list", args=[str(lodging.id)]),
+        {},
+        lambda: ReviewFactory(lodging=lodging),
+    )
+
+
+def my_reviews_list() -> Tuple[APIClient, str, dict, Callable]:
+    user = UserFactory()
+    return (
+        get_api_client(user),
+        reverse("my-reviews-list"),
+        {},
+        lambda: ReviewFactory(user=user),
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "list_endpoint",
+    [
+        bookings_list,
+        my_bookings_list,
+        countries_list,
+        cities_list,
+        lodgings_list,
+        reviews_list,
+        my_reviews_list,
+    ],
+)
+def test_list_queries_dont_grow_with_page(settings, list_endpoint):
+    """A full page costs as many queries as one item, within the GET budget of the endpoint."""
+    settings.DEBUG = True
+    # The lodging search itself is measured, not its cache
+    settings.LODGING_SEARCH_CACHE_MAX_NIGHTS = 0
+    client, url, query_params, add_item = list_endpoint()
+    query_params = {**query_params, "page_size": PAGE_SIZE}
+
+    add_item()
+    # Warms the per-process caches up, e.g. of the user's auth version
+    client.get(url, query_params)
+    one_item_response = client.get(url, query_params)
+    for _ in range(PAGE_SIZE - 1):
+        add_item()
+    full_page_response = client.get(url, query_params)
+
+    assert one_item_response.status_code == HTTP_200_OK
+    assert full_page_response.status_code == HTTP_200_OK
+    assert len(full_page_response.data["results"]) == PAGE_SIZE
+    assert full_page_response[QUERY_COUNT_HEADER] == one_item_response[QUERY_COUNT_HEADER]
@@ -0,0 +1,33 @@
+import pytest
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK
+
+from djlodging.api.middleware import QUERY_COUNT_HEADER, QUERY_TIME_HEADER
+from djlodging.infrastructure.query_metrics import QueryBudgetExceededError
+from tests.domain.bookings.factories import BookingFactory
+
+
+@pytest.mark.django_db
+class TestQueryMetricsMiddleware:
+    def test_debug_headers_succeed(self, settings, user_api_client_pytest_fixture, user):
+        settings.DEBUG = True
+        BookingFactory(user=user)
+
+        response = user_api_client_pytest_fixture.get(reverse("my-bookings-list"))
+
+        assert response.status_code == HTTP_200_OK
+        assert int(response[QUERY_COUNT_HEADER]) > 0
+        assert float(response[QUERY_TIME_HEADER]) >= 0
+
+    def test_no_debug_headers_without_debug_mode(self, settings, user_api_client_pytest_fixture):
+        settings.DEBUG = False
+
+        response = user_api_client_pytest_fixture.get(reverse("my-bookings-list"))
+
+        assert QUERY_COUNT_HEADER not in response
+
+    def test_exceeded_endpoint_budget_fails(self, settings, user_api_client_pytest_fixture):
+        settings.QUERY_BUDGETS = {"GET my-bookings-list": 1}
+
+        with pytest.raises(QueryBudgetExceededError):
+            user_api_client_pytest_fixture.get(reverse("my-bookings-list"))
@@ -0,0 +1,82 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Value
+from rest_framework import serializers
+
+from djlodging.api.bookings.serializers import BookingListOutputSerializer
+from djlodging.api.lodging.serializers import LodgingListOutputSerializer, ReviewOutputSerializer
+from djlodging.api.row_serializers import RowSerializer
+from djlodging.domain.bookings.models import Booking
+from djlodging.domain.core.projections import Projection
+from djlodging.domain.lodgings.models import Lodging, Review
+from tests.domain.bookings.factories import BookingFactory
+from tests.domain.lodgings.factories import LodgingFactory, ReviewFactory
+
+
+def render_both_ways(queryset, serializer_class):
+    projection = Projection(queryset.model, serializer_class)
+    queryset = queryset.order_by("id")
+    serializer_data = serializer_class(projection.apply(queryset), many=True).data
+    row_data = RowSerializer(serializer_class).to_representation(projection.values(queryset))
+    return [dict(item) for item in serializer_data], row_data
+
+
+@pytest.mark.django_db
+class TestRowSerializer:
+    def test_bookings_render_like_the_serializer(self):
+        BookingFactory.create_batch(size=2, consecutive=True)
+        BookingFactory(consecutive=True, lodging=None)
+
+        serializer_data, row_data = render_both_ways(
+            Booking.objects.all(), BookingListOutputSerializer
+        )
+
+        assert row_data == serializer_data
+        assert any(booking["lodging"] is None for booking in row_data)
+
+    def test_lodgings_render_like_the_serializer(self):
+        LodgingFactory.create_batch(size=2, average_rating=4.5)
+
+        serializer_data, row_data = render_both_ways(
+            Lodging.objects.annotate(available=Value(True)), LodgingListOutputSerializer
+        )
+
+        assert row_data == serializer_data
+        assert row_data[0]["available"] is True
+        assert row_data[0]["price"] == serializer_data[0]["price"]
+
+    def test_not_required_field_without_column_is_left_out(self):
+        LodgingFactory()
+
+        serializer_data, row_data = render_both_ways(
+            Lodging.objects.all(), LodgingListOutputSerializer
+        )
+
+        assert row_data == serializer_data
+        assert "available" not in row_data[0]
+
+    def test_reviews_render_like_the_serializer(self):
+        ReviewFactory.create_batch(size=2)
+        ReviewFactory(user=None)
+
+        serializer_data, row_data = render_both_ways(Review.objects.all(), ReviewOutputSerializer)
+
+        assert row_data == serializer_data
+
+    @pytest.mark.parametrize(
+        "field",
+        [
+            serializers.SerializerMethodField(required=False),
+            serializers.CharField(source="city.name", required=False),
+            serializers.DictField(source="*", required=False),
+        ],
+    )
+    def test_field_without_row_column_is_rejected(self, field):
+        serializer_class = type(
+            "NameSerializer",
+            (serializers.Serializer,),
+            {"name": serializers.CharField(), "extra": field, "get_extra": lambda self, obj: 1},
+        )
+
+        with pytest.raises(ImproperlyConfigured, match="NameSerializer.extra"):
+            RowSerializer(serializer_class).render
@@ -19,7 +19,9 @@ fake = Faker()
 
 @pytest.mark.django_db
 class TestEmailChangeRequestAPIView:
-    def test_request_email_change_succeeds(self, user_api_client_factory_boy, mocker):
+    def test_request_email_change_succeeds(
+        self, user_api_client_factory_boy, mocker, django_capture_on_commit_callbacks
+    ):
         old_email = fake.email()
         new_email = fake.email()
 
@@ -34,7 +36,8 @@ class TestEmailChangeRequestAPIView:
 
         payload = {"new_email": new_email}
         url = reverse("users:request-change-email")
-        response = user_api_client_factory_boy.post(url, payload)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = user_api_client_factory_boy.post(url, payload)
 
         assert response.status_code == HTTP_202_ACCEPTED
         mock.assert_called_once()
@@ -48,7 +48,7 @@ class TestPasswordChangeAPIView:
 
 @pytest.mark.django_db
 class TestSendForgotPasswordLinkAPIView:
-    def test_forgot_password_succeeds(self, mocker):
+    def test_forgot_password_succeeds(self, mocker, django_capture_on_commit_callbacks):
         api_client = APIClient()
         user = UserFactory()
 
@@ -59,7 +59,8 @@ class TestSendForgotPasswordLinkAPIView:
         payload = {"email": user.email}
 
         url = reverse("users:forgot-password")
-        response = api_client.post(url, payload)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(url, payload)
         assert response.status_code == HTTP_202_ACCEPTED
         mock.assert_called_once()
 
@@ -11,7 +11,7 @@ fake = Faker()
 
 @pytest.mark.django_db
 class TestUserSingUpAPIView:
-    def test_user_sign_up_succeeds(self, mocker):
+    def test_user_sign_up_succeeds(self, mocker, django_capture_on_commit_callbacks):
         api_client = APIClient()
         email = fake.email()
         password = fake.password()
@@ -23,7 +23,8 @@ class TestUserSingUpAPIView:
 
         url = reverse("users:sign-up")  # "/api/users/sign-up/"
         payload = {"email": email, "password": password}
-        response = api_client.post(url, payload)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(url, payload)
 
         assert response.status_code == HTTP_201_CREATED
         mock.assert_called_once()
@@ -1,11 +1,16 @@
 import pytest
 from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from faker import Faker
 
 from djlodging.application_services.bookings import BookingService
+from djlodging.application_services.exceptions import LodgingAlreadyBookedError
 from djlodging.domain.bookings.models import Booking
 from djlodging.domain.core.base_exceptions import DjLodgingValidationError
+from djlodging.infrastructure.providers.payments import payment_provider
+from djlodging.infrastructure.providers.payments.exceptions import PaymentProviderException
+from djlodging.infrastructure.query_metrics import collect_query_metrics
 from tests.domain.bookings.factories import BookingFactory
 from tests.domain.lodgings.factories import LodgingFactory
 from tests.domain.users.factories import UserFactory
@@ -92,6 +97,136 @@ class TestBookingService:
         booking = Booking.objects.first()
         assert booking is None
 
+    def test_create_booking_for_overlapping_dates_fails(self):
+        lodging = LodgingFactory()
+        date_from = timezone.now().date() + timezone.timedelta(days=2)
+        date_to = date_from + timezone.timedelta(days=2)
+        BookingFactory(lodging=lodging, date_from=date_from, date_to=date_to)
+
+        # The new stay fully contains the existing one
+        with pytest.raises(LodgingAlreadyBookedError):
+            BookingService.create(
+                lodging_id=lodging.id,
+                user=UserFactory(),
+                date_from=date_from - timezone.timedelta(days=1),
+                date_to=date_to + timezone.timedelta(days=1),
+            )
+
+        assert Booking.objects.count() == 1
+
+    def test_create_booking_starting_on_checkout_day_succeeds(self):
+        lodging = LodgingFactory()
+        date_from = timezone.now().date() + timezone.timedelta(days=1)
+        date_to = date_from + timezone.timedelta(days=2)
+        BookingFactory(lodging=lodging, date_from=date_from, date_to=date_to)
+
+        booking = BookingService.create(
+            lodging_id=lodging.id,
+            user=UserFactory(),
+            date_from=date_to,
+            date_to=date_to + timezone.timedelta(days=2),
+        )
+
+        assert booking.date_from == date_to
+        assert Booking.objects.count() == 2
+
+    def test_create_booking_for_dates_of_canceled_booking_succeeds(self):
+        lodging = LodgingFactory()
+        date_from = timezone.now().date() + timezone.timedelta(days=1)
+        date_to = date_from + timezone.timedelta(days=2)
+        BookingFactory(
+            lodging=lodging, date_from=date_from, date_to=date_to, status=Booking.Status.CANCELED
+        )
+
+        booking = BookingService.create(
+            lodging_id=lodging.id, user=UserFactory(), date_from=date_from, date_to=date_to
+        )
+
+        assert booking.status == Booking.Status.PAYMENT_PENDING
+
+    def test_database_rejects_overlapping_bookings(self):
+        lodging = LodgingFactory()
+        date_from = timezone.now().date() + timezone.timedelta(days=1)
+        date_to = date_from + timezone.timedelta(days=3)
+        BookingFactory(lodging=lodging, date_from=date_from, date_to=date_to)
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            BookingFactory(
+                lodging=lodging,
+                date_from=date_from + timezone.timedelta(days=1),
+                date_to=date_to + timezone.timedelta(days=1),
+            )
+
+        assert Booking.objects.count() == 1
+
+    def test_create_booking_with_taken_reference_code_fails(self, mocker):
+        # Only the overlapping stays are reported as an already booked lodging
+        reference_code = BookingFactory().reference_code
+        mocker.patch(
+            "djlodging.domain.bookings.models.get_next_reference_codes",
+            return_value=[reference_code],
+        )
+        date_from = timezone.now().date() + timezone.timedelta(days=1)
+
+        with pytest.raises(IntegrityError):
+            BookingService.create(
+                lodging_id=LodgingFactory().id,
+                user=UserFactory(),
+                date_from=date_from,
+                date_to=date_from + timezone.timedelta(days=2),
+            )
+
+    def test_bulk_create_reports_result_per_item(self):
+        lodging = LodgingFactory()
+        other_lodging = LodgingFactory()
+        user = UserFactory()
+        date_from = timezone.now().date() + timezone.timedelta(days=1)
+        date_to = date_from + timezone.timedelta(days=2)
+        BookingFactory(lodging=other_lodging, date_from=date_from, date_to=date_to)
+        items = [
+            {"lodging_id": lodging.id, "date_from": date_from, "date_to": date_to},
+            # Overlaps the existing booking
+            {"lodging_id": other_lodging.id, "date_from": date_from, "date_to": date_to},
+            # Overlaps the first item
+            {"lodging_id": lodging.id, "date_from": date_from, "date_to": date_to},
+            {"lodging_id": lodging.id, "date_from": date_to, "date_to": date_from},
+            {"lodging_id": fake.uuid4(cast_to=None), "date_from": date_from, "date_to": date_to},
+        ]
+
+        results = BookingService.bulk_create(user=user, items=items)
+
+        assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+        assert results[0]["error"] is None
+        assert results[0]["booking"] == Booking.objects.get(user=user)
+        assert [result["booking"] for result in results[1:]] == [None] * 4
+        assert results[1]["error"] == LodgingAlreadyBookedError().message
+        assert results[2]["error"] == LodgingAlreadyBookedError().message
+        assert results[3]["error"] == "Date_to must be greater than date_from"
+        assert results[4]["error"] == "Lodging not found."
+        assert results[0]["booking"].booked_days.count() == 2
+
+    def test_bulk_create_checks_availability_in_constant_queries(self):
+        user = UserFactory()
+        lodgings = LodgingFactory.create_batch(size=5)
+        date_from = timezone.now().date() + timezone.timedelta(days=1)
+        items = [
+            {
+                "lodging_id": lodging.id,
+                "date_from": date_from,
+                "date_to": date_from + timezone.timedelta(days=3),
+            }
+            for lodging in lodgings
+        ]
+
+        with collect_query_metrics() as metrics:
+            results = BookingService.bulk_create(user=user, items=items)
+
+        assert all(result["error"] is None for result in results)
+        assert Booking.objects.filter(user=user).count() == 5
+        # Lodgings, booked days, reference codes, insert of bookings and of booked days,
+        # lodging locations and the savepoint queries.
+        assert metrics.count == 8
+
     def test_pay_succeeds(self, mocker):
         user = UserFactory()
         booking = BookingFactory(user=user)
@@ -118,6 +253,130 @@ class TestBookingService:
         # NOTE:
         # We can't test for booking.status == Booking.Status.PAID as that requires a webhook event.
 
+    def test_pay_retry_reuses_the_cached_payment_intent(self, mocker):
+        user = UserFactory()
+        booking = BookingFactory(user=user)
+        booking.lodging.refresh_from_db()
+        mock_create_payment = mocker.patch(
+            "djlodging.application_services.payments.PaymentService.create_payment"
+        )
+        mock_create_payment.return_value.id = "pi_1"
+        mock_create_payment.return_value.client_secret = "secret_1"
+        mock_get_payment_intent = mocker.patch.object(payment_provider, "get_payment_intent")
+
+        client_secrets = [BookingService.pay(actor=user, booking_id=booking.id) for _ in range(3)]
+
+        assert client_secrets == ["secret_1"] * 3
+        mock_create_payment.assert_called_once()
+        assert mock_create_payment.call_args.kwargs["idempotency_key"] == (
+            f"booking-payment:{booking.id}:none:{booking.lodging.price}:usd:automatic"
+        )
+        mock_get_payment_intent.assert_not_called()
+
+    def test_pay_reuses_a_payable_payment_intent_after_one_lookup(self, mocker):
+        user = UserFactory()
+        booking = BookingFactory(user=user, payment_intent_id="pi_1")
+        booking.lodging.refresh_from_db()
+        mock_create_payment = mocker.patch(
+            "djlodging.application_services.payments.PaymentService.create_payment"
+        )
+        mock_get_payment_intent = mocker.patch.object(
+            payment_provider,
+            "get_payment_intent",
+            return_value=mocker.Mock(
+                id="pi_1",
+                client_secret="secret_1",
+                status="requires_payment_method",
+                amount=int(booking.lodging.price * 100),
+                currency="usd",
+                capture_method="automatic",
+            ),
+        )
+
+        assert BookingService.pay(actor=user, booking_id=booking.id) == "secret_1"
+        assert BookingService.pay(actor=user, booking_id=booking.id) == "secret_1"
+
+        mock_get_payment_intent.assert_called_once_with("pi_1")
+        mock_create_payment.assert_not_called()
+
+    def test_pay_replaces_a_payment_intent_for_another_amount(self, mocker):
+        user = UserFactory()
+        booking = BookingFactory(user=user, payment_intent_id="pi_1")
+        booking.lodging.refresh_from_db()
+        mock_create_payment = mocker.patch(
+            "djlodging.application_services.payments.PaymentService.create_payment"
+        )
+        mock_create_payment.return_value.id = "pi_2"
+        mock_create_payment.return_value.client_secret = "secret_2"
+        mocker.patch.object(
+            payment_provider,
+            "get_payment_intent",
+            return_value=mocker.Mock(
+                status="requires_payment_method",
+                amount=int(booking.lodging.price * 100) + 1,
+                currency="usd",
+                capture_method="automatic",
+            ),
+        )
+        mock_cancel_payment_intent = mocker.patch.object(payment_provider, "cancel_payment_intent")
+
+        assert BookingService.pay(actor=user, booking_id=booking.id) == "secret_2"
+
+        mock_cancel_payment_intent.assert_called_once_with("pi_1")
+        assert mock_create_payment.call_args.kwargs["idempotency_key"].startswith(
+            f"booking-payment:{booking.id}:pi_1:"
+        )
+        booking.refresh_from_db()
+        assert booking.payment_intent_id == "pi_2"
+
+    def test_pay_replaces_a_payment_intent_unknown_to_provider(self, mocker):
+        user = UserFactory()
+        booking = BookingFactory(user=user, payment_intent_id="pi_1")
+        mock_create_payment = mocker.patch(
+            "djlodging.application_services.payments.PaymentService.create_payment"
+        )
+        mock_create_payment.return_value.id = "pi_2"
+        mock_create_payment.return_value.client_secret = "secret_2"
+        mocker.patch.object(
+            payment_provider,
+            "get_payment_intent",
+            side_effect=PaymentProviderException("No such payment_intent: 'pi_1'"),
+        )
+        mocker.patch.object(payment_provider, "cancel_payment_intent")
+
+        assert BookingService.pay(actor=user, booking_id=booking.id) == "secret_2"
+
+    def test_pay_fails_if_previous_payment_intent_cannot_be_canceled(self, mocker):
+        user = UserFactory()
+        booking = BookingFactory(user=user, payment_intent_id="pi_1")
+        mock_create_payment = mocker.patch(
+            "djlodging.application_services.payments.PaymentService.create_payment"
+        )
+        mocker.patch.object(
+            payment_provider, "get_payment_intent", return_value=mocker.Mock(status="succeeded")
+        )
+        mocker.patch.object(
+            payment_provider,
+            "cancel_payment_intent",
+            side_effect=PaymentProviderException("This PaymentIntent has succeeded."),
+        )
+
+        with pytest.raises(PaymentProviderException):
+            BookingService.pay(actor=user, booking_id=booking.id)
+
+        mock_create_payment.assert_not_called()
+        booking.refresh_from_db()
+        assert booking.payment_intent_id == "pi_1"
+
+    def test_pay_for_paid_booking_fails(self):
+        user = UserFactory()
+        booking = BookingFactory(user=user, status=Booking.Status.PAID)
+
+        with pytest.raises(DjLodgingValidationError) as exc:
+            BookingService.pay(actor=user, booking_id=booking.id)
+
+        assert str(exc.value) == "This booking cannot be paid!"
+
     def test_cancel_succeeds(self, mocker):
         user = UserFactory()
         booking = BookingFactory(user=user, status=Booking.Status.PAID)
@@ -0,0 +1,206 @@
+from functools import partial
+
+import pytest
+import requests
+from django.utils import timezone
+
+from djlodging.application_services.bookings import BookingService
+from djlodging.application_services.email import EmailService
+from djlodging.domain.emails.models import PendingEmail
+from djlodging.domain.emails.repository import PendingEmailRepository
+from djlodging.infrastructure.providers.email import email_provider
+from tests.domain.bookings.factories import BookingFactory
+
+
+@pytest.mark.django_db
+class TestEmailService:
+    def test_email_is_queued_when_batching_is_enabled(self, mocker):
+        mock_send_batch = mocker.patch.object(email_provider, "send_batch")
+
+        EmailService.send_confirmation_link(email="user@example.com", security_token="token")
+
+        mock_send_batch.assert_not_called()
+        pending_email = PendingEmail.objects.get()
+        assert pending_email.template_id == email_provider.confirmation_link_template_id
+        assert pending_email.personalization["to"] == [{"email": "user@example.com"}]
+
+    def test_email_is_sent_at_once_when_batching_is_disabled(self, settings, mocker):
+        settings.EMAIL_BATCHING_ENABLED = False
+        mock_send_batch = mocker.patch.object(email_provider, "send_batch")
+
+        EmailService.send_confirmation_link(email="user@example.com", security_token="token")
+
+        mock_send_batch.assert_called_once()
+        assert not PendingEmail.objects.exists()
+
+    def test_booking_emails_are_queued_after_commit(
+        self, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        booking = BookingFactory()
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            BookingService.confirm({"booking_id": str(booking.id)})
+        (send_emails,) = [
+            callback
+            for callback in callbacks
+            if getattr(callback, "args", None) == (str(booking.id),)
+        ]
+        # One SELECT and the two INSERTs within a savepoint
+        with django_assert_num_queries(5):
+            send_emails()
+
+        assert set(PendingEmail.objects.values_list("template_id", flat=True)) == {
+            email_provider.booking_confirmation_email_for_user_template_id,
+            email_provider.booking_confirmation_email_for_owner_template_id,
+        }
+
+    @pytest.mark.parametrize(
+        "batching_enabled, task_names",
+        [
+            (True, ["send_booking_confirmation_emails_task"]),
+            # A retried task must not send the email of the other recipient again
+            (
+                False,
+                [
+                    "send_booking_confirmation_email_to_user_task",
+                    "send_booking_confirmation_email_to_owner_task",
+                ],
+            ),
+        ],
+    )
+    def test_booking_emails_are_enqueued(
+        self, settings, mocker, django_capture_on_commit_callbacks, batching_enabled, task_names
+    ):
+        settings.EMAIL_BATCHING_ENABLED = batching_enabled
+        mock_tasks = {
+            task_name: mocker.patch(f"djlodging.application_services.bookings.{task_name}")
+            for task_name in [
+                "send_booking_confirmation_emails_task",
+                "send_booking_confirmation_email_to_user_task",
+                "send_booking_confirmation_email_to_owner_task",
+            ]
+        }
+        booking = BookingFactory()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            BookingService.confirm({"booking_id": str(booking.id)})
+
+        for task_name, mock_task in mock_tasks.items():
+            if task_name in task_names:
+                mock_task.delay.assert_called_once_with(str(booking.id))
+            else:
+                mock_task.delay.assert_not_called()
+
+    def test_booking_emails_are_rendered_from_one_query(
+        self, settings, mocker, django_assert_num_queries
+    ):
+        settings.EMAIL_BATCHING_ENABLED = False
+        mock_send_batch = mocker.patch.object(email_provider, "send_batch")
+        booking = BookingFactory()
+
+        # One SELECT, the others are the savepoint of the atomic block
+        with django_assert_num_queries(3):
+            EmailService.send_booking_confirmation_emails(str(booking.id))
+        with django_assert_num_queries(3):
+            EmailService.send_booking_cancellation_emails(str(booking.id))
+
+        recipients = [
+            call.kwargs["personalizations"][0]["to"][0]["email"]
+            for call in mock_send_batch.call_args_list
+        ]
+        assert recipients == [booking.user.email, booking.lodging.owner.email] * 2
+        owner_data = mock_send_batch.call_args_list[1].kwargs["personalizations"][0][
+            "dynamic_template_data"
+        ]
+        assert owner_data["city"] == booking.lodging.city.name
+        assert owner_data["username"] == booking.user.username
+
+    def test_send_pending_emails_coalesces_emails_by_template(self, mocker):
+        mocker.patch.object(type(email_provider), "MAX_BATCH_SIZE", 2)
+        mock_send_batch = mocker.patch.object(email_provider, "send_batch")
+        for number in range(3):
+            EmailService.send_confirmation_link(
+                email=f"user{number}@example.com", security_token="1"
+            )
+        EmailService.send_change_email_link(new_email="user@example.com", token="1")
+
+        sent = EmailService.send_pending_emails()
+
+        assert sent == 4
+        assert not PendingEmail.objects.exists()
+        batch_sizes = sorted(
+            (call.kwargs["template_id"], len(call.kwargs["personalizations"]))
+            for call in mock_send_batch.call_args_list
+        )
+        assert batch_sizes == sorted(
+            [
+                (email_provider.confirmation_link_template_id, 2),
+                (email_provider.confirmation_link_template_id, 1),
+                (email_provider.change_email_link_template_id, 1),
+            ]
+        )
+
+    def test_failed_emails_are_retried_with_backoff(self, settings, mocker, caplog):
+        mocker.patch.object(email_provider, "send_batch", side_effect=requests.ConnectionError)
+        EmailService.send_confirmation_link(email="user@example.com", security_token="token")
+
+        assert EmailService.send_pending_emails() == 0
+
+        pending_email = PendingEmail.objects.get()
+        assert pending_email.attempts == 1
+        assert pending_email.next_attempt_at > timezone.now()
+        # Not due yet, so it's not sent again on the next run
+        assert EmailService.send_pending_emails() == 0
+        assert PendingEmail.objects.get().attempts == 1
+
+        PendingEmail.objects.update(
+            attempts=settings.EMAIL_MAX_ATTEMPTS - 1, next_attempt_at=timezone.now()
+        )
+        assert EmailService.send_pending_emails() == 0
+        # The last attempt failed as well
+        assert not PendingEmail.objects.exists()
+        assert "Dropped email" in caplog.text
+
+    def test_only_rejected_email_of_batch_is_dropped(self, mocker, caplog):
+        mocker.patch.object(type(email_provider), "MAX_BATCH_SIZE", 10)
+        sent_emails = []
+
+        def send_batch(template_id, personalizations):
+            emails = [personalization["to"][0]["email"] for personalization in personalizations]
+            if "invalid@example" in emails:
+                raise ValueError("400 Bad Request")
+            sent_emails.extend(emails)
+
+        mocker.patch.object(email_provider, "send_batch", side_effect=send_batch)
+        for number in range(4):
+            EmailService.send_confirmation_link(
+                email=f"user{number}@example.com", security_token="1"
+            )
+        EmailService.send_confirmation_link(email="invalid@example", security_token="1")
+
+        assert EmailService.send_pending_emails() == 4
+
+        assert sorted(sent_emails) == [f"user{number}@example.com" for number in range(4)]
+        assert not PendingEmail.objects.exists()
+        assert "it was rejected" in caplog.text
+
+    def test_claimed_emails_are_leased_until_dropped(self, settings, caplog):
+        EmailService.send_confirmation_link(email="user@example.com", security_token="token")
+        claim = partial(
+            PendingEmailRepository.claim_due_by_template,
+            limit=10,
+            max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+            lease_in_seconds=60,
+        )
+        # A run that dies after claiming the email
+        assert len(claim()[email_provider.confirmation_link_template_id]) == 1
+
+        assert claim() == {}
+        assert PendingEmail.objects.get().attempts == 1
+
+        PendingEmail.objects.update(
+            attempts=settings.EMAIL_MAX_ATTEMPTS, next_attempt_at=timezone.now()
+        )
+        assert EmailService.send_pending_emails() == 0
+        assert not PendingEmail.objects.exists()
+        assert "Dropped email" in caplog.text
@@ -0,0 +1,41 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from djlodging.application_services.expiry import ExpiryService
+from djlodging.domain.bookings.models import Booking
+from djlodging.infrastructure.jobs.celery_tasks import expire_due_objects
+from tests.domain.bookings.factories import BookingFactory
+from tests.domain.users.factories import UserFactory
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestExpiryService:
+    def test_expire_due_deletes_due_bookings_and_users(self):
+        expired = timezone.now() - timezone.timedelta(seconds=1)
+        BookingFactory.create_batch(size=2, consecutive=True, payment_expiration_time=expired)
+        pending_booking = BookingFactory(consecutive=True)
+        UserFactory(is_active=False, security_token_expiration_time=expired)
+        not_due_user = UserFactory(
+            is_active=False,
+            security_token_expiration_time=timezone.now() + timezone.timedelta(hours=1),
+        )
+
+        metrics = ExpiryService.expire_due()
+
+        assert metrics["expired_unpaid_bookings"]["deleted"] == 2
+        assert metrics["unfinished_registrations"]["deleted"] == 1
+        assert list(Booking.objects.values_list("id", flat=True)) == [pending_booking.id]
+        assert User.objects.filter(id=not_due_user.id).exists()
+
+    def test_expire_due_respects_the_shared_time_budget(self, settings):
+        settings.EXPIRY_SWEEP_TIME_BUDGET_IN_SECONDS = 0
+        BookingFactory(payment_expiration_time=timezone.now() - timezone.timedelta(seconds=1))
+
+        metrics = expire_due_objects()
+
+        assert metrics["expired_unpaid_bookings"]["is_complete"] is False
+        assert metrics["unfinished_registrations"]["is_complete"] is False
+        assert Booking.objects.count() == 1
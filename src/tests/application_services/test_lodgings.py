@@ -1,9 +1,13 @@
 import pytest
 from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
 from faker import Faker
 
-from djlodging.application_services.lodgings import CityService
-from tests.domain.lodgings.factories import CountryFactory
+from djlodging.application_services.lodgings import CityService, ReviewService
+from djlodging.domain.lodgings.models import Lodging
+from djlodging.domain.lodgings.models.review import Review
+from tests.domain.bookings.factories import BookingFactory
+from tests.domain.lodgings.factories import CountryFactory, LodgingFactory, ReviewFactory
 from tests.domain.users.factories import UserFactory
 
 fake = Faker()
@@ -30,3 +34,79 @@ class TestCityService:
         name = fake.name()
         with pytest.raises(PermissionDenied):
             CityService.create(actor=actor, country_id=country.id, name=name)
+
+
+@pytest.mark.django_db
+class TestReviewService:
+    def _create_review(self, lodging, score):
+        booking = BookingFactory(lodging=lodging, consecutive=True)
+        return ReviewService.create(
+            lodging_id=lodging.id,
+            user=booking.user,
+            reference_code=booking.reference_code,
+            text=fake.paragraph(),
+            score=score,
+        )
+
+    def test_create_updates_lodging_rating(self):
+        lodging = LodgingFactory()
+
+        self._create_review(lodging, score=7)
+        self._create_review(lodging, score=8)
+
+        lodging.refresh_from_db()
+        assert lodging.review_count == 2
+        assert lodging.review_score_sum == 15
+        assert lodging.average_rating == 7.5
+
+    def test_update_score_updates_lodging_rating(self):
+        lodging = LodgingFactory()
+        review = self._create_review(lodging, score=4)
+        self._create_review(lodging, score=5)
+
+        ReviewService.update(actor=review.user, review_id=review.id, score=9)
+
+        lodging.refresh_from_db()
+        assert lodging.review_count == 2
+        assert lodging.review_score_sum == 14
+        assert lodging.average_rating == 7.0
+
+    def test_delete_updates_lodging_rating(self):
+        lodging = LodgingFactory()
+        review = self._create_review(lodging, score=6)
+
+        ReviewService.delete(actor=review.user, review_id=review.id)
+
+        lodging.refresh_from_db()
+        assert lodging.review_count == 0
+        assert lodging.review_score_sum == 0
+        assert lodging.average_rating is None
+
+    def test_review_written_outside_service_updates_lodging_rating(self):
+        lodging = LodgingFactory()
+        review = ReviewFactory(lodging=lodging, score=2)
+        ReviewFactory(lodging=lodging, score=6)
+
+        review.score = 4
+        review.save()
+        Review.objects.filter(lodging=lodging, score=6).delete()
+
+        lodging.refresh_from_db()
+        assert (lodging.review_count, lodging.review_score_sum) == (1, 4)
+        assert lodging.average_rating == 4.0
+
+    def test_reconcile_lodging_ratings_command_succeeds(self):
+        lodging = LodgingFactory()
+        ReviewFactory(lodging=lodging, score=3)
+        ReviewFactory(lodging=lodging, score=4)
+        not_reviewed_lodging = LodgingFactory()
+        Lodging.objects.update(review_count=10, review_score_sum=10, average_rating=1)
+
+        call_command("reconcile_lodging_ratings")
+
+        lodging.refresh_from_db()
+        not_reviewed_lodging.refresh_from_db()
+        assert (lodging.review_count, lodging.review_score_sum) == (2, 7)
+        assert lodging.average_rating == 3.5
+        assert (not_reviewed_lodging.review_count, not_reviewed_lodging.review_score_sum) == (0, 0)
+        assert not_reviewed_lodging.average_rating is None
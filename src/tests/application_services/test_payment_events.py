@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from djlodging.application_services.bookings import BookingService
+from djlodging.application_services.payment_events import PaymentEventService
+from djlodging.domain.bookings.models import Booking, PaymentEvent
+from djlodging.domain.emails.models import PendingEmail
+from djlodging.infrastructure.providers.payments import payment_provider
+from djlodging.infrastructure.providers.payments.stripe_payment_provider import confirm_payment
+from tests.domain.bookings.factories import BookingFactory
+
+
+def make_event(event_id, booking, minutes_ago=0):
+    return SimpleNamespace(
+        id=event_id,
+        type="payment_intent.succeeded",
+        data={"object": {"id": "pi_1", "metadata": {"booking_id": str(booking.id)}}},
+        created=timezone.now() - timezone.timedelta(minutes=minutes_ago),
+    )
+
+
+@pytest.mark.django_db
+class TestPaymentEventService:
+    def test_webhook_event_is_stored_once_and_processed_after_commit(
+        self, django_capture_on_commit_callbacks
+    ):
+        booking = BookingFactory()
+        event = make_event("evt_1", booking)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            confirm_payment(event)
+            confirm_payment(event)
+
+        payment_event = PaymentEvent.objects.get()
+        assert payment_event.processed_at is not None
+        booking.refresh_from_db()
+        assert booking.status == Booking.Status.PAID
+
+    def test_confirming_a_paid_booking_again_sends_no_emails(
+        self, django_capture_on_commit_callbacks
+    ):
+        booking = BookingFactory()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            BookingService.confirm({"booking_id": str(booking.id)})
+            BookingService.confirm({"booking_id": str(booking.id)})
+
+        assert PendingEmail.objects.count() == 2
+
+    def test_failed_event_holds_back_later_events_of_its_booking(self, settings, mocker):
+        booking = BookingFactory()
+        other_booking = BookingFactory(consecutive=True)
+        for event in (
+            make_event("evt_1", booking, minutes_ago=2),
+            make_event("evt_2", booking, minutes_ago=1),
+            make_event("evt_3", other_booking),
+        ):
+            PaymentEventService.receive(event.id, event.type, event.data["object"], event.created)
+
+        def fail_for_first_booking(metadata):
+            if metadata["booking_id"] == str(booking.id):
+                raise ValueError("Boom")
+
+        mock_confirm = mocker.patch.object(
+            BookingService, "confirm", side_effect=fail_for_first_booking
+        )
+
+        assert PaymentEventService.process_pending() == 1
+
+        assert mock_confirm.call_count == 2
+        pending = PaymentEvent.objects.filter(processed_at__isnull=True).order_by("event_created")
+        assert [event.event_id for event in pending] == ["evt_1", "evt_2"]
+        assert pending[0].attempts == 1
+        assert pending[0].last_error == "ValueError('Boom')"
+
+        PaymentEvent.objects.filter(event_id="evt_1").update(
+            attempts=settings.PAYMENT_EVENT_MAX_ATTEMPTS
+        )
+        mock_confirm.side_effect = None
+        # The event that ran out of attempts no longer holds back the later one
+        assert PaymentEventService.process_pending() == 1
+        assert PaymentEvent.objects.get(event_id="evt_2").processed_at is not None
+
+    def test_replay_command_backfills_only_new_events(self, mocker):
+        booking = BookingFactory()
+        stored_event = make_event("evt_1", booking, minutes_ago=1)
+        PaymentEventService.receive(
+            stored_event.id, stored_event.type, stored_event.data["object"], stored_event.created
+        )
+        missed_event = make_event("evt_2", booking)
+        mocker.patch.object(
+            payment_provider,
+            "list_events",
+            return_value=[
+                {
+                    "id": event.id,
+                    "type": event.type,
+                    "object": event.data["object"],
+                    "created": event.created,
+                }
+                for event in (stored_event, missed_event)
+            ],
+        )
+
+        call_command("replay_payment_events", since="2023-01-01T00:00:00Z")
+
+        assert PaymentEvent.objects.count() == 2
+        assert not PaymentEvent.objects.filter(processed_at__isnull=True).exists()
+        booking.refresh_from_db()
+        assert booking.status == Booking.Status.PAID
@@ -106,14 +106,15 @@ class TestUserService:
         assert user.check_password(old_password) is False
 
     @staticmethod
-    def test_send_forgot_password_link_succeeds(mocker):
+    def test_send_forgot_password_link_succeeds(mocker, django_capture_on_commit_callbacks):
         user = UserFactory()
         security_token = user.security_token
 
         mock = mocker.patch(
             "djlodging.application_services.email.EmailService.send_change_password_link",
         )
-        UserService.send_forgot_password_link(email=user.email)
+        with django_capture_on_commit_callbacks(execute=True):
+            UserService.send_forgot_password_link(email=user.email)
         mock.assert_called_once()
 
         user.refresh_from_db()
@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from factory import SubFactory
+from factory import LazyAttribute, Sequence, SubFactory, Trait
 from factory.django import DjangoModelFactory
 from faker import Faker as Fake
 
@@ -24,3 +24,10 @@ class BookingFactory(DjangoModelFactory):
 
     class Meta:
         model = Booking
+
+    class Params:
+        # Back-to-back weekly stays, so that several active bookings of one lodging don't overlap.
+        consecutive = Trait(
+            date_from=Sequence(lambda n: timezone.now().date() + timezone.timedelta(weeks=n)),
+            date_to=LazyAttribute(lambda booking: booking.date_from + timezone.timedelta(days=6)),
+        )
@@ -0,0 +1,67 @@
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from djlodging.domain.bookings.models import BookedDay, Booking
+from djlodging.domain.bookings.repository import BookedDayRepository, BookingRepository
+from tests.domain.bookings.factories import BookingFactory
+
+
+@pytest.mark.django_db
+class TestBookedDayRepository:
+    def test_booked_days_are_created_for_new_booking(self):
+        date_from = timezone.now().date()
+        date_to = date_from + timezone.timedelta(days=3)
+
+        booking = BookingFactory(date_from=date_from, date_to=date_to)
+
+        booked_days = BookedDay.objects.filter(booking=booking).order_by("day")
+        assert [booked_day.day for booked_day in booked_days] == [
+            date_from + timezone.timedelta(days=night) for night in range(3)
+        ]
+        assert all(booked_day.lodging_id == booking.lodging_id for booked_day in booked_days)
+
+    def test_booked_days_follow_changed_dates(self):
+        booking = BookingFactory()
+        booking.date_from = booking.date_to
+        booking.date_to = booking.date_to + timezone.timedelta(days=1)
+        BookingRepository.save(booking)
+
+        assert list(BookedDay.objects.filter(booking=booking).values_list("day", flat=True)) == [
+            booking.date_from
+        ]
+
+    def test_booked_days_are_removed_for_canceled_booking(self):
+        booking = BookingFactory(status=Booking.Status.PAID)
+        assert BookedDay.objects.filter(booking=booking).exists()
+
+        BookingRepository.change_status(booking, new_status=Booking.Status.CANCELED)
+
+        assert not BookedDay.objects.filter(booking=booking).exists()
+
+    def test_booked_days_are_removed_with_booking(self):
+        booking = BookingFactory()
+
+        BookingRepository.delete_by_id(booking.id)
+
+        assert not BookedDay.objects.exists()
+
+    def test_get_list_between_dates_excludes_checkout_day(self):
+        date_from = timezone.now().date()
+        date_to = date_from + timezone.timedelta(days=2)
+        BookingFactory(date_from=date_from, date_to=date_to)
+
+        assert BookedDayRepository.get_list_between_dates(date_from, date_to).count() == 2
+        assert not BookedDayRepository.get_list_between_dates(
+            date_to, date_to + timezone.timedelta(days=1)
+        ).exists()
+
+    def test_rebuild_availability_index_command_succeeds(self):
+        bookings = BookingFactory.create_batch(size=3)
+        BookingFactory(status=Booking.Status.CANCELED)
+        BookedDay.objects.all().delete()
+
+        call_command("rebuild_availability_index")
+
+        expected = sum((booking.date_to - booking.date_from).days for booking in bookings)
+        assert BookedDay.objects.count() == expected
@@ -0,0 +1,35 @@
+import pytest
+from django.db import connection
+
+from djlodging.domain.bookings.filters import BookingFilterSet
+from djlodging.domain.bookings.repository import BookingRepository
+from djlodging.domain.core.base_filters import Filter
+from tests.domain.bookings.factories import BookingFactory
+
+
+@pytest.mark.django_db
+class TestBookingFilterSet:
+    @pytest.mark.parametrize(
+        "filter_name, index_name",
+        [
+            ("country_name", "country_name_trgm_idx"),
+            ("country_region", "city_region_trgm_idx"),
+            ("city_name", "city_name_trgm_idx"),
+            ("city_district", "lodging_district_trgm_idx"),
+            ("street", "lodging_street_trgm_idx"),
+            ("zip_code", "lodging_zip_code_trgm_idx"),
+        ],
+    )
+    def test_icontains_filter_can_use_trigram_index(self, filter_name, index_name):
+        BookingFactory.create_batch(size=3, consecutive=True)
+        bookings = Filter(BookingFilterSet).filter(
+            {filter_name: "Abcd"}, BookingRepository.get_all()
+        )
+
+        with connection.cursor() as cursor:
+            # The tables are tiny, leave the planner bitmap scans on the filtered columns only
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            plan = bookings.explain()
+
+        assert index_name in plan
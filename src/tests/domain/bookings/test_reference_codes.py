@@ -0,0 +1,90 @@
+from itertools import permutations
+
+import pytest
+
+from djlodging.domain.bookings.reference_codes import (
+    ALPHABET,
+    REFERENCE_CODE_LENGTH,
+    encode_reference_code,
+    get_next_reference_codes,
+    is_valid_reference_code,
+)
+from djlodging.domain.bookings.repository import BookingRepository
+from tests.domain.bookings.factories import BookingFactory
+
+
+def with_check_character(body):
+    return next(
+        body + character for character in ALPHABET if is_valid_reference_code(body + character)
+    )
+
+
+class TestReferenceCodes:
+    def test_numbers_are_encoded_to_distinct_valid_codes(self):
+        reference_codes = [encode_reference_code(number) for number in range(1, 10001)]
+
+        assert len(set(reference_codes)) == len(reference_codes)
+        assert all(len(code) == REFERENCE_CODE_LENGTH for code in reference_codes)
+        assert all(is_valid_reference_code(code) for code in reference_codes)
+
+    def test_consecutive_numbers_dont_get_neighbouring_codes(self):
+        first_code, second_code = encode_reference_code(1), encode_reference_code(2)
+
+        assert first_code[:-2] != second_code[:-2]
+
+    def test_mistyped_character_is_rejected(self):
+        reference_code = encode_reference_code(42)
+
+        for position in range(REFERENCE_CODE_LENGTH):
+            for character in ALPHABET.replace(reference_code[position], ""):
+                mistyped_code = (
+                    reference_code[:position] + character + reference_code[position + 1 :]
+                )
+                assert not is_valid_reference_code(mistyped_code)
+
+    def test_swapped_neighbours_are_rejected(self):
+        body = encode_reference_code(42)[:-1]
+
+        for position in range(len(body) - 1):
+            for first, second in permutations(ALPHABET, 2):
+                swapped_body = body[:position] + first + second + body[position + 2 :]
+                reference_code = with_check_character(swapped_body)
+                swapped_code = (
+                    reference_code[:position] + second + first + reference_code[position + 2 :]
+                )
+                assert is_valid_reference_code(reference_code)
+                assert not is_valid_reference_code(swapped_code)
+
+    def test_swapped_check_character_is_rejected(self):
+        for number in range(1, 1001):
+            reference_code = encode_reference_code(number)
+            if reference_code[-2] != reference_code[-1]:
+                swapped_code = reference_code[:-2] + reference_code[-1] + reference_code[-2]
+                assert not is_valid_reference_code(swapped_code)
+
+    def test_legacy_codes_stay_valid(self):
+        assert is_valid_reference_code("AB12CD")
+        assert not is_valid_reference_code("ab12cd")
+
+
+@pytest.mark.django_db
+class TestBookingReferenceCodes:
+    def test_codes_are_taken_from_the_sequence_in_one_query(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            reference_codes = get_next_reference_codes(50)
+
+        assert len(set(reference_codes)) == 50
+        assert reference_codes[0] != get_next_reference_codes(1)[0]
+
+    def test_booking_is_found_by_its_code(self):
+        booking = BookingFactory()
+
+        assert BookingRepository.get_by_reference_code(booking.reference_code) == booking
+
+    def test_invalid_code_is_rejected_without_query(self, django_assert_num_queries):
+        booking = BookingFactory()
+        last_character = booking.reference_code[-1]
+        mistyped_code = booking.reference_code[:-1] + ALPHABET[ALPHABET.index(last_character) - 1]
+
+        with django_assert_num_queries(0):
+            assert BookingRepository.get_by_reference_code(mistyped_code) is None
@@ -0,0 +1,49 @@
+import pytest
+from django.db import connection
+
+from djlodging.domain.core.geohash import encode_geohash, get_cell_size, get_covering_geohashes
+
+
+def test_encode_geohash_succeeds():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert encode_geohash(-25.382708, -49.265506, 8) == "6gkzwgjz"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "latitude, longitude",
+    [(57.64911, 10.40744), (-25.382708, -49.265506), (90, 180), (-90, -180), (0, 0), (45, -90)],
+)
+def test_database_geohash_matches_encode_geohash(latitude, longitude):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT lodging_geohash(%s, %s)", [latitude, longitude])
+        (geohash,) = cursor.fetchone()
+
+    assert geohash == encode_geohash(latitude, longitude)
+
+
+def test_get_cell_size_succeeds():
+    height, width = get_cell_size(5)
+
+    assert height == pytest.approx(180 / 2**12)
+    assert width == pytest.approx(360 / 2**13)
+
+
+@pytest.mark.parametrize(
+    "latitude, longitude, radius_in_km",
+    [(48.8566, 2.3522, 8), (48.8566, 2.3522, 0.01), (-16.5, -179.999, 20), (0, 0, 50)],
+)
+def test_covering_geohashes_contain_the_circle(latitude, longitude, radius_in_km):
+    geohashes = get_covering_geohashes(latitude, longitude, radius_in_km)
+    degrees = radius_in_km / 111.195
+
+    assert 1 <= len(geohashes) <= 9
+    # Points on the circle around the center
+    for latitude_step, longitude_step in ((1, 0), (-1, 0), (0, 1), (0, -1), (0.7, 0.7)):
+        point_longitude = (longitude + longitude_step * degrees * 1.5 + 180) % 360 - 180
+        point_geohash = encode_geohash(latitude + latitude_step * degrees, point_longitude)
+        assert point_geohash.startswith(tuple(geohashes))
+
+
+def test_circle_around_the_pole_isnt_covered_by_cells():
+    assert get_covering_geohashes(89.9, 0, 50) == []
@@ -0,0 +1,92 @@
+import pytest
+
+from djlodging.api.bookings.projections import BOOKING_LIST_PROJECTION
+from djlodging.api.bookings.serializers import BookingListPaginatedOutputSerializer
+from djlodging.api.lodging.projections import (
+    CITY_LIST_PROJECTION,
+    LODGING_LIST_PROJECTION,
+    MY_REVIEW_LIST_PROJECTION,
+    REVIEW_LIST_PROJECTION,
+)
+from djlodging.api.lodging.serializers import (
+    MyReviewOutputSerializer,
+    ReviewPaginatedListOutputSerializer,
+)
+from djlodging.domain.bookings.repository import BookingRepository
+from djlodging.domain.lodgings.repositories import ReviewRepository
+from djlodging.infrastructure.query_metrics import collect_query_metrics
+from tests.domain.bookings.factories import BookingFactory
+from tests.domain.lodgings.factories import LodgingFactory, ReviewFactory
+
+QUERY_PARAMS = {"page_size": 10}
+
+
+def count_rendering_queries(paginated_list: dict, serializer_class) -> int:
+    with collect_query_metrics() as metrics:
+        serializer_class(paginated_list["results"], many=True).data
+    return metrics.count
+
+
+def count_row_rendering_queries(paginated_list: dict, paginated_serializer_class) -> int:
+    with collect_query_metrics() as metrics:
+        paginated_serializer_class.render(paginated_list)
+    return metrics.count
+
+
+class TestProjection:
+    def test_plan_follows_nested_serializers(self):
+        select_related, prefetch_related, only = CITY_LIST_PROJECTION.plan
+
+        assert select_related == ["country"]
+        assert prefetch_related == []
+        assert only == [
+            "id",
+            "created",
+            "country",
+            "country__id",
+            "country__name",
+            "name",
+            "region",
+            "latitude",
+            "longitude",
+        ]
+
+    def test_value_plan_follows_nested_serializers(self):
+        value_paths, optional_paths = LODGING_LIST_PROJECTION.value_plan
+
+        assert value_paths[:2] == ["id", "created"]
+        assert {"owner", "owner__email", "city", "city__country", "city__country__name"} <= set(
+            value_paths
+        )
+        assert optional_paths == ["available", "distance"]
+
+
+@pytest.mark.django_db
+class TestProjectionQueries:
+    def test_bookings_by_user_render_without_extra_queries(self, user):
+        BookingFactory.create_batch(size=3, user=user, consecutive=True)
+
+        bookings = BookingRepository.get_paginated_list_by_user(
+            user, QUERY_PARAMS, BOOKING_LIST_PROJECTION
+        )
+
+        assert count_row_rendering_queries(bookings, BookingListPaginatedOutputSerializer) == 1
+
+    def test_reviews_by_lodging_render_without_extra_queries(self):
+        lodging = LodgingFactory()
+        ReviewFactory.create_batch(size=3, lodging=lodging)
+
+        reviews = ReviewRepository.get_paginated_list_by_lodging(
+            lodging.id, QUERY_PARAMS, REVIEW_LIST_PROJECTION
+        )
+
+        assert count_row_rendering_queries(reviews, ReviewPaginatedListOutputSerializer) == 1
+
+    def test_reviews_by_user_render_without_extra_queries(self, user):
+        ReviewFactory.create_batch(size=3, user=user)
+
+        reviews = ReviewRepository.get_paginated_list_by_user(
+            user, QUERY_PARAMS, MY_REVIEW_LIST_PROJECTION
+        )
+
+        assert count_rendering_queries(reviews, MyReviewOutputSerializer) == 1
@@ -0,0 +1,211 @@
+from typing import Callable, List
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from djlodging.api.bookings.projections import BOOKING_LIST_PROJECTION
+from djlodging.api.lodging.projections import LODGING_LIST_PROJECTION, REVIEW_LIST_PROJECTION
+from djlodging.domain.bookings.models import Booking
+from djlodging.domain.bookings.repository import BookingRepository
+from djlodging.domain.lodgings.models import Lodging
+from djlodging.domain.lodgings.repositories import LodgingRepository, ReviewRepository
+from tests.domain.bookings.factories import BookingFactory
+from tests.domain.lodgings.factories import LodgingFactory, ReviewFactory
+
+LODGING_SEARCH_INDEXES = (
+    "lodging_search_idx",
+    "lodging_city_price_idx",
+    "lodging_city_rating_idx",
+)
+
+
+def explain_repository_queries(run: Callable) -> List[str]:
+    """The plans of the queries run by `run`, with sequential scans as the last resort."""
+    with CaptureQueriesContext(connection) as context:
+        run()
+    plans = []
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+        # The seeded tables are tiny, so a sequential scan would be cheapest on any of them
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        for query in context.captured_queries:
+            if query["sql"].startswith(("SELECT", "UPDATE", "DELETE")):
+                cursor.execute(f"EXPLAIN {query['sql']}")
+                plans.append("\n".join(row[0] for row in cursor.fetchall()))
+    return plans
+
+
+def assert_uses_index(plans: List[str], *index_names: str) -> None:
+    """No sequential scans and one of the indexes, which the planner picks by the seeded data."""
+    assert plans
+    for plan in plans:
+        assert "Seq Scan" not in plan, plan
+    assert any(index_name in plan for plan in plans for index_name in index_names), plans
+
+
+@pytest.mark.django_db
+class TestRepositoryQueryPlans:
+    @pytest.fixture(autouse=True)
+    def seed(self):
+        self.lodging = LodgingFactory()
+        self.bookings = BookingFactory.create_batch(size=5, lodging=self.lodging, consecutive=True)
+        BookingFactory.create_batch(size=5, consecutive=True)
+        ReviewFactory.create_batch(size=3, lodging=self.lodging)
+        ReviewFactory.create_batch(size=3)
+
+    def test_bookings_by_user(self):
+        user = self.bookings[0].user
+
+        plans = explain_repository_queries(
+            lambda: list(
+                BookingRepository.get_paginated_list_by_user(user, {}, BOOKING_LIST_PROJECTION)[
+                    "results"
+                ]
+            )
+        )
+        cursor_plans = explain_repository_queries(
+            lambda: BookingRepository.get_paginated_list_by_user(
+                user, {"cursor": ""}, BOOKING_LIST_PROJECTION
+            )
+        )
+
+        assert_uses_index(plans, "booking_user_created_idx")
+        assert_uses_index(cursor_plans, "booking_user_created_idx")
+
+    def test_booking_by_reference_code(self):
+        reference_code = self.bookings[0].reference_code
+
+        plans = explain_repository_queries(
+            lambda: BookingRepository.get_by_reference_code(reference_code)
+        )
+
+        assert_uses_index(plans, "booking_reference_code_key")
+
+    def test_bookings_by_lodging_and_stay(self):
+        booking = self.bookings[0]
+        query_params = {
+            "lodging_id": str(self.lodging.id),
+            "date_from": booking.date_from,
+            "date_to": booking.date_to,
+            "status": Booking.Status.PAYMENT_PENDING,
+        }
+
+        plans = explain_repository_queries(
+            lambda: list(
+                BookingRepository.get_filtered_list(query_params, BOOKING_LIST_PROJECTION)[
+                    "results"
+                ]
+            )
+        )
+
+        assert_uses_index(plans, "booking_lodging_stay_idx")
+
+    def test_overlapping_bookings_of_lodging(self):
+        # Enough stays of the lodging that its btree prefix is no longer the cheapest match
+        BookingFactory.create_batch(size=30, lodging=self.lodging, consecutive=True)
+        booking = self.bookings[0]
+
+        plans = explain_repository_queries(
+            lambda: BookingRepository.has_overlapping_bookings(
+                self.lodging.id, booking.date_from, booking.date_to
+            )
+        )
+
+        assert_uses_index(plans, "booking_no_overlapping_stays")
+
+    def test_expired_unpaid_bookings(self):
+        Booking.objects.filter(id=self.bookings[0].id).update(
+            payment_expiration_time=timezone.now() - timezone.timedelta(minutes=1)
+        )
+
+        plans = explain_repository_queries(BookingRepository.delete_all_expired_unpaid_bookings)
+
+        assert_uses_index(plans, "booking_unpaid_expiry_idx")
+
+    def test_lodging_search(self):
+        query_params = {
+            "country": self.lodging.city.country.name,
+            "city": self.lodging.city.name,
+            "date_from": timezone.now().date(),
+            "date_to": timezone.now().date() + timezone.timedelta(days=2),
+            "number_of_rooms": self.lodging.number_of_rooms,
+            "kind": self.lodging.kind,
+        }
+        # Loads the location catalog, a read of all countries and cities
+        LodgingRepository.get_filtered_list(query_params)
+
+        plans = explain_repository_queries(
+            lambda: list(LodgingRepository.get_filtered_list(query_params))
+        )
+
+        assert_uses_index(plans, *LODGING_SEARCH_INDEXES)
+
+    @pytest.mark.parametrize(
+        "search_params",
+        [
+            {"price_min": "10", "price_max": "500", "order_by": "price"},
+            {"min_rating": "5", "order_by": "-average_rating"},
+        ],
+    )
+    def test_lodging_search_by_price_and_rating(self, search_params):
+        query_params = {
+            "country": self.lodging.city.country.name,
+            "city": self.lodging.city.name,
+            "date_from": timezone.now().date(),
+            "date_to": timezone.now().date() + timezone.timedelta(days=2),
+            **search_params,
+        }
+        LodgingRepository.get_filtered_list(query_params)
+
+        plans = explain_repository_queries(
+            lambda: LodgingRepository.get_paginated_filtered_list(
+                query_params, LODGING_LIST_PROJECTION
+            )
+        )
+
+        assert_uses_index(plans, *LODGING_SEARCH_INDEXES)
+
+    def test_lodging_radius_search(self):
+        LodgingFactory.create_batch(size=3, latitude=48.86, longitude=2.35)
+        # Enough lodgings elsewhere for the cells to be cheaper than the other indexes
+        Lodging.objects.bulk_create(
+            LodgingFactory.build_batch(
+                size=1000,
+                owner=self.lodging.owner,
+                city=self.lodging.city,
+                latitude=0,
+                longitude=0,
+            )
+        )
+        query_params = {
+            "latitude": "48.8566",
+            "longitude": "2.3522",
+            "radius": "5",
+            "date_from": timezone.now().date(),
+            "date_to": timezone.now().date() + timezone.timedelta(days=2),
+        }
+
+        plans = explain_repository_queries(
+            lambda: list(LodgingRepository.get_filtered_list(query_params))
+        )
+
+        assert_uses_index(plans, "lodging_geohash_idx")
+
+    def test_reviews_by_lodging(self):
+        plans = explain_repository_queries(
+            lambda: list(
+                ReviewRepository.get_paginated_list_by_lodging(
+                    self.lodging.id, {}, REVIEW_LIST_PROJECTION
+                )["results"]
+            )
+        )
+        cursor_plans = explain_repository_queries(
+            lambda: ReviewRepository.get_paginated_list_by_lodging(
+                self.lodging.id, {"cursor": ""}, REVIEW_LIST_PROJECTION
+            )
+        )
+
+        assert_uses_index(plans, "review_lodging_created_idx")
+        assert_uses_index(cursor_plans, "review_lodging_created_idx")
@@ -0,0 +1,88 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from djlodging.domain.bookings.models import BookedDay, Booking
+from djlodging.domain.bookings.repository import BookingRepository
+from djlodging.domain.core.sweeps import delete_in_batches
+from djlodging.domain.users.repository import UserRepository
+from djlodging.infrastructure.jobs.celery_tasks import delete_all_expired_unpaid_bookings
+from tests.domain.bookings.factories import BookingFactory
+from tests.domain.users.factories import UserFactory
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestExpirySweeps:
+    def test_expired_unpaid_bookings_are_deleted_in_batches(self, settings):
+        settings.EXPIRY_SWEEP_BATCH_SIZE = 2
+        expired = timezone.now() - timezone.timedelta(minutes=1)
+        BookingFactory.create_batch(size=5, consecutive=True, payment_expiration_time=expired)
+        not_expired = BookingFactory(consecutive=True)
+        paid = BookingFactory(
+            consecutive=True, status=Booking.Status.PAID, payment_expiration_time=expired
+        )
+
+        metrics = BookingRepository.delete_all_expired_unpaid_bookings()
+
+        assert metrics.deleted == 5
+        assert metrics.batches == 3
+        assert metrics.is_complete is True
+        assert set(Booking.objects.values_list("id", flat=True)) == {not_expired.id, paid.id}
+        assert not BookedDay.objects.exclude(booking__in=[not_expired, paid]).exists()
+
+    def test_sweep_stops_when_time_budget_is_spent(self):
+        expired = timezone.now() - timezone.timedelta(minutes=1)
+        BookingFactory.create_batch(size=3, consecutive=True, payment_expiration_time=expired)
+
+        metrics = delete_in_batches(
+            Booking.objects.filter(payment_expiration_time__lte=timezone.now()),
+            order_field="payment_expiration_time",
+            name="test",
+            batch_size=1,
+            time_budget_in_seconds=0,
+        )
+
+        assert metrics.deleted == 0
+        assert metrics.is_complete is False
+        assert Booking.objects.count() == 3
+
+    def test_rows_no_longer_matching_are_kept(self):
+        expired = timezone.now() - timezone.timedelta(minutes=1)
+        bookings = BookingFactory.create_batch(
+            size=2, consecutive=True, payment_expiration_time=expired
+        )
+        expired_unpaid_bookings = Booking.objects.filter(status=Booking.Status.PAYMENT_PENDING)
+        BookingRepository.change_status(bookings[0], new_status=Booking.Status.PAID)
+
+        metrics = delete_in_batches(
+            expired_unpaid_bookings,
+            order_field="payment_expiration_time",
+            name="test",
+            batch_size=10,
+        )
+
+        assert metrics.deleted == 1
+        assert list(Booking.objects.values_list("id", flat=True)) == [bookings[0].id]
+
+    def test_users_with_unfinished_registration_are_deleted(self, settings):
+        settings.EXPIRY_SWEEP_BATCH_SIZE = 1
+        expired = timezone.now() - timezone.timedelta(minutes=1)
+        UserFactory.create_batch(size=2, is_active=False, security_token_expiration_time=expired)
+        active_user = UserFactory(security_token_expiration_time=expired)
+
+        metrics = UserRepository.delete_users_with_unfinished_registration()
+
+        assert metrics.deleted == 2
+        assert metrics.batches == 2
+        assert list(User.objects.values_list("id", flat=True)) == [active_user.id]
+
+    def test_task_returns_metrics(self):
+        BookingFactory(payment_expiration_time=timezone.now() - timezone.timedelta(minutes=1))
+
+        result = delete_all_expired_unpaid_bookings()
+
+        assert result["deleted"] == 1
+        assert result["is_complete"] is True
+        assert len(result["batch_durations_ms"]) == result["batches"]
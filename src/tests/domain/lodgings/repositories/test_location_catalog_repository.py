@@ -0,0 +1,100 @@
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from djlodging.application_services.lodgings import CityService
+from djlodging.domain.lodgings.models import City, Lodging
+from djlodging.domain.lodgings.repositories import LocationCatalogRepository, LodgingRepository
+from djlodging.infrastructure.query_metrics import collect_query_metrics
+from tests.domain.lodgings.factories import CityFactory, CountryFactory, LodgingFactory
+from tests.domain.users.factories import UserFactory
+
+
+@pytest.mark.django_db
+class TestLocationCatalogRepository:
+    def test_get_tree_succeeds(self):
+        country = CountryFactory()
+        city = CityFactory(country=country)
+        empty_country = CountryFactory()
+
+        tree = LocationCatalogRepository.get_tree()
+
+        assert tree[country.name] == {city.name: [city.id]}
+        assert tree[empty_country.name] == {}
+
+    def test_tree_is_read_from_cache(self):
+        CityFactory()
+        LocationCatalogRepository.get_tree()
+
+        with collect_query_metrics() as metrics:
+            LocationCatalogRepository.get_tree()
+
+        assert metrics.count == 0
+
+    def test_city_service_write_invalidates_tree(self):
+        country = CountryFactory()
+        LocationCatalogRepository.get_tree()
+
+        city = CityService.create(
+            actor=UserFactory(is_staff=True), country_id=country.id, name="Lviv"
+        )
+
+        assert LocationCatalogRepository.get_city_ids(country.name, "Lviv") == [city.id]
+
+    def test_city_writes_outside_service_invalidate_tree(self):
+        country = CountryFactory()
+        LocationCatalogRepository.get_tree()
+
+        city = CityFactory(country=country, name="Lviv")
+        assert LocationCatalogRepository.get_city_ids(country.name, "Lviv") == [city.id]
+
+        city.delete()
+        assert LocationCatalogRepository.get_city_ids(country.name, "Lviv") == []
+
+    def test_local_copy_follows_shared_version(self, settings):
+        settings.LOCATION_CATALOG_LOCAL_TTL_IN_SECONDS = 0
+        country = CountryFactory()
+        LocationCatalogRepository.get_tree()
+        # Bulk writes send no signals, like a write seen by another process only
+        (city,) = City.objects.bulk_create([CityFactory.build(country=country)])
+        assert LocationCatalogRepository.get_city_ids(country.name) == []
+
+        # Another process bumped the version after writing a city
+        cache.set(LocationCatalogRepository.VERSION_KEY, "new-version", timeout=None)
+
+        assert LocationCatalogRepository.get_city_ids(country.name) == [city.id]
+
+
+@pytest.mark.django_db
+class TestLodgingSearchByCatalog:
+    def test_search_filters_by_country_and_kind(self):
+        city = CityFactory()
+        lodging = LodgingFactory(city=city, kind=Lodging.Kind.HOTEL)
+        LodgingFactory(city=city, kind=Lodging.Kind.HOME)
+        LodgingFactory(kind=Lodging.Kind.HOTEL)
+        date_from = timezone.now().date()
+
+        result = LodgingRepository.get_filtered_list(
+            {
+                "date_from": date_from,
+                "date_to": date_from + timezone.timedelta(days=1),
+                "country": city.country.name,
+                "kind": Lodging.Kind.HOTEL,
+            }
+        )
+
+        assert list(result.values_list("id", flat=True)) == [lodging.id]
+
+    def test_search_by_unknown_country_returns_nothing(self):
+        LodgingFactory()
+        date_from = timezone.now().date()
+
+        result = LodgingRepository.get_filtered_list(
+            {
+                "date_from": date_from,
+                "date_to": date_from + timezone.timedelta(days=1),
+                "country": "Atlantis",
+            }
+        )
+
+        assert not result.exists()
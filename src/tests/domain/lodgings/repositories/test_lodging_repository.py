@@ -1,10 +1,14 @@
 import pytest
-from django.db.models import Avg
+from django.db.models import Avg, Q
 from django.db.models.functions import Round
 from django.utils import timezone
 from faker import Faker
 from pytest_django.asserts import assertQuerysetEqual
 
+from djlodging.api.lodging.projections import LODGING_LIST_PROJECTION
+from djlodging.domain.core.base_exceptions import DjLodgingValidationError
+from djlodging.domain.core.geohash import encode_geohash
+from djlodging.domain.lodgings.models import Lodging
 from djlodging.domain.lodgings.models.review import Review
 from djlodging.domain.lodgings.repositories import LodgingRepository
 from tests.domain.bookings.factories import BookingFactory
@@ -250,3 +254,174 @@ def test_get_list_with_only_available_for_different_dates_succeeds():
     # Assert that other (not reviewed) lodgings have no average_rating
     for lodging in result.exclude(id=lodgings[0].id):
         assert lodging.average_rating is None
+
+
+def get_search_query_params(city, **kwargs) -> dict:
+    return {
+        "date_from": timezone.now().date(),
+        "date_to": timezone.now().date() + timezone.timedelta(days=2),
+        "country": city.country.name,
+        "city": city.name,
+        **kwargs,
+    }
+
+
+@pytest.mark.django_db
+def test_get_list_filtered_by_price_and_rating_succeeds():
+    city = CityFactory()
+    cheap, middle, expensive = (
+        LodgingFactory(city=city, price=price) for price in ("50.00", "100.00", "150.00")
+    )
+    ReviewFactory(lodging=middle, score=8)
+    ReviewFactory(lodging=expensive, score=4)
+
+    price_range = get_search_query_params(city, price_min="60", price_max="150")
+    min_rating = get_search_query_params(city, min_rating="5.5")
+
+    assert set(LodgingRepository.get_filtered_list(price_range)) == {middle, expensive}
+    assert list(LodgingRepository.get_filtered_list(min_rating)) == [middle]
+
+
+@pytest.mark.django_db
+def test_get_list_sorted_by_whitelisted_order_succeeds():
+    city = CityFactory()
+    cheap, middle, expensive = (
+        LodgingFactory(city=city, price=price) for price in ("50.00", "100.00", "150.00")
+    )
+    ReviewFactory(lodging=cheap, score=8)
+    ReviewFactory(lodging=expensive, score=4)
+
+    def search(order_by):
+        query_params = get_search_query_params(city, order_by=order_by, page_size=3)
+        page = LodgingRepository.get_paginated_filtered_list(query_params, LODGING_LIST_PROJECTION)
+        return [lodging["id"] for lodging in page["results"]]
+
+    assert search("-price") == [expensive.id, middle.id, cheap.id]
+    # Unrated lodgings come last in either direction
+    assert search("-average_rating") == [cheap.id, expensive.id, middle.id]
+    assert search("average_rating") == [expensive.id, cheap.id, middle.id]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query_params",
+    [{"order_by": "owner__password"}, {"price_min": "cheap"}, {"min_rating": "NaN"}],
+)
+def test_get_list_with_invalid_search_params_fails(query_params):
+    city = CityFactory()
+    search_query_params = get_search_query_params(city, **query_params)
+
+    with pytest.raises(DjLodgingValidationError):
+        LodgingRepository.get_paginated_filtered_list(search_query_params, LODGING_LIST_PROJECTION)
+
+
+def get_radius_query_params(**kwargs) -> dict:
+    return {
+        "date_from": timezone.now().date(),
+        "date_to": timezone.now().date() + timezone.timedelta(days=2),
+        "radius": "8",
+        **kwargs,
+    }
+
+
+@pytest.mark.django_db
+def test_get_list_within_radius_sorted_by_distance_succeeds():
+    near = LodgingFactory(latitude=48.86, longitude=2.35)
+    middle = LodgingFactory(latitude=48.90, longitude=2.35)
+    # Beyond the radius, and without coordinates
+    LodgingFactory(latitude=48.95, longitude=2.35)
+    LodgingFactory()
+
+    query_params = get_radius_query_params(latitude="48.8566", longitude="2.3522", page_size=5)
+    page = LodgingRepository.get_paginated_filtered_list(query_params, LODGING_LIST_PROJECTION)
+
+    assert [lodging["id"] for lodging in page["results"]] == [near.id, middle.id]
+    assert page["results"][0]["distance"] == pytest.approx(0.41, abs=0.01)
+    assert page["results"][1]["distance"] == pytest.approx(4.83, abs=0.01)
+
+
+@pytest.mark.django_db
+def test_get_list_within_radius_around_city_succeeds():
+    city = CityFactory(latitude=48.8566, longitude=2.3522)
+    # In a neighbouring city, but within the radius
+    neighbour = LodgingFactory(latitude=48.90, longitude=2.35)
+    LodgingFactory(city=city, latitude=48.95, longitude=2.35)
+
+    query_params = get_radius_query_params(country=city.country.name, city=city.name)
+
+    assert list(LodgingRepository.get_filtered_list(query_params)) == [neighbour]
+
+
+@pytest.mark.django_db
+def test_get_list_within_radius_across_antimeridian_succeeds():
+    west = LodgingFactory(latitude=-16.5, longitude=179.99)
+    east = LodgingFactory(latitude=-16.5, longitude=-179.99)
+
+    query_params = get_radius_query_params(latitude="-16.5", longitude="-179.999")
+
+    assert list(LodgingRepository.get_filtered_list(query_params)) == [east, west]
+
+
+@pytest.mark.django_db
+def test_get_list_within_radius_around_pole_succeeds():
+    # Across the pole from the center
+    across = LodgingFactory(latitude=89.95, longitude=180)
+    LodgingFactory(latitude=89.0, longitude=0)
+
+    query_params = get_radius_query_params(latitude="89.9", longitude="0", radius="50")
+
+    assert list(LodgingRepository.get_filtered_list(query_params)) == [across]
+    assert LodgingRepository._construct_radius_filter(89.9, 0, 50) != Q()
+
+
+@pytest.mark.django_db
+def test_get_list_within_radius_by_cursor_fails():
+    query_params = get_radius_query_params(latitude="48.8566", longitude="2.3522", cursor="")
+
+    with pytest.raises(DjLodgingValidationError):
+        LodgingRepository.get_paginated_filtered_list(query_params, LODGING_LIST_PROJECTION)
+
+
+@pytest.mark.django_db
+def test_geohash_follows_coordinates_of_bulk_writes():
+    lodging = LodgingFactory()
+    Lodging.objects.bulk_create(
+        LodgingFactory.build_batch(
+            size=2, owner=lodging.owner, city=lodging.city, latitude=48.86, longitude=2.35
+        )
+    )
+    Lodging.objects.filter(id=lodging.id).update(latitude=-16.5, longitude=179.99)
+
+    for latitude, longitude, geohash in Lodging.objects.values_list(
+        "latitude", "longitude", "geohash"
+    ):
+        assert geohash == encode_geohash(latitude, longitude)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query_params",
+    [
+        {"latitude": "48.8566", "longitude": "2.3522", "radius": "0"},
+        {"latitude": "48.8566", "longitude": "2.3522", "radius": "500"},
+        {"latitude": "91", "longitude": "2.3522"},
+        # A city without coordinates
+        {"with_city": True},
+    ],
+)
+def test_get_list_with_invalid_radius_search_params_fails(query_params):
+    if query_params.pop("with_city", False):
+        city = CityFactory()
+        query_params = {"country": city.country.name, "city": city.name}
+
+    with pytest.raises(DjLodgingValidationError):
+        LodgingRepository.get_filtered_list(get_radius_query_params(**query_params))
+
+
+@pytest.mark.django_db
+def test_get_list_sorted_by_distance_without_radius_fails():
+    city = CityFactory()
+    query_params = get_search_query_params(city, order_by="distance")
+
+    with pytest.raises(DjLodgingValidationError):
+        LodgingRepository.get_paginated_filtered_list(query_params, LODGING_LIST_PROJECTION)
@@ -0,0 +1,220 @@
+import pytest
+from django.utils import timezone
+
+from djlodging.api.lodging.projections import LODGING_LIST_PROJECTION
+from djlodging.application_services.lodgings import LodgingService
+from djlodging.domain.lodgings.repositories import LodgingRepository, LodgingSearchCacheRepository
+from djlodging.infrastructure.query_metrics import collect_query_metrics
+from tests.domain.bookings.factories import BookingFactory
+from tests.domain.lodgings.factories import CityFactory, LodgingFactory, ReviewFactory
+
+
+@pytest.mark.django_db
+class TestLodgingSearchCache:
+    def _get_query_params(self, city, date_from, number_of_nights=3, **kwargs):
+        return {
+            "country": city.country.name,
+            "city": city.name,
+            "date_from": str(date_from),
+            "date_to": str(date_from + timezone.timedelta(days=number_of_nights)),
+            "available_only": True,
+            **kwargs,
+        }
+
+    def _search(self, query_params):
+        return LodgingRepository.get_paginated_filtered_list(query_params, LODGING_LIST_PROJECTION)
+
+    def test_cached_search_only_hydrates_page(self):
+        city = CityFactory()
+        LodgingFactory.create_batch(size=5, city=city)
+        query_params = self._get_query_params(city, timezone.now().date(), page_size=2)
+        self._search(query_params)
+
+        with collect_query_metrics() as metrics:
+            page = self._search(query_params)
+
+        assert metrics.count == 1
+        assert page["count"] == 5
+        assert len(page["results"]) == 2
+
+    def test_pages_follow_cached_order(self):
+        city = CityFactory()
+        lodgings = LodgingFactory.create_batch(size=3, city=city)
+        query_params = self._get_query_params(
+            city, timezone.now().date(), page_size=1, order_by="name"
+        )
+
+        found_ids = [
+            self._search({**query_params, "page": page})["results"][0]["id"] for page in (1, 2, 3)
+        ]
+
+        assert found_ids == [
+            lodging.id for lodging in sorted(lodgings, key=lambda lodging: lodging.name)
+        ]
+
+    def test_price_filters_are_cached_separately(self):
+        city = CityFactory()
+        LodgingFactory(city=city, price="50.00")
+        LodgingFactory(city=city, price="150.00")
+        query_params = self._get_query_params(city, timezone.now().date())
+        assert self._search(query_params)["count"] == 2
+
+        cheap_query_params = {**query_params, "price_max": "100"}
+
+        assert self._search(cheap_query_params)["count"] == 1
+
+    def test_equal_decimal_filters_share_cached_search(self, mocker):
+        city = CityFactory()
+        query_params = self._get_query_params(city, timezone.now().date(), price_max="60")
+        get_search_results = mocker.Mock(return_value={"count": 0, "results": []})
+        LodgingSearchCacheRepository.get_or_set(query_params, get_search_results)
+
+        LodgingSearchCacheRepository.get_or_set(
+            {**query_params, "price_max": "60.0"}, get_search_results
+        )
+
+        get_search_results.assert_called_once()
+
+    def test_price_update_invalidates_search(self):
+        city = CityFactory()
+        lodging = LodgingFactory(city=city, price="50.00")
+        query_params = self._get_query_params(city, timezone.now().date(), price_max="100")
+        assert self._search(query_params)["count"] == 1
+
+        LodgingService.update(actor=lodging.owner, lodging_id=lodging.id, price="150.00")
+
+        assert self._search(query_params)["count"] == 0
+
+    def test_moved_lodging_leaves_search_of_former_city(self):
+        city, new_city = CityFactory.create_batch(size=2)
+        lodging = LodgingFactory(city=city)
+        query_params = self._get_query_params(city, timezone.now().date())
+        assert self._search(query_params)["count"] == 1
+
+        LodgingService.update(actor=lodging.owner, lodging_id=lodging.id, city=new_city)
+
+        assert self._search(query_params)["count"] == 0
+
+    def test_new_lodging_invalidates_search(self):
+        city = CityFactory()
+        owner = LodgingFactory(city=city).owner
+        owner.is_partner = True
+        query_params = self._get_query_params(city, timezone.now().date())
+        assert self._search(query_params)["count"] == 1
+
+        LodgingService.create(
+            actor=owner,
+            name="Cabin",
+            kind="home",
+            city_id=city.id,
+            street="Main street",
+            house_number="1",
+            zip_code="12345",
+            price=100,
+        )
+
+        assert self._search(query_params)["count"] == 2
+
+    def test_new_review_invalidates_rating_search(self):
+        city = CityFactory()
+        lodging = LodgingFactory(city=city)
+        query_params = self._get_query_params(city, timezone.now().date(), min_rating="1")
+        assert self._search(query_params)["count"] == 0
+
+        ReviewFactory(lodging=lodging, score=5)
+
+        assert self._search(query_params)["count"] == 1
+
+    def test_booking_in_searched_window_invalidates_search(self):
+        city = CityFactory()
+        lodging = LodgingFactory(city=city)
+        date_from = timezone.now().date()
+        query_params = self._get_query_params(city, date_from)
+        assert self._search(query_params)["count"] == 1
+
+        BookingFactory(
+            lodging=lodging,
+            date_from=date_from + timezone.timedelta(days=2),
+            date_to=date_from + timezone.timedelta(days=4),
+        )
+
+        assert self._search(query_params)["count"] == 0
+
+    def test_search_before_booking_commits_isnt_kept(
+        self, mocker, django_capture_on_commit_callbacks
+    ):
+        city = CityFactory()
+        lodging = LodgingFactory(city=city)
+        date_from = timezone.now().date()
+        query_params = self._get_query_params(city, date_from)
+        self._search(query_params)
+        stale_window = LodgingSearchCacheRepository.get_or_set(query_params, mocker.Mock())
+
+        with django_capture_on_commit_callbacks(execute=True):
+            BookingFactory(
+                lodging=lodging,
+                date_from=date_from,
+                date_to=date_from + timezone.timedelta(days=1),
+            )
+            # A concurrent search doesn't see the uncommitted booking yet
+            LodgingSearchCacheRepository.get_or_set(query_params, lambda: stale_window)
+
+        assert self._search(query_params)["count"] == 0
+
+    def test_booking_outside_searched_window_keeps_search_cached(self):
+        city = CityFactory()
+        lodging = LodgingFactory(city=city)
+        date_from = timezone.now().date()
+        query_params = self._get_query_params(city, date_from)
+        self._search(query_params)
+
+        BookingFactory(
+            lodging=lodging,
+            date_from=date_from + timezone.timedelta(days=3),
+            date_to=date_from + timezone.timedelta(days=5),
+        )
+        with collect_query_metrics() as metrics:
+            page = self._search(query_params)
+
+        assert metrics.count == 1
+        assert page["count"] == 1
+
+    def test_canceled_booking_invalidates_search(self):
+        city = CityFactory()
+        lodging = LodgingFactory(city=city)
+        date_from = timezone.now().date()
+        booking = BookingFactory(
+            lodging=lodging, date_from=date_from, date_to=date_from + timezone.timedelta(days=1)
+        )
+        query_params = self._get_query_params(city, date_from)
+        assert self._search(query_params)["count"] == 0
+
+        booking.status = booking.Status.CANCELED
+        booking.save()
+
+        assert self._search(query_params)["count"] == 1
+
+    def test_pages_beyond_cached_window_are_read_from_database(self, settings):
+        settings.LODGING_SEARCH_CACHE_WINDOW = 2
+        city = CityFactory()
+        lodgings = LodgingFactory.create_batch(size=3, city=city)
+        query_params = self._get_query_params(city, timezone.now().date(), order_by="name")
+        self._search({**query_params, "page_size": 2})
+
+        with collect_query_metrics() as metrics:
+            page = self._search({**query_params, "page_size": 2, "page": 2})
+
+        # The count is cached with the window, the page itself is read
+        assert metrics.count == 1
+        assert page["count"] == 3
+        assert [lodging["id"] for lodging in page["results"]] == [
+            max(lodgings, key=lambda lodging: lodging.name).id
+        ]
+
+    def test_location_names_are_hashed_into_version_keys(self):
+        version_key = LodgingSearchCacheRepository._get_version_key(
+            "Côte d'Ivoire", "Abidjan: Plateau", timezone.now().date()
+        )
+
+        assert "Abidjan" not in version_key
+        assert " " not in version_key
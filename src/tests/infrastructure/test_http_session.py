@@ -0,0 +1,88 @@
+import json
+import logging
+
+import pytest
+import requests
+import stripe
+
+from djlodging.infrastructure.providers import http_session
+from djlodging.infrastructure.providers.email import SendgridEmailProvider
+from djlodging.infrastructure.providers.http_session import RetryableHTTPError, get_session
+from djlodging.infrastructure.providers.payments import payment_provider
+
+
+@pytest.fixture
+def sendgrid_provider(http_stub):
+    provider = SendgridEmailProvider()
+    provider.mail_send_url = f"{http_stub.url}/v3/mail/send"
+    return provider
+
+
+class TestProviderSession:
+    def test_sendgrid_batch_is_posted_over_one_kept_alive_connection(
+        self, http_stub, sendgrid_provider
+    ):
+        http_stub.status = 202
+        histogram = get_session("sendgrid").latency_histogram
+        count_before = histogram.count
+        personalizations = [{"to": [{"email": "user@example.com"}]}]
+
+        for _ in range(3):
+            sendgrid_provider.send_batch(template_id="d-1", personalizations=personalizations)
+
+        assert http_stub.connections == 1
+        assert len(http_stub.requests) == 3
+        request = http_stub.requests[0]
+        assert request["path"] == "/v3/mail/send"
+        assert request["headers"]["Authorization"] == f"Bearer {sendgrid_provider.api_key}"
+        assert json.loads(request["body"]) == {
+            "personalizations": personalizations,
+            "from": {"email": sendgrid_provider.from_email},
+            "template_id": "d-1",
+        }
+        assert histogram.count == count_before + 3
+        assert histogram.as_dict()["buckets"]["inf"] == histogram.count
+
+    def test_rate_limited_response_is_retryable(self, http_stub, sendgrid_provider):
+        http_stub.status = 429
+
+        with pytest.raises(RetryableHTTPError):
+            sendgrid_provider.send_batch(template_id="d-1", personalizations=[])
+        assert isinstance(RetryableHTTPError(), sendgrid_provider.RETRYABLE_ERRORS)
+
+    def test_bad_request_is_not_retryable(self, http_stub, sendgrid_provider):
+        http_stub.status = 400
+
+        with pytest.raises(requests.HTTPError) as exc:
+            sendgrid_provider.send_batch(template_id="d-1", personalizations=[])
+        assert not isinstance(exc.value, sendgrid_provider.RETRYABLE_ERRORS)
+
+    def test_slow_response_times_out(self, http_stub, sendgrid_provider, settings):
+        settings.PROVIDER_HTTP_READ_TIMEOUT_IN_SECONDS = 0.05
+        http_stub.delay = 0.5
+
+        with pytest.raises(requests.Timeout):
+            sendgrid_provider.send_batch(template_id="d-1", personalizations=[])
+
+    def test_latency_histograms_are_logged(self, http_stub, sendgrid_provider, settings, caplog):
+        settings.PROVIDER_HTTP_LATENCY_LOG_INTERVAL_IN_SECONDS = 0
+        http_stub.status = 202
+
+        with caplog.at_level(logging.INFO, logger=http_session.__name__):
+            sendgrid_provider.send_batch(template_id="d-1", personalizations=[])
+
+        assert "sendgrid latency histogram" in caplog.text
+
+    def test_stripe_calls_share_the_pooled_session(self, http_stub, monkeypatch):
+        monkeypatch.setattr(stripe, "api_base", http_stub.url)
+        http_stub.body = {"id": "pi_1", "object": "payment_intent"}
+        histogram = get_session("stripe").latency_histogram
+        count_before = histogram.count
+
+        payment_provider.get_payment_intent("pi_1")
+        payment_intent = payment_provider.get_payment_intent("pi_1")
+
+        assert payment_intent.id == "pi_1"
+        assert http_stub.requests[0]["path"] == "/v1/payment_intents/pi_1"
+        assert http_stub.connections == 1
+        assert histogram.count == count_before + 2
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from djlodging.application_services.email import EmailService
+from djlodging.domain.emails.models import PendingEmail
+from djlodging.infrastructure.providers.email import LocalEmailProvider
+from tests.domain.bookings.factories import BookingFactory
+
+
+@pytest.fixture
+def local_email_provider(mocker):
+    provider = LocalEmailProvider()
+    mocker.patch("djlodging.application_services.email.email_provider", provider)
+    return provider
+
+
+@pytest.mark.django_db
+class TestLocalEmailProvider:
+    def test_emails_are_kept_in_memory(self, settings, local_email_provider):
+        settings.EMAIL_BATCHING_ENABLED = False
+
+        EmailService.send_confirmation_link(email="user@example.com", security_token="token")
+
+        assert local_email_provider.message_count == 1
+        request = local_email_provider.sent[0]
+        assert request["template_id"] == local_email_provider.confirmation_link_template_id
+        assert request["personalizations"][0]["to"] == [{"email": "user@example.com"}]
+
+    def test_emails_are_spooled_to_files(self, settings, tmp_path, local_email_provider):
+        settings.LOCAL_EMAIL_SPOOL_DIR = str(tmp_path)
+        personalizations = [{"to": [{"email": "user@example.com"}]}]
+
+        local_email_provider.send_batch(template_id="d-1", personalizations=personalizations)
+
+        (spool_file,) = tmp_path.iterdir()
+        assert json.loads(spool_file.read_text())["personalizations"] == personalizations
+
+    def test_benchmark_reports_throughput_and_commits_nothing(self, local_email_provider, capsys):
+        BookingFactory.create_batch(size=2, consecutive=True)
+
+        call_command("benchmark_email_notifications", events=4)
+
+        assert local_email_provider.message_count == 8
+        assert "8 messages" in capsys.readouterr().out
+        assert not PendingEmail.objects.exists()
+
+    def test_benchmark_refuses_real_provider(self):
+        with pytest.raises(CommandError):
+            call_command("benchmark_email_notifications", events=1)
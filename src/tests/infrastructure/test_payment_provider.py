@@ -2,9 +2,55 @@ import pytest
 import stripe
 from django.conf import settings
 
+from djlodging.infrastructure.providers.payments import payment_provider
+from djlodging.infrastructure.providers.payments.exceptions import PaymentProviderException
+
 stripe.api_key = settings.STRIPE_API_KEY
 
 
+def get_stripe_error(code: str, **error) -> dict:
+    return {"error": {"type": "invalid_request_error", "code": code, "message": code, **error}}
+
+
 @pytest.mark.django_db
 class TestPaymentProvider:
-    pass
+    @pytest.fixture(autouse=True)
+    def stripe_stub(self, http_stub, monkeypatch):
+        monkeypatch.setattr(stripe, "api_base", http_stub.url)
+        return http_stub
+
+    def test_missing_payment_intent_raises_provider_exception(self, stripe_stub):
+        stripe_stub.status = 404
+        stripe_stub.body = get_stripe_error("resource_missing")
+
+        with pytest.raises(PaymentProviderException):
+            payment_provider.get_payment_intent("pi_1")
+
+    @pytest.mark.parametrize(
+        "status, error",
+        [
+            (404, get_stripe_error("resource_missing")),
+            (
+                400,
+                get_stripe_error(
+                    "payment_intent_unexpected_state", payment_intent={"status": "canceled"}
+                ),
+            ),
+        ],
+    )
+    def test_cancel_keeps_missing_or_canceled_payment_intent(self, stripe_stub, status, error):
+        stripe_stub.status = status
+        stripe_stub.body = error
+
+        payment_provider.cancel_payment_intent("pi_1")
+
+        assert stripe_stub.requests[0]["path"] == "/v1/payment_intents/pi_1/cancel"
+
+    def test_cancel_of_paid_payment_intent_fails(self, stripe_stub):
+        stripe_stub.status = 400
+        stripe_stub.body = get_stripe_error(
+            "payment_intent_unexpected_state", payment_intent={"status": "succeeded"}
+        )
+
+        with pytest.raises(PaymentProviderException):
+            payment_provider.cancel_payment_intent("pi_1")
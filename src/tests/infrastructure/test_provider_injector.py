@@ -41,7 +41,9 @@ class TestProviderInjector:
             provider = get_provider("UNKNOWN_PROVIDER")  # noqa
         assert str(exc.value) == "Requested setting UNKNOWN_PROVIDER, but it's not configured."
 
-    def test_get_provider_fails_with_missing_provider_class(self):
+    def test_get_provider_fails_with_missing_provider_class(self, settings):
+        # Settings changed by other tests are restored after each test
+        settings.FAKE_PROVIDER = "djlodging.infrastructure.providers.FakeProvider"
         with pytest.raises(ImproperlyConfigured) as exc:
             provider = get_provider("FAKE_PROVIDER")  # noqa
         assert str(exc.value) == "Could not import FakeProvider. Did you configure it?"
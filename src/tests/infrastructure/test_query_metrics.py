@@ -0,0 +1,57 @@
+import pytest
+
+from djlodging.domain.users.models import User
+from djlodging.infrastructure.jobs.celery_config import app as celery_app
+from djlodging.infrastructure.query_metrics import (
+    QueryBudgetExceededError,
+    check_query_budget,
+    collect_query_metrics,
+)
+
+
+@celery_app.task(name="tests.count_users_twice")
+def count_users_twice():
+    return User.objects.count() + User.objects.count()
+
+
+@pytest.mark.django_db
+class TestQueryMetrics:
+    def test_collect_query_metrics_counts_queries(self):
+        with collect_query_metrics() as metrics:
+            list(User.objects.all())
+            User.objects.exists()
+
+        assert metrics.count == 2
+        assert metrics.duration > 0
+
+    def test_exceeded_budget_fails_if_enforced(self, settings):
+        settings.QUERY_BUDGETS = {"some-endpoint": 1}
+
+        with collect_query_metrics() as metrics:
+            User.objects.exists()
+            User.objects.exists()
+
+        with pytest.raises(QueryBudgetExceededError):
+            check_query_budget("some-endpoint", metrics)
+
+    def test_exceeded_budget_is_only_logged_if_not_enforced(self, settings, caplog):
+        settings.QUERY_BUDGETS = {"some-endpoint": 1}
+        settings.QUERY_BUDGETS_ENFORCED = False
+
+        with collect_query_metrics() as metrics:
+            User.objects.exists()
+            User.objects.exists()
+        check_query_budget("some-endpoint", metrics)
+
+        assert "some-endpoint made 2 database queries, the budget is 1." in caplog.text
+
+    def test_exceeded_task_budget_fails_the_task(self, settings):
+        settings.QUERY_BUDGETS = {"tests.count_users_twice": 1}
+
+        with pytest.raises(QueryBudgetExceededError):
+            count_users_twice.apply()
+
+    def test_task_within_budget_succeeds(self, settings):
+        settings.QUERY_BUDGETS = {"tests.count_users_twice": 2}
+
+        assert count_users_twice.apply().get() == 0
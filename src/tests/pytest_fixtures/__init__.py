@@ -8,5 +8,9 @@ from .api_client import (
     user_api_client_pytest_fixture,
     user_with_payment_api_client_pytest_fixture,
 )
+from .cache import clear_cache
+from .celery import celery_eager
+from .http_stub import http_stub
 from .lodgings import country
+from .query_metrics import enforce_query_budgets
 from .user import admin, partner, password, payment_method, user, user_with_payment
@@ -1,7 +1,7 @@
 import pytest
 from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from djlodging.api.authentication import ClaimsTokenObtainPairSerializer
 from tests.domain.users.factories import UserFactory
 
 
@@ -9,7 +9,7 @@ from tests.domain.users.factories import UserFactory
 def user_api_client_factory_boy():
     user = UserFactory()
     client = APIClient()
-    refresh = RefreshToken.for_user(user)
+    refresh = ClaimsTokenObtainPairSerializer.get_token(user)
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
     return client
 
@@ -18,7 +18,7 @@ def user_api_client_factory_boy():
 def partner_api_client_factory_boy():
     user = UserFactory(is_partner=True)
     client = APIClient()
-    refresh = RefreshToken.for_user(user)
+    refresh = ClaimsTokenObtainPairSerializer.get_token(user)
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
     return client
 
@@ -27,7 +27,7 @@ def partner_api_client_factory_boy():
 def admin_api_client_factory_boy():
     user = UserFactory(is_staff=True)
     client = APIClient()
-    refresh = RefreshToken.for_user(user)
+    refresh = ClaimsTokenObtainPairSerializer.get_token(user)
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
     return client
 
@@ -35,7 +35,7 @@ def admin_api_client_factory_boy():
 @pytest.fixture
 def user_api_client_pytest_fixture(user):
     client = APIClient()
-    refresh = RefreshToken.for_user(user)
+    refresh = ClaimsTokenObtainPairSerializer.get_token(user)
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
     return client
 
@@ -43,7 +43,7 @@ def user_api_client_pytest_fixture(user):
 @pytest.fixture
 def partner_api_client_pytest_fixture(partner):
     client = APIClient()
-    refresh = RefreshToken.for_user(partner)
+    refresh = ClaimsTokenObtainPairSerializer.get_token(partner)
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
     return client
 
@@ -51,7 +51,7 @@ def partner_api_client_pytest_fixture(partner):
 @pytest.fixture
 def admin_api_client_pytest_fixture(admin):
     client = APIClient()
-    refresh = RefreshToken.for_user(admin)
+    refresh = ClaimsTokenObtainPairSerializer.get_token(admin)
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
     return client
 
@@ -60,6 +60,6 @@ def admin_api_client_pytest_fixture(admin):
 @pytest.fixture
 def user_with_payment_api_client_pytest_fixture(user_with_payment):
     client = APIClient()
-    refresh = RefreshToken.for_user(user_with_payment)
+    refresh = ClaimsTokenObtainPairSerializer.get_token(user_with_payment)
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
     return client
@@ -0,0 +1,10 @@
+import pytest
+
+from djlodging.infrastructure.jobs.celery_config import app as celery_app
+
+
+@pytest.fixture(autouse=True, scope="session")
+def celery_eager():
+    # Tasks run in the test process, so their effects and errors are visible to the test.
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_eager_propagates = True
@@ -0,0 +1,74 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """
+    A local HTTP/1.1 server standing in for an external provider.
+
+    Answers every request with `status`, `body` and, if set, after `delay` seconds.
+    Records the requests and counts the TCP connections it accepted.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubRequestHandler)
+        self.status = 200
+        self.body = {}
+        self.delay = 0
+        self.requests = []
+        self.connections = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):  # noqa: N802 pylint: disable=invalid-name
+        self._respond()
+
+    def do_POST(self):  # noqa: N802 pylint: disable=invalid-name
+        self._respond()
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.server.requests.append(
+            {
+                "method": self.command,
+                "path": self.path,
+                "headers": dict(self.headers),
+                "body": self.rfile.read(length),
+            }
+        )
+        time.sleep(self.server.delay)
+        body = json.dumps(self.server.body).encode()
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture
+def http_stub():
+    server = StubHTTPServer()
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    # Any request over its QUERY_BUDGETS entry fails the test, this catches N+1 regressions.
+    settings.QUERY_BUDGETS_ENFORCED = True